@@ -0,0 +1,97 @@
+"""Benchmarks the class-only fast path against full extraction.
+
+Three runs are timed: full extraction, which also collects imports and call
+edges; class-only extraction that still parses every file; and the class-only
+fast path, which also skips parsing files without a class statement. The
+second and third runs isolate what the byte prefilter alone saves.
+
+Usage:
+    python -m benchmarks.class_prefilter [PATH] [--repeat N]
+
+PATH defaults to the Python standard library. Files that the analyzer cannot
+extract (syntax errors, undecodable files, unsupported annotations) are
+excluded before timing.
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import logging
+import os
+import time
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+
+
+class FileListAnalyzer(CodeAnalyzer):
+    """A `CodeAnalyzer` over a fixed list of files."""
+
+    def __init__(self, local_path: str, files: list):
+        super().__init__(local_path, diagram_types=("class",))
+        self.files = files
+
+    def iter_source_files(self):
+        return iter(self.files)
+
+
+class UnfilteredAnalyzer(FileListAnalyzer):
+    """A `FileListAnalyzer` that parses every file, without the byte prefilter."""
+
+    def requires_parse(self, file_path: str) -> bool:
+        return True
+
+
+def extractable_files(root: str) -> list:
+    analyzer = CodeAnalyzer(root)
+    files = []
+    for file_path in analyzer.iter_source_files():
+        try:
+            analyzer.extract_model(file_path)
+        except Exception:
+            continue
+        files.append(file_path)
+    return files
+
+
+def best_time(analyzer: CodeAnalyzer, complete: bool, repeat: int) -> tuple:
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            models = list(analyzer.iter_models(complete=complete))
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, sum(len(model.classes) for model in models)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default=os.path.dirname(ast.__file__))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    files = extractable_files(args.path)
+    analyzer = FileListAnalyzer(args.path, files)
+    skipped = sum(not analyzer.requires_parse(file_path) for file_path in files)
+
+    full_time, full_classes = best_time(analyzer, True, args.repeat)
+    unfiltered_time, unfiltered_classes = best_time(
+        UnfilteredAnalyzer(args.path, files), False, args.repeat
+    )
+    fast_time, fast_classes = best_time(analyzer, False, args.repeat)
+    assert full_classes == unfiltered_classes == fast_classes
+
+    print(f"Tree:              {args.path}")
+    print(f"Files:             {len(files)} ({skipped} without classes, not parsed)")
+    print(f"Classes:           {full_classes}")
+    print(f"Full extraction:   {full_time:.3f}s")
+    print(f"Classes only:      {unfiltered_time:.3f}s (every file parsed)")
+    print(f"Class fast path:   {fast_time:.3f}s")
+    print(f"Prefilter speedup: {unfiltered_time / fast_time:.2f}x")
+    print(f"Total speedup:     {full_time / fast_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Load-tests the diagram server on localhost.
+
+Usage:
+    python -m benchmarks.load_test [PATH] [--requests N] [--concurrency C] [--base-url URL]
+
+Without --base-url, a server for PATH (default: src) is started in-process on
+an ephemeral port. Requests cycle through the class, sequence and import
+endpoints of every Python file below PATH.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.server.diagram_server import DiagramServer
+
+
+def request_urls(base_url: str, root: str) -> list:
+    urls = []
+    analyzer = CodeAnalyzer(root)
+    for file_path in analyzer.iter_source_files():
+        path = quote(os.path.relpath(file_path, root))
+        for endpoint in ("class", "sequence", "imports"):
+            urls.append(f"{base_url}/{endpoint}?path={path}")
+    return urls
+
+
+def fetch(url: str) -> tuple:
+    start = time.perf_counter()
+    try:
+        with urlopen(url) as response:
+            response.read()
+            status = response.status
+    except HTTPError as error:
+        status = error.code
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default="src")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--base-url", type=str)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = DiagramServer(("127.0.0.1", 0), args.path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    urls = request_urls(base_url.rstrip("/"), args.path)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(
+            executor.map(fetch, (urls[i % len(urls)] for i in range(args.requests)))
+        )
+    elapsed = time.perf_counter() - start
+
+    if server:
+        server.shutdown()
+        server.server_close()
+
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(status >= 500 for status, _ in results)
+    print(f"Requests:    {len(results)} ({errors} server errors)")
+    print(f"Concurrency: {args.concurrency}")
+    print(f"Throughput:  {len(results) / elapsed:.0f} requests/s")
+    print(f"Latency p50: {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"Latency p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms")
+    if server:
+        cache = server.model_cache
+        print(f"Cache:       {cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
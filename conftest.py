@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PERF_BASELINE = os.path.join(REPO_ROOT, "data", "perf_baseline.json")
+DEFAULT_PERF_THRESHOLD = 1.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance regression tests")
+    group.addoption(
+        "--perf-baseline",
+        default=DEFAULT_PERF_BASELINE,
+        help="JSON file the timings of the perf tests are compared with and recorded to",
+    )
+    group.addoption(
+        "--perf-threshold",
+        type=float,
+        default=DEFAULT_PERF_THRESHOLD,
+        help="Fail perf tests that are this many times slower than the baseline",
+    )
+    group.addoption(
+        "--perf-update-baseline",
+        action="store_true",
+        help="Record the current timings as the new baseline",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "perf: performance regression tests, only run when selected with -m perf",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if "perf" in (config.getoption("-m") or ""):
+        return
+    skip_perf = pytest.mark.skip(reason="perf tests only run with -m perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip_perf)
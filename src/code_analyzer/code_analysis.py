@@ -1,9 +1,36 @@
+import fnmatch
+import hashlib
 import logging
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Tuple
 
 from src.file_operations.file_operations import FileOperations
-from src.mermaid_parser.mermaid_parser import MermaidParser
-from src.mermaid_parser.mermaid_sequence_parser import MermaidSequenceParser
+from src.frontends.registry import FrontendRegistry
+from src.model.model import FileModel
+from src.model.model_renderer import ModelRenderer
+from src.model.model_store import MODEL_VERSION, ModelWriter
+from src.model.shared_model_cache import SharedModelCache
+
+DIAGRAM_TYPES = ("class", "sequence")
+# "flat" saves every diagram directly in the output directory, "mirror" keeps
+# the directory structure of the source files below it.
+OUTPUT_LAYOUTS = ("flat", "mirror")
+# Files submitted per worker ahead of the one being yielded.
+PENDING_FILES_PER_JOB = 4
+
+_worker_analyzer = None
+
+
+def _init_worker(analyzer_options: dict, cache_options: tuple):
+    global _worker_analyzer
+    model_cache = SharedModelCache(*cache_options) if cache_options else None
+    _worker_analyzer = CodeAnalyzer(**analyzer_options, model_cache=model_cache)
+
+
+def _load_model(file_path: str, complete: bool) -> FileModel:
+    return _worker_analyzer.load_model(file_path, complete)
 
 
 class CodeAnalyzer:
@@ -15,104 +42,500 @@ class CodeAnalyzer:
         local_path (str): The path to the codebase to analyze.
         output_dir (str, optional): The directory to save the generated diagrams in.
             If not specified, the diagrams will be saved in the same directory as the source files.
+        model_out (str, optional): The path of a model file to write the extracted models to,
+            so that diagrams can later be rendered without re-parsing the source.
+        shard (Tuple[int, int], optional): The shard index and shard count. If set, only the
+            files whose path hashes into this shard are analyzed.
+        diagram_types (Tuple[str, ...]): The diagrams to generate, out of "class" and "sequence".
+        model_cache (SharedModelCache, optional): A cache of extracted models shared with
+            other processes, consulted before a file is parsed.
+        frontends (FrontendRegistry): The language front-ends by file extension.
+        jobs (int): The number of worker processes extracting models in parallel.
+        include (Tuple[str, ...]): Glob patterns of the files to analyze, relative to
+            `local_path`. If empty, every supported file is analyzed.
+        exclude (Tuple[str, ...]): Glob patterns of the files and directories to skip.
+        max_file_size (int, optional): The size in bytes above which files are skipped.
+        layout (str): How diagrams are laid out in `output_dir`, one of `OUTPUT_LAYOUTS`.
     """
 
     logger: logging.Logger
     output_dir: str
     local_path: str
+    model_out: str
+    shard: Tuple[int, int]
+    diagram_types: Tuple[str, ...]
+    model_cache: SharedModelCache
+    frontends: FrontendRegistry
+    jobs: int
+    include: Tuple[str, ...]
+    exclude: Tuple[str, ...]
+    max_file_size: int
+    layout: str
 
-    def __init__(self, local_path: str, output_dir: str = None):
+    def __init__(
+        self,
+        local_path: str,
+        output_dir: str = None,
+        model_out: str = None,
+        shard: Tuple[int, int] = None,
+        diagram_types: Iterable[str] = DIAGRAM_TYPES,
+        model_cache: SharedModelCache = None,
+        frontends: FrontendRegistry = None,
+        jobs: int = 1,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        max_file_size: int = None,
+        layout: str = "flat",
+    ):
         self.local_path = local_path
         self.output_dir = output_dir
+        self.model_out = model_out
+        self.shard = shard
+        self.diagram_types = tuple(diagram_types)
+        self.model_cache = model_cache
+        self.frontends = frontends or FrontendRegistry()
+        self.jobs = jobs
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.max_file_size = max_file_size
+        self.layout = layout
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
 
     def analyze(self):
         """Analyzes the codebase and generates Mermaid diagrams for class definitions and sequence diagrams.
 
-        Walks the directory tree rooted at `local_path`, and for each Python file found,
-        generates a Mermaid diagram for its class definitions and a sequence diagram,
-        then saves the diagrams to corresponding Markdown files.
+        Walks the directory tree rooted at `local_path`, and for each source file found,
+        extracts its model, generates a Mermaid diagram for its class definitions and a
+        sequence diagram, then saves the diagrams to corresponding Markdown files.
+        If `model_out` is set, the extracted models are also streamed to that file.
 
         Raises:
             UnicodeDecodeError: If a file in the codebase cannot be decoded as UTF-8.
         """
-        for root, _, files in os.walk(self.local_path):
-            for file in files:
-                if file.endswith(".py"):
-                    file_path = os.path.join(root, file)
-                    abs_file_path = os.path.abspath(file_path)
-                    print(f"Processing: {abs_file_path}")
+        writer = ModelWriter(self.model_out) if self.model_out else None
+        try:
+            for model in self.iter_models(complete=writer is not None):
+                self.render_model(model)
+                if writer:
+                    writer.write(model)
+        finally:
+            if writer:
+                writer.close()
 
-                    self.generate_class_diagram(file_path, file)
-                    self.generate_sequence_diagram(file_path)
+    def iter_models(self, complete: bool = True) -> Iterator[FileModel]:
+        """Extracts the model of each source file, one file at a time.
 
-    def generate_class_diagram(self, file_path: str, file: str):
-        """Generates a Mermaid class diagram for the given file.
+        Nothing but the yielded model outlives the extraction of a file, so the
+        memory used does not grow with the size of the codebase. If `jobs` is
+        greater than one, the models are extracted on worker processes and
+        yielded in the same order.
 
         Args:
-            file_path (str): The path to the Python file to analyze.
-            file (str): The name of the Python file.
-        """
-        mermaid_parser = MermaidParser()
-        mermaid_parser.parse_file(file_path)
-        mermaid_diagram = mermaid_parser.get_diagram()
+            complete (bool): Whether to extract complete models. If False, only what the
+                requested diagrams need is extracted, and files that cannot contribute
+                to them are not parsed at all and yield an empty model.
 
-        if "class " not in mermaid_diagram:
-            print(f"No classes found in {file}, skipping.")
+        Yields:
+            FileModel: The model of a source file.
+        """
+        if self.jobs > 1:
+            yield from self.iter_models_parallel(complete)
             return
 
-        wrapped_mermaid_diagram = FileOperations.wrap_mermaid_code(mermaid_diagram)
+        for file_path in self.iter_source_files():
+            abs_file_path = os.path.abspath(file_path)
+            print(f"Processing: {abs_file_path}")
+            yield self.load_model(file_path, complete)
 
-        if self.output_dir:
-            output_file_path = os.path.join(
-                self.output_dir,
-                os.path.splitext(file)[0] + "_class.md",
-            )
-        else:
-            output_file_path = os.path.splitext(file_path)[0] + "_class.md"
+    def iter_models_parallel(self, complete: bool) -> Iterator[FileModel]:
+        """Extracts the models on `jobs` worker processes, yielding them in file order.
 
-        with open(output_file_path, "w") as f:
-            f.write(wrapped_mermaid_diagram)
+        Only a few files per worker are in flight at any time, so the memory
+        used stays bounded as in the sequential case.
 
-        print(f"Mermaid class diagram for {file} saved at {output_file_path}")
+        Args:
+            complete (bool): Whether to extract complete models.
+
+        Yields:
+            FileModel: The model of a source file.
+        """
+        analyzer_options = {
+            "local_path": self.local_path,
+            "diagram_types": self.diagram_types,
+            "frontends": self.frontends,
+        }
+        cache_options = (
+            (self.model_cache.cache_dir, self.model_cache.max_bytes)
+            if self.model_cache
+            else None
+        )
+        pending = deque()
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(analyzer_options, cache_options),
+        ) as executor:
+            for file_path in self.iter_source_files():
+                pending.append(
+                    (file_path, executor.submit(_load_model, file_path, complete))
+                )
+                if len(pending) >= self.jobs * PENDING_FILES_PER_JOB:
+                    yield self.finish_pending(pending)
+            while pending:
+                yield self.finish_pending(pending)
 
-    def generate_sequence_diagram(self, file_path: str):
-        """Generates a Mermaid sequence diagram for the given file.
+    @staticmethod
+    def finish_pending(pending: deque) -> FileModel:
+        file_path, future = pending.popleft()
+        model = future.result()
+        print(f"Processing: {os.path.abspath(file_path)}")
+        return model
+
+    def load_model(self, file_path: str, complete: bool = True) -> FileModel:
+        """Extracts the model of a file, or an empty model if it need not be parsed.
 
         Args:
-            file_path (str): The path to the Python file to analyze.
+            file_path (str): The path to the source file.
+            complete (bool): Whether to extract a complete model.
+
+        Returns:
+            FileModel: The model of the file.
         """
-        if os.path.basename(file_path) == "main.py":
-            mermaid_sequence_parser = MermaidSequenceParser()
-            self.logger.debug(f"Generating sequence diagram for {file_path}")
-            mermaid_sequence_parser.parse_file(file_path)
-            self.logger.debug(f"Sequence diagram generated for {file_path}")
-            mermaid_sequence_parser.parse_main_function(file_path)
+        if not complete and not self.requires_parse(file_path):
+            return FileModel(path=os.path.relpath(file_path, self.local_path))
+        return self.extract_model(file_path, complete=complete)
 
-            sequence_diagram = mermaid_sequence_parser.get_sequence_diagram()
+    def requires_parse(self, file_path: str) -> bool:
+        """Checks whether a file can contribute to the requested diagrams.
+
+        Args:
+            file_path (str): The path to the source file.
 
-            if sequence_diagram.strip() == "":
-                print(
-                    f"No function calls found in {os.path.basename(file_path)}, skipping."
+        Returns:
+            bool: False if parsing the file would produce no diagram.
+        """
+        frontend = self.frontends.get(file_path)
+        if "sequence" in self.diagram_types and frontend.is_entry_point(file_path):
+            return True
+        return "class" in self.diagram_types and frontend.has_class_definition(
+            file_path
+        )
+
+    def iter_source_files(self) -> Iterator[str]:
+        """Yields the path of every supported source file below `local_path` that belongs to this shard.
+
+        A file is supported if a front-end is registered for its extension.
+        Files and directories matching an `exclude` pattern, files not matching
+        any `include` pattern and files larger than `max_file_size` are skipped;
+        excluded directories are not walked at all. Directories and files are
+        visited in sorted order, so the output is deterministic across machines.
+
+        Yields:
+            str: The path to a source file.
+        """
+        for root, dirs, files in os.walk(self.local_path):
+            relative_root = os.path.relpath(root, self.local_path)
+            dirs[:] = sorted(
+                name
+                for name in dirs
+                if not self.is_excluded_directory(
+                    os.path.normpath(os.path.join(relative_root, name))
                 )
-                return
+            )
+            for file in sorted(files):
+                if not self.frontends.supports(file):
+                    continue
+                file_path = os.path.join(root, file)
+                relative_path = os.path.normpath(os.path.join(relative_root, file))
+                if not self.is_selected(relative_path):
+                    continue
+                if self.shard is not None and not self.in_shard(relative_path):
+                    continue
+                if (
+                    self.max_file_size is not None
+                    and os.path.getsize(file_path) > self.max_file_size
+                ):
+                    print(f"Skipping {os.path.abspath(file_path)}: file too large.")
+                    continue
+                yield file_path
+
+    def is_selected(self, relative_path: str) -> bool:
+        """Checks whether a file matches the `include` and `exclude` patterns.
 
-            wrapped_sequence_diagram = FileOperations.wrap_mermaid_code(
-                sequence_diagram
+        Args:
+            relative_path (str): The path of the file relative to `local_path`.
+
+        Returns:
+            bool: True if the file is analyzed.
+        """
+        path = relative_path.replace(os.sep, "/")
+        if self.include and not any(
+            fnmatch.fnmatch(path, pattern) for pattern in self.include
+        ):
+            return False
+        return not any(fnmatch.fnmatch(path, pattern) for pattern in self.exclude)
+
+    def is_excluded_directory(self, relative_path: str) -> bool:
+        """Checks whether a directory matches an `exclude` pattern, e.g. "build" or "build/*".
+
+        Args:
+            relative_path (str): The path of the directory relative to `local_path`.
+
+        Returns:
+            bool: True if the directory is skipped.
+        """
+        path = relative_path.replace(os.sep, "/")
+        return any(
+            fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(path + "/", pattern)
+            for pattern in self.exclude
+        )
+
+    def in_shard(self, relative_path: str) -> bool:
+        """Checks whether a file belongs to this analyzer's shard.
+
+        Files are partitioned by a hash of their path relative to `local_path`,
+        so every shard process computes the same partition independently.
+
+        Args:
+            relative_path (str): The path of the file relative to `local_path`.
+
+        Returns:
+            bool: True if the file belongs to the shard.
+        """
+        index, count = self.shard
+        key = relative_path.replace(os.sep, "/").encode("utf-8")
+        return int.from_bytes(hashlib.sha1(key).digest()[:8], "big") % count == index
+
+    def update_index(self, symbol_index) -> Tuple[int, int]:
+        """Brings a symbol index up to date with the codebase.
+
+        Files whose content hash matches the indexed one are not parsed again,
+        and files that no longer exist are removed from the index.
+
+        Args:
+            symbol_index (SymbolIndex): The index to update.
+
+        Returns:
+            tuple: The number of files re-indexed and the number of files removed.
+        """
+        updated = 0
+        seen = set()
+        for file_path in self.iter_source_files():
+            relative_path = os.path.relpath(file_path, self.local_path)
+            seen.add(relative_path)
+
+            with open(file_path, "rb") as f:
+                data = f.read()
+            if (
+                symbol_index.get_file_hash(relative_path)
+                == hashlib.sha1(data).hexdigest()
+            ):
+                continue
+
+            print(f"Indexing: {os.path.abspath(file_path)}")
+            symbol_index.upsert(self.extract_model(file_path, data))
+            updated += 1
+
+        return updated, symbol_index.prune(seen)
+
+    def extract_model(
+        self, file_path: str, data: bytes = None, complete: bool = True
+    ) -> FileModel:
+        """Parses a source file once and extracts its classes, imports and calls.
+
+        The file is parsed by the front-end registered for its extension. If a
+        shared model cache is set, a model extracted from the same content with
+        the same options is taken from it instead.
+
+        Args:
+            file_path (str): The path to the source file to analyze.
+            data (bytes, optional): The file content, if it has already been read.
+            complete (bool): Whether to extract the imports and call edges. If False,
+                the entry point sequence is only extracted if a sequence diagram is requested.
+
+        Raises:
+            ValueError: If no front-end is registered for the file.
+
+        Returns:
+            FileModel: The extracted model, with its path relative to `local_path`.
+        """
+        frontend = self.frontends.get(file_path)
+        if frontend is None:
+            raise ValueError(f"No front-end is registered for {file_path}")
+
+        if data is None:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        relative_path = os.path.relpath(file_path, self.local_path)
+        content_hash = hashlib.sha1(data).hexdigest()
+
+        wants_sequence = complete or "sequence" in self.diagram_types
+        with_sequence = wants_sequence and frontend.is_entry_point(file_path)
+
+        if self.model_cache:
+            cache_key = self.get_cache_key(
+                frontend.name,
+                content_hash,
+                complete,
+                with_sequence,
+                frontend.lazy,
+                frontend.nested_classes,
             )
+            model = self.model_cache.get(cache_key)
+            if model:
+                model.path = relative_path
+                return model
 
-            if self.output_dir:
-                output_file_path = os.path.join(
-                    self.output_dir,
-                    os.path.splitext(os.path.basename(file_path))[0] + "_sequence.md",
-                )
+        model = frontend.extract_model(data, relative_path, complete, with_sequence)
+        model.content_hash = content_hash
+        if self.model_cache:
+            self.model_cache.put(cache_key, model)
+        return model
+
+    @staticmethod
+    def get_cache_key(
+        language: str,
+        content_hash: str,
+        complete: bool,
+        with_sequence: bool,
+        lazy: bool = False,
+        nested_classes: bool = False,
+    ) -> str:
+        """Returns the shared cache key of a model.
+
+        The key covers everything the extracted model depends on besides the
+        file content, so models extracted with different options never collide.
+
+        Args:
+            language (str): The name of the front-end extracting the model.
+            content_hash (str): The SHA-1 hash of the file content.
+            complete (bool): Whether imports and call edges are extracted.
+            with_sequence (bool): Whether the entry point sequence is extracted.
+            lazy (bool): Whether classes are extracted from declarations only.
+            nested_classes (bool): Whether nested classes are extracted in lazy mode.
+
+        Returns:
+            str: The cache key.
+        """
+        options = f"{language}:v{MODEL_VERSION}:{int(complete)}{int(with_sequence)}"
+        if lazy:
+            options += f":lazy{int(nested_classes)}"
+        return hashlib.sha1(f"{content_hash}:{options}".encode("ascii")).hexdigest()
+
+    def render_models(self, models: Iterable[FileModel]):
+        """Generates the diagrams for previously extracted models.
+
+        Args:
+            models (Iterable[FileModel]): The models to render.
+        """
+        for model in models:
+            self.render_model(model)
+
+    def render_project(
+        self, models: Iterable[FileModel], model_writer=None, symbol_index=None
+    ):
+        """Renders the per-file diagrams and a project-wide class diagram in a single pass.
+
+        Args:
+            models (Iterable[FileModel]): The models of the whole project.
+            model_writer (ModelWriter, optional): A writer to also store the models with.
+            symbol_index (SymbolIndex, optional): An index to also upsert the models into.
+        """
+        project_dir = self.output_dir or self.local_path
+        os.makedirs(project_dir, exist_ok=True)
+        project_file_path = os.path.join(project_dir, "project_class.md")
+
+        with open(project_file_path, "w") as project_file:
+            project_file.write("```mermaid\nclassDiagram\n")
+            for model in models:
+                self.render_model(model)
+                for class_model in model.classes:
+                    project_file.write(ModelRenderer.render_class(class_model))
+                if model_writer:
+                    model_writer.write(model)
+                if symbol_index:
+                    symbol_index.upsert(model)
+            project_file.write("```\n")
+
+        print(f"Mermaid project class diagram saved at {project_file_path}")
+
+    def render_model(self, model: FileModel):
+        """Generates the class and sequence diagrams for a single model.
+
+        Args:
+            model (FileModel): The model to render.
+        """
+        if "class" in self.diagram_types:
+            self.generate_class_diagram(model)
+        if "sequence" in self.diagram_types:
+            self.generate_sequence_diagram(model)
+
+    def get_output_path(self, model: FileModel, suffix: str) -> str:
+        """Returns the path of the Markdown file a diagram for `model` is saved to.
+
+        The directory the diagram is saved in is created if needed, including
+        the directory of the file below `output_dir` in the "mirror" layout.
+
+        Args:
+            model (FileModel): The model the diagram was generated from.
+            suffix (str): The file name suffix, e.g. "_class.md".
+
+        Returns:
+            str: The output file path.
+        """
+        if self.output_dir:
+            if self.layout == "mirror":
+                file_name = os.path.splitext(model.path)[0] + suffix
             else:
-                output_file_path = os.path.splitext(file_path)[0] + "_sequence.md"
+                file_name = os.path.splitext(os.path.basename(model.path))[0] + suffix
+            output_path = os.path.join(self.output_dir, file_name)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            return output_path
+        return os.path.join(self.local_path, os.path.splitext(model.path)[0] + suffix)
 
-            with open(output_file_path, "w") as f:
-                f.write(wrapped_sequence_diagram)
+    def generate_class_diagram(self, model: FileModel):
+        """Generates a Mermaid class diagram for the given file model.
 
-            print(
-                f"Mermaid sequence diagram for {os.path.basename(file_path)} saved at {output_file_path}"
-            )
+        Args:
+            model (FileModel): The model of the Python file.
+        """
+        file = os.path.basename(model.path)
+
+        if not model.classes:
+            print(f"No classes found in {file}, skipping.")
+            return
+
+        mermaid_diagram = ModelRenderer.render_class_diagram(model.classes)
+        wrapped_mermaid_diagram = FileOperations.wrap_mermaid_code(mermaid_diagram)
+        output_file_path = self.get_output_path(model, "_class.md")
+
+        with open(output_file_path, "w") as f:
+            f.write(wrapped_mermaid_diagram)
+
+        print(f"Mermaid class diagram for {file} saved at {output_file_path}")
+
+    def generate_sequence_diagram(self, model: FileModel):
+        """Generates a Mermaid sequence diagram for the given file model.
+
+        Only `main.py` files are rendered as sequence diagrams.
+
+        Args:
+            model (FileModel): The model of the Python file.
+        """
+        file = os.path.basename(model.path)
+        if file != "main.py":
+            return
+
+        if not model.sequence:
+            print(f"No function calls found in {file}, skipping.")
+            return
+
+        sequence_diagram = ModelRenderer.render_sequence_diagram(model.sequence)
+        wrapped_sequence_diagram = FileOperations.wrap_mermaid_code(sequence_diagram)
+        output_file_path = self.get_output_path(model, "_sequence.md")
+
+        with open(output_file_path, "w") as f:
+            f.write(wrapped_sequence_diagram)
+
+        print(f"Mermaid sequence diagram for {file} saved at {output_file_path}")
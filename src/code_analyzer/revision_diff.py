@@ -0,0 +1,172 @@
+import filecmp
+import os
+from typing import Iterator, Optional, Tuple
+
+from git import Repo
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.frontends.registry import FrontendRegistry
+from src.model.model import FileModel
+from src.model.model_diff import ModelDiff
+from src.model.shared_model_cache import SharedModelCache
+
+# The path of a changed file with its old and new content, None if missing.
+FileChange = Tuple[str, Optional[bytes], Optional[bytes]]
+
+
+class RevisionDiff:
+    """
+    Compares the structure of two revisions of a codebase.
+
+    Only the files that differ between the revisions are parsed, once for each
+    side. With a shared model cache, files already seen in an earlier run are
+    not parsed at all.
+    """
+
+    def __init__(
+        self,
+        frontends: FrontendRegistry = None,
+        model_cache: SharedModelCache = None,
+    ):
+        """
+        Initializes the comparison.
+
+        Args:
+            frontends (FrontendRegistry, optional): The language front-ends by file extension.
+            model_cache (SharedModelCache, optional): A cache of extracted models.
+        """
+        self.frontends = frontends or FrontendRegistry()
+        self.analyzer = CodeAnalyzer(
+            ".", frontends=self.frontends, model_cache=model_cache
+        )
+
+    def diff_directories(self, old_dir: str, new_dir: str) -> ModelDiff:
+        """Compares two checked out trees.
+
+        Args:
+            old_dir (str): The root of the old tree.
+            new_dir (str): The root of the new tree.
+
+        Returns:
+            ModelDiff: The structural differences.
+        """
+        return self.diff_changes(self.iter_directory_changes(old_dir, new_dir))
+
+    def diff_refs(self, repo_path: str, old_ref: str, new_ref: str) -> ModelDiff:
+        """Compares two commits of a Git repository without checking them out.
+
+        Args:
+            repo_path (str): The path of the repository.
+            old_ref (str): The old commit, branch or tag.
+            new_ref (str): The new commit, branch or tag.
+
+        Returns:
+            ModelDiff: The structural differences.
+        """
+        return self.diff_changes(self.iter_ref_changes(repo_path, old_ref, new_ref))
+
+    def diff_changes(self, changes: Iterator[FileChange]) -> ModelDiff:
+        """Extracts the old and new models of the changed files and compares them.
+
+        Args:
+            changes (Iterator[FileChange]): The changed files.
+
+        Returns:
+            ModelDiff: The structural differences.
+        """
+        return ModelDiff.compare(
+            (path, self.extract(path, old_data), self.extract(path, new_data))
+            for path, old_data, new_data in changes
+        )
+
+    def extract(self, path: str, data: Optional[bytes]) -> Optional[FileModel]:
+        if data is None:
+            return None
+        return self.analyzer.extract_model(path, data)
+
+    def iter_directory_changes(
+        self, old_dir: str, new_dir: str
+    ) -> Iterator[FileChange]:
+        """Yields the supported files that differ between two trees.
+
+        Files of equal size are compared byte by byte; nothing is parsed.
+
+        Args:
+            old_dir (str): The root of the old tree.
+            new_dir (str): The root of the new tree.
+
+        Yields:
+            FileChange: The path and the old and new content of each changed file.
+        """
+        old_paths = set(self.iter_relative_paths(old_dir))
+        new_paths = set(self.iter_relative_paths(new_dir))
+
+        for path in sorted(old_paths | new_paths):
+            old_path = os.path.join(old_dir, path)
+            new_path = os.path.join(new_dir, path)
+            if (
+                path in old_paths
+                and path in new_paths
+                and filecmp.cmp(old_path, new_path, shallow=False)
+            ):
+                continue
+            yield (
+                path,
+                self.read(old_path) if path in old_paths else None,
+                self.read(new_path) if path in new_paths else None,
+            )
+
+    def iter_relative_paths(self, root: str) -> Iterator[str]:
+        for directory, dirs, files in os.walk(root):
+            dirs[:] = [name for name in dirs if name != ".git"]
+            for file in files:
+                if self.frontends.supports(file):
+                    yield os.path.relpath(os.path.join(directory, file), root)
+
+    @staticmethod
+    def read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def iter_ref_changes(
+        self, repo_path: str, old_ref: str, new_ref: str
+    ) -> Iterator[FileChange]:
+        """Yields the supported files that differ between two commits.
+
+        The changed paths come from Git's tree diff, so unchanged files are
+        never read. A renamed file is compared as the removal of its old path
+        and the addition of its new path.
+
+        Args:
+            repo_path (str): The path of the repository.
+            old_ref (str): The old commit, branch or tag.
+            new_ref (str): The new commit, branch or tag.
+
+        Yields:
+            FileChange: The path and the old and new content of each changed file.
+        """
+        repo = Repo(repo_path)
+        old_commit = repo.commit(old_ref)
+        new_commit = repo.commit(new_ref)
+
+        for change in old_commit.diff(new_commit):
+            old_blob, new_blob = change.a_blob, change.b_blob
+            if old_blob and new_blob and old_blob.hexsha == new_blob.hexsha:
+                continue
+            if old_blob and new_blob and change.a_path != change.b_path:
+                changes = [
+                    (change.a_path, old_blob, None),
+                    (change.b_path, None, new_blob),
+                ]
+            else:
+                changes = [(change.b_path or change.a_path, old_blob, new_blob)]
+
+            for path, old, new in changes:
+                if self.frontends.supports(path):
+                    yield path, self.read_blob(old), self.read_blob(new)
+
+    @staticmethod
+    def read_blob(blob) -> Optional[bytes]:
+        if blob is None:
+            return None
+        return blob.data_stream.read()
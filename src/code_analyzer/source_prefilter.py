@@ -0,0 +1,56 @@
+import mmap
+import os
+import re
+
+CLASS_KEYWORD = re.compile(rb"^[ \t\f]*class[ \t\f\\]", re.MULTILINE)
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class SourcePrefilter:
+    """
+    Cheap checks on raw source bytes that let the analyzer skip `ast.parse`
+    for files that cannot contribute to the requested diagrams.
+    """
+
+    @staticmethod
+    def has_class_definition(
+        file_path: str, mmap_threshold: int = MMAP_THRESHOLD
+    ) -> bool:
+        """Checks whether a Python file may define a class.
+
+        A class statement always starts a logical line, so the file is scanned
+        for `class` at the start of a line. Matches inside strings give false
+        positives, which only cost a parse; there are no false negatives.
+        Files larger than `mmap_threshold` are memory-mapped instead of read.
+
+        Args:
+            file_path (str): The path to the Python file.
+            mmap_threshold (int): The file size in bytes from which the file is memory-mapped.
+
+        Returns:
+            bool: False if the file certainly defines no class.
+        """
+        return SourcePrefilter.search(file_path, CLASS_KEYWORD, mmap_threshold)
+
+    @staticmethod
+    def search(
+        file_path: str, pattern: re.Pattern, mmap_threshold: int = MMAP_THRESHOLD
+    ) -> bool:
+        """Checks whether a bytes pattern occurs anywhere in a file.
+
+        Args:
+            file_path (str): The path to the file.
+            pattern (re.Pattern): The compiled bytes pattern.
+            mmap_threshold (int): The file size in bytes from which the file is memory-mapped.
+
+        Returns:
+            bool: True if the pattern matches.
+        """
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return False
+            if size < mmap_threshold:
+                return pattern.search(f.read()) is not None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return pattern.search(data) is not None
@@ -0,0 +1 @@
+from src.config.project_config import Profile, ProjectConfig
@@ -0,0 +1,290 @@
+import os
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ModuleNotFoundError:
+        tomllib = None
+
+from src.code_analyzer.code_analysis import DIAGRAM_TYPES, OUTPUT_LAYOUTS
+from src.model.shared_model_cache import DEFAULT_CACHE_LIMIT
+
+CONFIG_FILE = "mermaidit.toml"
+PYPROJECT_FILE = "pyproject.toml"
+DEFAULT_PROFILE = "default"
+
+# Loaded configurations by path, modification time and size, so a process
+# analyzing many codebases parses each configuration file only once.
+_loaded_configs: Dict[Tuple[str, int, int], "ProjectConfig"] = {}
+
+
+@dataclass(frozen=True)
+class Profile:
+    """The analysis settings of a named configuration profile.
+
+    Attributes:
+        name (str): The profile name.
+        include (Tuple[str, ...]): Glob patterns of the files to analyze, relative to
+            the analyzed root. If empty, every supported file is analyzed.
+        exclude (Tuple[str, ...]): Glob patterns of the files and directories to skip.
+        diagrams (Tuple[str, ...]): The diagram types to generate.
+        jobs (int): The number of worker processes extracting models.
+        lazy (bool): Whether to extract classes from declarations only.
+        nested_classes (bool): Whether to also extract nested classes.
+        cache_dir (str, optional): The directory of the shared parse cache.
+        cache_limit (int): The size in MB at which the shared parse cache is compacted.
+        max_file_size (int, optional): The size in KB above which files are skipped.
+        output_dir (str, optional): The directory to save the diagrams in. If not set,
+            the diagrams are saved next to the source files.
+        layout (str): How diagrams are laid out in `output_dir`, "flat" or "mirror".
+    """
+
+    name: str = DEFAULT_PROFILE
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    diagrams: Tuple[str, ...] = DIAGRAM_TYPES
+    jobs: int = 1
+    lazy: bool = False
+    nested_classes: bool = False
+    cache_dir: Optional[str] = None
+    cache_limit: int = DEFAULT_CACHE_LIMIT // (1024 * 1024)
+    max_file_size: Optional[int] = None
+    output_dir: Optional[str] = None
+    layout: str = "flat"
+
+    @classmethod
+    def from_dict(cls, name: str, settings: dict, base_dir: str) -> "Profile":
+        """Validates the settings of a profile.
+
+        Keys may be written with dashes or underscores, e.g. "cache-dir".
+        Relative paths are resolved against the directory of the
+        configuration file.
+
+        Args:
+            name (str): The profile name.
+            settings (dict): The settings from the configuration file.
+            base_dir (str): The directory of the configuration file.
+
+        Raises:
+            ValueError: If a setting is unknown or has an invalid value.
+
+        Returns:
+            Profile: The profile.
+        """
+        types = {
+            field.name: field.type for field in fields(cls) if field.name != "name"
+        }
+        values = {}
+        for key, value in settings.items():
+            attribute = key.replace("-", "_")
+            if attribute not in types:
+                raise ValueError(
+                    f"Unknown setting {key!r} in profile {name!r}, "
+                    f"expected one of {', '.join(sorted(types))}."
+                )
+            values[attribute] = cls.check_value(name, key, types[attribute], value)
+
+        for attribute in ("cache_dir", "output_dir"):
+            if values.get(attribute):
+                values[attribute] = os.path.normpath(
+                    os.path.join(base_dir, os.path.expanduser(values[attribute]))
+                )
+        if set(values.get("diagrams", ())) - set(DIAGRAM_TYPES):
+            raise ValueError(
+                f"Invalid diagrams {values['diagrams']!r} in profile {name!r}, "
+                f"expected a subset of {','.join(DIAGRAM_TYPES)}."
+            )
+        if values.get("layout", "flat") not in OUTPUT_LAYOUTS:
+            raise ValueError(
+                f"Invalid layout {values['layout']!r} in profile {name!r}, "
+                f"expected one of {', '.join(OUTPUT_LAYOUTS)}."
+            )
+        if values.get("jobs", 1) < 1:
+            raise ValueError(f"Invalid jobs {values['jobs']} in profile {name!r}.")
+        return cls(name=name, **values)
+
+    @staticmethod
+    def check_value(profile: str, key: str, expected, value):
+        """Checks the type of a setting, turning lists into tuples.
+
+        Args:
+            profile (str): The profile name, for error messages.
+            key (str): The setting name, for error messages.
+            expected: The type annotation of the setting.
+            value: The value from the configuration file.
+
+        Raises:
+            ValueError: If the value does not have the expected type.
+
+        Returns:
+            The value.
+        """
+        if expected == Tuple[str, ...]:
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                return tuple(value)
+            type_name = "a list of strings"
+        elif expected in (str, Optional[str]):
+            if isinstance(value, str):
+                return value
+            type_name = "a string"
+        elif expected is bool:
+            if isinstance(value, bool):
+                return value
+            type_name = "a boolean"
+        else:
+            if isinstance(value, int) and not isinstance(value, bool):
+                return value
+            type_name = "an integer"
+        raise ValueError(f"Setting {key!r} in profile {profile!r} must be {type_name}.")
+
+
+class ProjectConfig:
+    """
+    Named analysis profiles read from a `mermaidit.toml` file or from the
+    `[tool.mermaidit]` table of a `pyproject.toml` file.
+
+    Settings at the top level of the table apply to every profile, and the
+    `profiles` table defines named profiles that override them. The top-level
+    settings alone form the "default" profile:
+
+        [tool.mermaidit]
+        exclude = ["tests", "*_pb2.py"]
+        output-dir = "docs/diagrams"
+        layout = "mirror"
+
+        [tool.mermaidit.profiles.ci]
+        diagrams = ["class"]
+        jobs = 8
+        cache-dir = "/var/cache/mermaidit"
+
+    In a `mermaidit.toml` file the same settings are written without the
+    `tool.mermaidit` prefix.
+    """
+
+    def __init__(self, path: str, settings: dict):
+        """
+        Initializes the configuration.
+
+        Args:
+            path (str): The path of the configuration file.
+            settings (dict): The `[tool.mermaidit]` table or the content of `mermaidit.toml`.
+
+        Raises:
+            ValueError: If the `profiles` table is malformed.
+        """
+        self.path = path
+        self.base_dir = os.path.dirname(os.path.abspath(path))
+        self.settings = {
+            key: value for key, value in settings.items() if key != "profiles"
+        }
+        self.profile_settings = settings.get("profiles", {})
+        if not isinstance(self.profile_settings, dict) or not all(
+            isinstance(value, dict) for value in self.profile_settings.values()
+        ):
+            raise ValueError(f"Invalid profiles table in {path}.")
+        self.profiles: Dict[str, Profile] = {}
+
+    @property
+    def profile_names(self) -> Tuple[str, ...]:
+        """The names of the profiles, including the default profile."""
+        return tuple(sorted({DEFAULT_PROFILE, *self.profile_settings}))
+
+    def get_profile(self, name: str = None) -> Profile:
+        """Returns a profile, validating it on first use.
+
+        Args:
+            name (str, optional): The profile name. Defaults to the default profile.
+
+        Raises:
+            ValueError: If the profile does not exist or is invalid.
+
+        Returns:
+            Profile: The profile.
+        """
+        name = name or DEFAULT_PROFILE
+        if name not in self.profiles:
+            if name != DEFAULT_PROFILE and name not in self.profile_settings:
+                raise ValueError(
+                    f"Unknown profile {name!r} in {self.path}, "
+                    f"expected one of {', '.join(self.profile_names)}."
+                )
+            self.profiles[name] = Profile.from_dict(
+                name,
+                {**self.settings, **self.profile_settings.get(name, {})},
+                self.base_dir,
+            )
+        return self.profiles[name]
+
+    @classmethod
+    def load(cls, path: str) -> "ProjectConfig":
+        """Reads a configuration file, or returns it from the cache if it is unchanged.
+
+        Args:
+            path (str): The path of a `mermaidit.toml` or `pyproject.toml` file.
+
+        Raises:
+            ValueError: If the file is not valid TOML or has no `[tool.mermaidit]` table.
+            RuntimeError: If no TOML parser is available.
+
+        Returns:
+            ProjectConfig: The configuration.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key in _loaded_configs:
+            return _loaded_configs[key]
+
+        if tomllib is None:
+            raise RuntimeError(
+                f"Reading {path} requires Python 3.11 or the tomli package."
+            )
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid configuration file {path}: {e}")
+
+        if os.path.basename(path) == PYPROJECT_FILE:
+            if "mermaidit" not in data.get("tool", {}):
+                raise ValueError(f"{path} has no [tool.mermaidit] table.")
+            data = data["tool"]["mermaidit"]
+
+        config = _loaded_configs[key] = cls(path, data)
+        return config
+
+    @classmethod
+    def discover(cls, start_dir: str) -> Optional["ProjectConfig"]:
+        """Finds and reads the configuration of a codebase.
+
+        `start_dir` and its parents are searched for a `mermaidit.toml` file or
+        a `pyproject.toml` file with a `[tool.mermaidit]` table, up to the
+        root of the repository containing `start_dir`.
+
+        Args:
+            start_dir (str): The directory to start searching from.
+
+        Returns:
+            ProjectConfig: The configuration, or None if there is none.
+        """
+        directory = os.path.abspath(start_dir)
+        while True:
+            config_path = os.path.join(directory, CONFIG_FILE)
+            if os.path.isfile(config_path):
+                return cls.load(config_path)
+
+            pyproject_path = os.path.join(directory, PYPROJECT_FILE)
+            if os.path.isfile(pyproject_path):
+                with open(pyproject_path, "rb") as f:
+                    # Avoids parsing unrelated pyproject.toml files.
+                    if b"[tool.mermaidit" in f.read():
+                        return cls.load(pyproject_path)
+
+            parent = os.path.dirname(directory)
+            if parent == directory or os.path.exists(os.path.join(directory, ".git")):
+                return None
+            directory = parent
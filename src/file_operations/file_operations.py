@@ -74,14 +74,23 @@ class FileOperations:
         return f"```mermaid\n{mermaid_code}```\n"
 
     @staticmethod
-    def save_settings(selected_option, output_dir):
+    def save_settings(selected_option=None, output_dir=None, src_dir=None):
         """Saves the settings to a file.
 
+        The output location and the source directory are chosen in separate
+        prompts, so the settings that are not given are kept.
+
         Args:
-            selected_option (int): The selected output location option.
-            output_dir (str): The path to the output directory.
+            selected_option (int, optional): The selected output location option.
+            output_dir (str, optional): The path to the output directory.
+            src_dir (str, optional): The path to the selected source directory.
         """
-        settings = {"selected_option": selected_option, "output_dir": output_dir}
+        settings = FileOperations.load_settings() or {}
+        if selected_option is not None:
+            settings["selected_option"] = selected_option
+            settings["output_dir"] = output_dir
+        if src_dir is not None:
+            settings["src_dir"] = src_dir
 
         with open(SETTINGS_FILE, "w") as f:
             json.dump(settings, f, indent=2)
@@ -109,8 +118,11 @@ class FileOperations:
         use_prev_src_dir, prev_src_dir = FileOperations.ask_use_previous_src_dir()
         if use_prev_src_dir:
             return prev_src_dir
-        else:
-            return FileOperations.browse_directory()
+
+        src_dir = FileOperations.browse_directory()
+        if src_dir:
+            FileOperations.save_settings(src_dir=src_dir)
+        return src_dir
 
     @staticmethod
     def ask_use_previous_src_dir() -> tuple:
@@ -120,8 +132,8 @@ class FileOperations:
             tuple: A tuple containing a boolean indicating whether to use the previous directory, and the path to the previous directory or None.
         """
         settings = FileOperations.load_settings()
-        if settings:
-            message = f"Do you want to use the previously selected source directory:\n\n{settings['output_dir']}\n\nor browse a new one?"
+        if settings and settings.get("src_dir"):
+            message = f"Do you want to use the previously selected source directory:\n\n{settings['src_dir']}\n\nor browse a new one?"
             answer = UI.ask_yes_no("Use previous source directory?", message)
-            return answer, settings["output_dir"]
+            return answer, settings["src_dir"]
         return False, None
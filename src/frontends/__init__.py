@@ -0,0 +1,2 @@
+from src.frontends.frontend import Frontend
+from src.frontends.registry import FrontendRegistry
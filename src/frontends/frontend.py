@@ -0,0 +1,75 @@
+from src.model.model import FileModel
+
+
+class Frontend:
+    """
+    The interface of a language front-end.
+
+    A front-end turns the source of a single file into the `FileModel` that
+    every renderer, model store and index works on, so adding a language only
+    takes a front-end. Front-ends are registered with a `FrontendRegistry` by
+    file extension and are only imported once a file with that extension is
+    analyzed.
+
+    Attributes:
+        name (str): The language name, also part of the shared cache keys.
+        lazy (bool): Whether to extract class diagrams from declarations only,
+            without entering function bodies.
+        nested_classes (bool): Whether to also extract the classes nested in
+            other classes, named by their qualified name, in lazy mode.
+    """
+
+    name = ""
+    lazy = False
+    nested_classes = False
+
+    def configure(self, lazy: bool = False, nested_classes: bool = False):
+        """Sets the extraction options. Front-ends without a lazy mode may ignore them.
+
+        Args:
+            lazy (bool): Whether to extract class diagrams from declarations only.
+            nested_classes (bool): Whether to also extract nested classes in lazy mode.
+        """
+        self.lazy = lazy
+        self.nested_classes = nested_classes
+
+    def has_class_definition(self, file_path: str) -> bool:
+        """Checks cheaply whether a file may define a class, without parsing it.
+
+        Args:
+            file_path (str): The path to the source file.
+
+        Returns:
+            bool: False if the file certainly defines no class.
+        """
+        return True
+
+    def is_entry_point(self, file_path: str) -> bool:
+        """Checks whether a sequence diagram is generated for a file.
+
+        Args:
+            file_path (str): The path to the source file.
+
+        Returns:
+            bool: True if the file is an entry point of the program.
+        """
+        return False
+
+    def extract_model(
+        self, data: bytes, relative_path: str, complete: bool, with_sequence: bool
+    ) -> FileModel:
+        """Extracts the model of a source file.
+
+        Args:
+            data (bytes): The file content.
+            relative_path (str): The path of the file relative to the analyzed root.
+            complete (bool): Whether to extract the imports and call edges.
+            with_sequence (bool): Whether to extract the entry point sequence.
+
+        Raises:
+            SyntaxError: If the source cannot be parsed.
+
+        Returns:
+            FileModel: The extracted model, without its content hash.
+        """
+        raise NotImplementedError
@@ -0,0 +1,379 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.code_analyzer.source_prefilter import SourcePrefilter
+from src.frontends.frontend import Frontend
+from src.model.model import CallModel, ClassModel, FileModel, MemberModel
+
+# Comments are blanked out and string literals emptied before the structure is
+# matched, so braces and keywords inside them are never seen.
+LEXICAL_PATTERN = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|`[^`]*`|'(?:\\.|[^'\\\n])*'", re.S
+)
+# Types and methods, which may extend a type declared in another file.
+TYPE_OR_METHOD = re.compile(rb"^(?:[ \t]*type[ \t(]|func[ \t]*\()", re.MULTILINE)
+IMPORT_PATTERN = re.compile(r"\bimport\s*(\((.*?)\)|(?:[\w.]+\s+)?\"[^\"]*\")", re.S)
+IMPORT_SPEC_PATTERN = re.compile(r"(?:([\w.]+)\s+)?\"([^\"]+)\"")
+TYPE_GROUP_PATTERN = re.compile(r"\btype\s*\(")
+TYPE_PATTERN = re.compile(
+    r"(?:\btype\s+|^[ \t]*)(\w+)(?:\[[^\]]*\])?\s+(struct|interface)\s*\{", re.M
+)
+FUNC_PATTERN = re.compile(
+    r"^func\s*(?:\(\s*(?:\w+\s+)?\*?\s*(\w+)(?:\[[^\]]*\])?\s*\)\s*)?(\w+)"
+    r"\s*(?:\[[^\]]*\]\s*)?\(",
+    re.M,
+)
+FIELD_PATTERN = re.compile(r"^(\w+(?:\s*,\s*\w+)*)\s+[^\s,]")
+EMBEDDED_PATTERN = re.compile(r"^\*?([\w.]+)(?:\[[^\]]*\])?\s*(?:\"\")?$")
+INTERFACE_METHOD_PATTERN = re.compile(r"^(\w+)\s*\(")
+CALL_PATTERN = re.compile(r"(?<![\w.])((?:\w+\.)*\w+)\s*\(")
+# Keywords followed by parentheses, and built-in functions.
+NOT_CALLS = set(
+    "case defer for func go if interface map range return select struct switch "
+    "append cap close complex copy delete imag len make new panic print println "
+    "real recover".split()
+)
+
+
+class GoFrontend(Frontend):
+    """
+    A dependency-free front-end for Go built on regular expressions and brace
+    matching instead of a full parser.
+
+    Structs and interfaces become classes, struct fields become attributes and
+    methods are attached to their receiver type. Embedded types are rendered as
+    base classes. Like the Python front-end, only unqualified types are used as
+    bases. Call edges are found by name, so calls through function values are
+    attributed to the variable name.
+    """
+
+    name = "go"
+
+    def has_class_definition(self, file_path: str) -> bool:
+        return SourcePrefilter.search(file_path, TYPE_OR_METHOD)
+
+    def extract_model(
+        self, data: bytes, relative_path: str, complete: bool, with_sequence: bool
+    ) -> FileModel:
+        source = data.decode("utf-8")
+        code = self.strip_literals(source)
+
+        classes: Dict[str, ClassModel] = {}
+        for name, kind, body in self.find_type_declarations(code):
+            class_model = classes.setdefault(name, ClassModel(name))
+            if kind == "struct":
+                self.parse_struct(class_model, body)
+            else:
+                self.parse_interface(class_model, body)
+
+        functions = []
+        for receiver, name, params, results, body in self.iter_functions(code):
+            if receiver:
+                class_model = classes.setdefault(receiver, ClassModel(receiver))
+                class_model.members.append(
+                    MemberModel(
+                        name,
+                        kind="method",
+                        params=self.format_params(params),
+                        return_type=self.format_results(results),
+                    )
+                )
+                functions.append((f"{receiver}.{name}", body))
+            else:
+                functions.append((name, body))
+
+        model = FileModel(path=relative_path, classes=list(classes.values()))
+        if complete:
+            model.imports = self.collect_imports(self.strip_comments(source))
+            model.calls = self.extract_call_edges(functions, model.imports)
+        return model
+
+    @staticmethod
+    def strip_literals(source: str) -> str:
+        """Blanks out comments and empties string and rune literals.
+
+        Args:
+            source (str): The Go source.
+
+        Returns:
+            str: The source with the same line structure and no literal content.
+        """
+
+        def replace(match: re.Match) -> str:
+            text = match.group()
+            if text.startswith("/"):
+                return "\n" * text.count("\n") or " "
+            return '""'
+
+        return LEXICAL_PATTERN.sub(replace, source)
+
+    @staticmethod
+    def strip_comments(source: str) -> str:
+        return LEXICAL_PATTERN.sub(
+            lambda match: " " if match.group().startswith("/") else match.group(),
+            source,
+        )
+
+    @staticmethod
+    def find_closing(code: str, index: int) -> int:
+        """Returns the index just past the bracket matching the one at `index`.
+
+        Args:
+            code (str): The source with literals stripped.
+            index (int): The index of an opening "(", "[" or "{".
+
+        Raises:
+            SyntaxError: If the bracket is never closed.
+
+        Returns:
+            int: The index after the matching closing bracket.
+        """
+        depth = 0
+        for position in range(index, len(code)):
+            char = code[position]
+            if char in "([{":
+                depth += 1
+            elif char in ")]}":
+                depth -= 1
+                if depth == 0:
+                    return position + 1
+        raise SyntaxError(f"Unbalanced {code[index]!r} at offset {index}")
+
+    @staticmethod
+    def split_top_level(text: str, separator: str) -> List[str]:
+        """Splits text at separators that are not nested in brackets.
+
+        Args:
+            text (str): The text to split.
+            separator (str): A single separator character.
+
+        Returns:
+            List[str]: The stripped, non-empty parts.
+        """
+        parts, depth, start = [], 0, 0
+        for position, char in enumerate(text):
+            if char in "([{":
+                depth += 1
+            elif char in ")]}":
+                depth -= 1
+            elif char == separator and depth == 0:
+                parts.append(text[start:position])
+                start = position + 1
+        parts.append(text[start:])
+        return [part.strip() for part in parts if part.strip()]
+
+    def find_type_declarations(self, code: str):
+        """Finds the struct and interface declarations of a file.
+
+        Declarations inside `type ( ... )` groups are included, anonymous
+        struct types of fields and variables are not.
+
+        Args:
+            code (str): The source with literals stripped.
+
+        Returns:
+            list: The type name, "struct" or "interface", and the body between
+                the braces of each declaration, in source order.
+        """
+        regions = [(0, len(code), True)]
+        for match in TYPE_GROUP_PATTERN.finditer(code):
+            end = self.find_closing(code, match.end() - 1)
+            regions.append((match.end(), end - 1, False))
+
+        declarations = []
+        for start, end, needs_keyword in regions:
+            position = start
+            while True:
+                match = TYPE_PATTERN.search(code, position, end)
+                if not match:
+                    break
+                body_end = self.find_closing(code, match.end() - 1)
+                if not needs_keyword or match.group().split()[0] == "type":
+                    body = code[match.end() : body_end - 1]
+                    declarations.append(
+                        (match.start(), match.group(1), match.group(2), body)
+                    )
+                position = body_end
+        return [declaration[1:] for declaration in sorted(declarations)]
+
+    def parse_struct(self, class_model: ClassModel, body: str):
+        for line in self.iter_top_level_lines(body):
+            embedded = EMBEDDED_PATTERN.match(line)
+            if embedded:
+                if "." not in embedded.group(1):
+                    class_model.bases.append(embedded.group(1))
+                continue
+            field_match = FIELD_PATTERN.match(line)
+            if field_match:
+                for name in field_match.group(1).split(","):
+                    class_model.members.append(MemberModel(name.strip()))
+
+    def parse_interface(self, class_model: ClassModel, body: str):
+        for line in self.iter_top_level_lines(body):
+            method = INTERFACE_METHOD_PATTERN.match(line)
+            if method:
+                params_end = self.find_closing(line, method.end() - 1)
+                class_model.members.append(
+                    MemberModel(
+                        method.group(1),
+                        kind="method",
+                        params=self.format_params(line[method.end() : params_end - 1]),
+                        return_type=self.format_results(line[params_end:]),
+                    )
+                )
+                continue
+            embedded = EMBEDDED_PATTERN.match(line)
+            if embedded and "." not in embedded.group(1):
+                class_model.bases.append(embedded.group(1))
+
+    def iter_top_level_lines(self, body: str):
+        """Yields the declarations of a struct or interface body, one per line or semicolon.
+
+        Args:
+            body (str): The text between the braces.
+
+        Yields:
+            str: A declaration, with nested bodies kept on one line.
+        """
+        for line in self.split_top_level(body.replace("\n", ";"), ";"):
+            yield " ".join(line.split())
+
+    def iter_functions(self, code: str):
+        """Yields the top-level functions and methods of a file.
+
+        Args:
+            code (str): The source with literals stripped.
+
+        Yields:
+            tuple: The receiver type or None, the name, the parameter list,
+                the result list and the body.
+        """
+        for match in FUNC_PATTERN.finditer(code):
+            params_end = self.find_closing(code, match.end() - 1)
+            body_start = self.find_body(code, params_end)
+            if body_start < 0:
+                # A declaration without a body, implemented in assembly.
+                results_end = code.find("\n", params_end)
+                body = ""
+            else:
+                results_end = body_start
+                body = code[body_start + 1 : self.find_closing(code, body_start) - 1]
+            yield (
+                match.group(1),
+                match.group(2),
+                code[match.end() : params_end - 1],
+                code[params_end:results_end],
+                body,
+            )
+
+    def find_body(self, code: str, index: int) -> int:
+        """Finds the opening brace of a function body after its parameter list.
+
+        Braces of struct and interface types in the result list are skipped.
+
+        Args:
+            code (str): The source with literals stripped.
+            index (int): The index just past the parameter list.
+
+        Returns:
+            int: The index of the opening brace, or -1 if the function has no body.
+        """
+        position = index
+        while position < len(code):
+            char = code[position]
+            if char == "\n":
+                return -1
+            if char in "([":
+                position = self.find_closing(code, position)
+                continue
+            if char == "{":
+                if not re.search(r"\b(struct|interface)\s*$", code[index:position]):
+                    return position
+                position = self.find_closing(code, position)
+                continue
+            position += 1
+        return -1
+
+    def format_params(self, params: str) -> List[str]:
+        """Renders a Go parameter list like the Python front-end renders parameters.
+
+        Args:
+            params (str): The text between the parentheses, e.g. "a, b int, c string".
+
+        Returns:
+            List[str]: The rendered parameters, e.g. ["a: int", "b: int", "c: string"].
+        """
+        parts = [" ".join(part.split()) for part in self.split_top_level(params, ",")]
+        named = [part.split(" ", 1) for part in parts]
+        if not any(len(part) == 2 for part in named):
+            return parts
+
+        rendered: List[str] = []
+        pending: List[str] = []
+        for part in named:
+            if len(part) == 1:
+                pending.append(part[0])
+                continue
+            name, param_type = part
+            rendered.extend(f"{pending_name}: {param_type}" for pending_name in pending)
+            rendered.append(f"{name}: {param_type}")
+            pending = []
+        return rendered
+
+    def format_results(self, results: str) -> Optional[str]:
+        results = " ".join(results.split())
+        if results.startswith("(") and results.endswith(")"):
+            results = ", ".join(
+                param.split(": ", 1)[-1] for param in self.format_params(results[1:-1])
+            )
+        return results or None
+
+    @staticmethod
+    def collect_imports(code: str) -> Dict[str, str]:
+        """Collects the imported packages of a file by their local names.
+
+        Args:
+            code (str): The source with comments stripped.
+
+        Returns:
+            Dict[str, str]: The package names mapped to their import paths.
+        """
+        imports = {}
+        for match in IMPORT_PATTERN.finditer(code):
+            specs = match.group(2) if match.group(2) is not None else match.group(1)
+            for alias, path in IMPORT_SPEC_PATTERN.findall(specs):
+                if alias in ("_", "."):
+                    continue
+                imports[alias or path.rsplit("/", 1)[-1]] = path
+        return imports
+
+    @staticmethod
+    def extract_call_edges(
+        functions: List[Tuple[str, str]], imports: Dict[str, str]
+    ) -> List[CallModel]:
+        """Extracts the unique caller/callee edges of every function and method.
+
+        Args:
+            functions (List[Tuple[str, str]]): The qualified names and bodies of the functions.
+            imports (Dict[str, str]): The imported packages of the file.
+
+        Returns:
+            List[CallModel]: The call edges, in order of first appearance.
+        """
+        edges = []
+        seen = set()
+        for caller, body in functions:
+            for match in CALL_PATTERN.finditer(body):
+                name = match.group(1)
+                if name in NOT_CALLS:
+                    continue
+                package, _, rest = name.partition(".")
+                callee = (
+                    f"{imports[package]}.{rest}"
+                    if rest and package in imports
+                    else name
+                )
+                if (caller, callee) not in seen:
+                    seen.add((caller, callee))
+                    edges.append(CallModel(caller=caller, callee=callee))
+        return edges
@@ -0,0 +1,57 @@
+import ast
+import logging
+import os
+
+from src.code_analyzer.source_prefilter import SourcePrefilter
+from src.frontends.frontend import Frontend
+from src.mermaid_parser.mermaid_parser import MermaidParser
+from src.mermaid_parser.mermaid_sequence_parser import MermaidSequenceParser
+from src.model.model import FileModel
+
+
+class PythonFrontend(Frontend):
+    """
+    The reference front-end, which extracts models with the `ast` based
+    `MermaidParser` and `MermaidSequenceParser`.
+    """
+
+    name = "python"
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def has_class_definition(self, file_path: str) -> bool:
+        return SourcePrefilter.has_class_definition(file_path)
+
+    def is_entry_point(self, file_path: str) -> bool:
+        return os.path.basename(file_path) == "main.py"
+
+    def extract_model(
+        self, data: bytes, relative_path: str, complete: bool, with_sequence: bool
+    ) -> FileModel:
+        # The tree and the parsers are local, so they are released as soon as
+        # the model is returned.
+        source = data.decode("utf-8")
+        tree = ast.parse(source)
+
+        # In lazy mode the class parser stays out of function bodies; they
+        # are only visited below if call edges or a sequence are requested.
+        class_parser = MermaidParser(self.lazy, self.nested_classes)
+        class_parser.parse_tree(tree)
+
+        model = FileModel(path=relative_path, classes=class_parser.classes)
+        if not complete and not with_sequence:
+            return model
+
+        sequence_parser = MermaidSequenceParser()
+        imports = sequence_parser.collect_imports(tree)
+        if complete:
+            model.imports = imports
+            model.calls = sequence_parser.extract_call_edges(tree, imports)
+
+        if with_sequence:
+            self.logger.debug(f"Generating sequence diagram for {relative_path}")
+            sequence_parser.parse_main_tree(tree, imports, source)
+            model.sequence = sequence_parser.sequence
+
+        return model
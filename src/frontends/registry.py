@@ -0,0 +1,165 @@
+import importlib
+import logging
+import os
+from importlib.metadata import entry_points
+from typing import Dict, Optional, Tuple, Union
+
+from src.frontends.frontend import Frontend
+
+ENTRY_POINT_GROUP = "mermaidit.frontends"
+BUILTIN_FRONTENDS = {
+    ".py": "src.frontends.python_frontend:PythonFrontend",
+    ".go": "src.frontends.go_frontend:GoFrontend",
+}
+
+
+class FrontendRegistry:
+    """
+    Maps file extensions to the language front-ends that analyze them.
+
+    Front-ends are registered as "module:attribute" references and are only
+    imported the first time a file with their extension is analyzed. Besides
+    the built-in front-ends, installed packages can provide front-ends through
+    the "mermaidit.frontends" entry point group, with the file extension as
+    the entry point name:
+
+        [project.entry-points."mermaidit.frontends"]
+        ts = "mermaidit_typescript:TypeScriptFrontend"
+
+    Entry points are only looked up once a file has an extension no front-end
+    is registered for. Built-in front-ends take precedence over entry points.
+    """
+
+    def __init__(
+        self,
+        frontends: Dict[str, str] = None,
+        use_entry_points=True,
+        lazy: bool = False,
+        nested_classes: bool = False,
+    ):
+        """
+        Initializes the registry.
+
+        Args:
+            frontends (Dict[str, str], optional): The front-end references by file
+                extension. Defaults to the built-in front-ends.
+            use_entry_points (bool): Whether to also load installed front-ends.
+            lazy (bool): Whether front-ends extract class diagrams from declarations
+                only, without entering function bodies.
+            nested_classes (bool): Whether front-ends also extract nested classes
+                in lazy mode.
+        """
+        self.lazy = lazy
+        self.nested_classes = nested_classes
+        self.targets: Dict[str, Union[str, type]] = {}
+        for extension, target in (frontends or BUILTIN_FRONTENDS).items():
+            self.targets[self.normalize_extension(extension)] = target
+        self.entry_points_loaded = not use_entry_points
+        self.frontends: Dict[str, Frontend] = {}
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def normalize_extension(extension: str) -> str:
+        return "." + extension.lstrip(".").lower()
+
+    def register(self, extension: str, target: Union[str, type]):
+        """Registers a front-end for a file extension, replacing any previous one.
+
+        Args:
+            extension (str): The file extension, e.g. ".ts".
+            target (str or type): A "module:attribute" reference or a `Frontend` subclass.
+        """
+        extension = self.normalize_extension(extension)
+        self.targets[extension] = target
+        self.frontends.pop(extension, None)
+
+    def load_entry_points(self):
+        """Adds the front-ends of the installed "mermaidit.frontends" entry points."""
+        if self.entry_points_loaded:
+            return
+        self.entry_points_loaded = True
+
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            extension = self.normalize_extension(entry_point.name)
+            if extension in self.targets:
+                self.logger.warning(
+                    f"Ignoring front-end {entry_point.value} for {extension}, "
+                    f"which is already handled by {self.targets[extension]}"
+                )
+                continue
+            self.targets[extension] = entry_point.value
+
+    def get(self, file_path: str) -> Optional[Frontend]:
+        """Returns the front-end for a file, importing it on first use.
+
+        Args:
+            file_path (str): The path to the source file.
+
+        Raises:
+            TypeError: If the registered reference is not a `Frontend`.
+
+        Returns:
+            Frontend: The front-end, or None if the file type is not supported.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if not extension:
+            return None
+
+        frontend = self.frontends.get(extension)
+        if frontend is not None:
+            return frontend
+
+        if extension not in self.targets:
+            self.load_entry_points()
+            if extension not in self.targets:
+                return None
+
+        frontend = self.frontends[extension] = self.load(self.targets[extension])
+        frontend.configure(lazy=self.lazy, nested_classes=self.nested_classes)
+        return frontend
+
+    def supports(self, file_path: str) -> bool:
+        """Checks whether a front-end is registered for a file, without importing it.
+
+        Args:
+            file_path (str): The path to the source file.
+
+        Returns:
+            bool: True if the file can be analyzed.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if not extension:
+            return False
+        if extension not in self.targets:
+            self.load_entry_points()
+        return extension in self.targets
+
+    @property
+    def extensions(self) -> Tuple[str, ...]:
+        """The supported file extensions."""
+        self.load_entry_points()
+        return tuple(sorted(self.targets))
+
+    @staticmethod
+    def load(target: Union[str, type]) -> Frontend:
+        """Imports and instantiates a front-end.
+
+        Args:
+            target (str or type): A "module:attribute" reference or a `Frontend` subclass.
+
+        Raises:
+            TypeError: If the reference is not a `Frontend` subclass.
+
+        Returns:
+            Frontend: The front-end instance.
+        """
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(":")
+            target = getattr(importlib.import_module(module_name), attribute)
+        if not (isinstance(target, type) and issubclass(target, Frontend)):
+            raise TypeError(f"{target!r} is not a Frontend subclass")
+        return target()
+
+    def __getstate__(self) -> dict:
+        # Worker processes import the front-ends they need themselves.
+        return {**self.__dict__, "frontends": {}}
@@ -0,0 +1 @@
+from src.index.symbol_index import SymbolIndex
@@ -0,0 +1,336 @@
+import json
+import sqlite3
+from typing import Iterable, List, Optional
+
+from src.model.model import CallModel, ClassModel, FileModel, MemberModel
+
+# The number of names looked up per query, below SQLite's parameter limit.
+QUERY_CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS classes_name ON classes(name);
+CREATE INDEX IF NOT EXISTS classes_file ON classes(file_id);
+CREATE TABLE IF NOT EXISTS members (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    params TEXT,
+    return_type TEXT
+);
+CREATE INDEX IF NOT EXISTS members_class ON members(class_id);
+CREATE INDEX IF NOT EXISTS members_name ON members(name);
+CREATE TABLE IF NOT EXISTS bases (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    base TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bases_class ON bases(class_id);
+CREATE INDEX IF NOT EXISTS bases_base ON bases(base);
+CREATE TABLE IF NOT EXISTS imports (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    alias TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS imports_file ON imports(file_id);
+CREATE INDEX IF NOT EXISTS imports_target ON imports(target);
+CREATE TABLE IF NOT EXISTS calls (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    caller TEXT NOT NULL,
+    callee TEXT NOT NULL,
+    callee_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_file ON calls(file_id);
+CREATE INDEX IF NOT EXISTS calls_caller ON calls(caller);
+CREATE INDEX IF NOT EXISTS calls_callee ON calls(callee);
+CREATE INDEX IF NOT EXISTS calls_callee_name ON calls(callee_name);
+"""
+
+
+class SymbolIndex:
+    """
+    A SQLite-backed index of the classes, members, bases, imports and call edges
+    extracted from a codebase.
+
+    Files are upserted one at a time and keyed by their content hash, so
+    re-indexing a tree only touches the files that changed. Queries return
+    model objects that can be rendered with `ModelRenderer`.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Opens (and if needed creates) the index database.
+
+        Args:
+            db_path (str): The path of the SQLite database file.
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_file_hash(self, path: str) -> Optional[str]:
+        """Returns the content hash stored for a file.
+
+        Args:
+            path (str): The path of the file relative to the analyzed root.
+
+        Returns:
+            str or None: The stored content hash, or None if the file is not indexed.
+        """
+        row = self.connection.execute(
+            "SELECT content_hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, model: FileModel) -> bool:
+        """Stores the model of a file, replacing any previously indexed version.
+
+        Args:
+            model (FileModel): The model to store.
+
+        Returns:
+            bool: True if the index changed, False if the stored content hash already matched.
+        """
+        if self.get_file_hash(model.path) == model.content_hash:
+            return False
+
+        with self.connection:
+            self.connection.execute("DELETE FROM files WHERE path = ?", (model.path,))
+            file_id = self.connection.execute(
+                "INSERT INTO files (path, content_hash) VALUES (?, ?)",
+                (model.path, model.content_hash),
+            ).lastrowid
+
+            for class_model in model.classes:
+                class_id = self.connection.execute(
+                    "INSERT INTO classes (file_id, name) VALUES (?, ?)",
+                    (file_id, class_model.name),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO members VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            class_id,
+                            position,
+                            member.name,
+                            member.kind,
+                            json.dumps(member.params),
+                            member.return_type,
+                        )
+                        for position, member in enumerate(class_model.members)
+                    ],
+                )
+                self.connection.executemany(
+                    "INSERT INTO bases VALUES (?, ?, ?)",
+                    [
+                        (class_id, position, base)
+                        for position, base in enumerate(class_model.bases)
+                    ],
+                )
+
+            self.connection.executemany(
+                "INSERT INTO imports VALUES (?, ?, ?)",
+                [(file_id, alias, target) for alias, target in model.imports.items()],
+            )
+            self.connection.executemany(
+                "INSERT INTO calls VALUES (?, ?, ?, ?)",
+                [
+                    (file_id, call.caller, call.callee, call.callee.split(".")[-1])
+                    for call in model.calls
+                ],
+            )
+        return True
+
+    def prune(self, paths: Iterable[str]) -> int:
+        """Removes every indexed file that is not in `paths`.
+
+        Args:
+            paths (Iterable[str]): The paths that still exist.
+
+        Returns:
+            int: The number of files removed.
+        """
+        keep = set(paths)
+        stale = [
+            (path,)
+            for (path,) in self.connection.execute("SELECT path FROM files")
+            if path not in keep
+        ]
+        with self.connection:
+            self.connection.executemany("DELETE FROM files WHERE path = ?", stale)
+        return len(stale)
+
+    def find_classes(self, name: str) -> List[ClassModel]:
+        """Returns every indexed class with the given name.
+
+        Args:
+            name (str): The class name.
+
+        Returns:
+            List[ClassModel]: The matching classes.
+        """
+        class_ids = self.connection.execute(
+            "SELECT id FROM classes WHERE name = ? ORDER BY id", (name,)
+        ).fetchall()
+        return [self.load_class(class_id) for (class_id,) in class_ids]
+
+    def subclasses(self, name: str, recursive: bool = True) -> List[ClassModel]:
+        """Returns the classes deriving from the named class.
+
+        Args:
+            name (str): The name of the base class.
+            recursive (bool): Whether to include indirect subclasses.
+
+        Returns:
+            List[ClassModel]: The subclasses, ordered by depth and then by index order.
+        """
+        if not recursive:
+            class_ids = self.connection.execute(
+                "SELECT DISTINCT class_id FROM bases WHERE base = ? ORDER BY class_id",
+                (name,),
+            ).fetchall()
+            return [self.load_class(class_id) for (class_id,) in class_ids]
+
+        # Walks the hierarchy one level at a time, so each class is found at
+        # its minimum depth. Visited classes and names are skipped, which ends
+        # the walk on inheritance cycles such as `class Foo(Foo)` after
+        # `from x import Foo`.
+        class_ids = []
+        seen_ids = set()
+        seen_names = {name}
+        names = [name]
+        while names:
+            rows = set()
+            for start in range(0, len(names), QUERY_CHUNK_SIZE):
+                chunk = names[start : start + QUERY_CHUNK_SIZE]
+                rows.update(
+                    self.connection.execute(
+                        f"""
+                        SELECT classes.id, classes.name
+                        FROM bases JOIN classes ON classes.id = bases.class_id
+                        WHERE bases.base IN ({", ".join("?" * len(chunk))})
+                        """,
+                        chunk,
+                    )
+                )
+            names = []
+            for class_id, class_name in sorted(rows):
+                if class_id in seen_ids:
+                    continue
+                seen_ids.add(class_id)
+                class_ids.append(class_id)
+                if class_name not in seen_names:
+                    seen_names.add(class_name)
+                    names.append(class_name)
+        return [self.load_class(class_id) for class_id in class_ids]
+
+    def callers(self, name: str) -> List[CallModel]:
+        """Returns the call edges into a function.
+
+        Args:
+            name (str): Either the fully qualified callee, e.g. "os.path.join",
+                or just its last component, e.g. "join".
+
+        Returns:
+            List[CallModel]: The matching call edges.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT caller, callee FROM calls
+            WHERE callee = ? OR callee_name = ?
+            ORDER BY file_id, rowid
+            """,
+            (name, name),
+        ).fetchall()
+        return [CallModel(caller=caller, callee=callee) for caller, callee in rows]
+
+    def callees(self, caller: str) -> List[CallModel]:
+        """Returns the call edges out of a function.
+
+        Args:
+            caller (str): The caller name, e.g. "main" or "MyClass.run".
+
+        Returns:
+            List[CallModel]: The matching call edges.
+        """
+        rows = self.connection.execute(
+            "SELECT caller, callee FROM calls WHERE caller = ? ORDER BY file_id, rowid",
+            (caller,),
+        ).fetchall()
+        return [CallModel(caller=caller, callee=callee) for caller, callee in rows]
+
+    def importers(self, target: str) -> List[str]:
+        """Returns the paths of the files importing a module or name.
+
+        Args:
+            target (str): The fully qualified module or name, e.g. "os.path".
+
+        Returns:
+            List[str]: The importing file paths.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT DISTINCT files.path FROM imports
+            JOIN files ON files.id = imports.file_id
+            WHERE imports.target = ? ORDER BY files.path
+            """,
+            (target,),
+        ).fetchall()
+        return [path for (path,) in rows]
+
+    def load_class(self, class_id: int) -> ClassModel:
+        """Rebuilds a class model from the index.
+
+        Args:
+            class_id (int): The row id of the class.
+
+        Returns:
+            ClassModel: The class with its bases and members.
+        """
+        (name,) = self.connection.execute(
+            "SELECT name FROM classes WHERE id = ?", (class_id,)
+        ).fetchone()
+        bases = [
+            base
+            for (base,) in self.connection.execute(
+                "SELECT base FROM bases WHERE class_id = ? ORDER BY position",
+                (class_id,),
+            )
+        ]
+        members = [
+            MemberModel(
+                name=member_name,
+                kind=kind,
+                params=json.loads(params) if params else [],
+                return_type=return_type,
+            )
+            for member_name, kind, params, return_type in self.connection.execute(
+                """
+                SELECT name, kind, params, return_type FROM members
+                WHERE class_id = ? ORDER BY position
+                """,
+                (class_id,),
+            )
+        ]
+        return ClassModel(name=name, bases=bases, members=members)
@@ -3,27 +3,564 @@ import logging
 import os
 import shutil
 
-from src.code_analyzer.code_analysis import CodeAnalyzer
-from src.file_operations.file_operations import FileOperations
+from src.code_analyzer.code_analysis import DIAGRAM_TYPES, OUTPUT_LAYOUTS, CodeAnalyzer
+from src.code_analyzer.revision_diff import RevisionDiff
+from src.config.project_config import CONFIG_FILE, Profile, ProjectConfig
+from src.file_operations.file_operations import DEFAULT_DATA_DIR, FileOperations
+from src.frontends.registry import FrontendRegistry
+from src.index.symbol_index import SymbolIndex
+from src.model.model_diff import ADDED, CHANGED, REMOVED
+from src.model.model_renderer import ModelRenderer
+from src.model.model_store import ModelReader, ModelWriter
+from src.model.shared_model_cache import DEFAULT_CACHE_LIMIT, SharedModelCache
+from src.server.diagram_server import DEFAULT_WORKERS, DiagramServer
+
+DEFAULT_INDEX_DB = os.path.join(DEFAULT_DATA_DIR, "index.sqlite")
+
+
+def parse_shard(value: str) -> tuple:
+    """Parses a shard specification of the form "i/N".
+
+    Args:
+        value (str): The shard specification, e.g. "0/4".
+
+    Raises:
+        argparse.ArgumentTypeError: If the specification is malformed or out of range.
+
+    Returns:
+        tuple: The shard index and shard count.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard {value!r}, expected i/N.")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(
+            f"Invalid shard {value!r}, expected 0 <= i < N."
+        )
+    return index, count
+
+
+def open_model_cache(args: argparse.Namespace) -> SharedModelCache:
+    """Opens the shared model cache requested on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        SharedModelCache: The cache, or None if `--cache-dir` is not given.
+    """
+    if not args.cache_dir:
+        return None
+    return SharedModelCache(args.cache_dir, args.cache_limit * 1024 * 1024)
+
+
+def load_profile(args: argparse.Namespace) -> Profile:
+    """Loads the configuration profile for a run.
+
+    The configuration is read from `--config`, or else found next to or above
+    the analyzed codebase, or the current directory for commands that do not
+    analyze a local codebase.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Raises:
+        ValueError: If `--profile` is given but there is no configuration.
+
+    Returns:
+        Profile: The profile, or None if there is no configuration.
+    """
+    if args.config:
+        config = ProjectConfig.load(args.config)
+    else:
+        root = getattr(args, "path", None)
+        if root is None and args.local not in (None, "BROWSE"):
+            root = args.local
+        config = ProjectConfig.discover(root or ".")
+
+    if config is None:
+        if args.profile:
+            raise ValueError(
+                f"Profile {args.profile!r} requested, but no {CONFIG_FILE} or "
+                f"pyproject.toml with a [tool.mermaidit] table was found."
+            )
+        return None
+    return config.get_profile(args.profile)
+
+
+def get_profile_defaults(profile: Profile) -> dict:
+    """Returns the command-line defaults defined by a profile.
+
+    Args:
+        profile (Profile): The profile.
+
+    Returns:
+        dict: The argument defaults. Options given on the command line take precedence.
+            The `include` and `exclude` patterns are applied by `get_patterns`.
+    """
+    return {
+        "diagrams": profile.diagrams,
+        "jobs": profile.jobs,
+        "lazy": profile.lazy,
+        "nested_classes": profile.nested_classes,
+        "cache_dir": profile.cache_dir,
+        "cache_limit": profile.cache_limit,
+        "max_file_size": profile.max_file_size,
+        "output_dir": profile.output_dir,
+        "layout": profile.layout,
+    }
+
+
+def get_patterns(args: argparse.Namespace, profile: Profile, option: str) -> list:
+    """Returns the include or exclude patterns of a run.
+
+    Patterns given on the command line replace the profile's patterns instead
+    of being appended to them, like any other option.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+        profile (Profile): The configuration profile, or None.
+        option (str): "include" or "exclude".
+
+    Returns:
+        list: The glob patterns.
+    """
+    patterns = getattr(args, option)
+    if patterns is None:
+        patterns = list(getattr(profile, option)) if profile else []
+    return patterns
+
+
+def create_frontends(args: argparse.Namespace) -> FrontendRegistry:
+    """Creates the language front-ends with the extraction options given on the command line.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        FrontendRegistry: The front-ends. `--nested-classes` implies `--lazy`.
+    """
+    return FrontendRegistry(
+        lazy=args.lazy or args.nested_classes, nested_classes=args.nested_classes
+    )
+
+
+def get_max_file_size(args: argparse.Namespace) -> int:
+    """Returns the `--max-file-size` limit in bytes, or None if there is none."""
+    if args.max_file_size is None:
+        return None
+    return args.max_file_size * 1024
+
+
+def parse_diagram_types(value: str) -> tuple:
+    """Parses a comma-separated list of diagram types.
+
+    Args:
+        value (str): The diagram types, e.g. "class,sequence".
+
+    Raises:
+        argparse.ArgumentTypeError: If a diagram type is unknown.
+
+    Returns:
+        tuple: The diagram types.
+    """
+    diagram_types = tuple(part.strip() for part in value.split(",") if part.strip())
+    unknown = set(diagram_types) - set(DIAGRAM_TYPES)
+    if unknown or not diagram_types:
+        raise argparse.ArgumentTypeError(
+            f"Invalid diagram types {value!r}, expected a subset of {','.join(DIAGRAM_TYPES)}."
+        )
+    return diagram_types
+
+
+def render(args: argparse.Namespace):
+    """Renders the diagrams stored in a model file without touching the source files.
+
+    Args:
+        args (argparse.Namespace): The parsed `render` command-line arguments.
+    """
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    analyzer = CodeAnalyzer(args.source_root or ".", args.output_dir)
+    analyzer.render_models(ModelReader(args.model))
+
+
+def merge(args: argparse.Namespace):
+    """Merges partial model files into project-wide diagrams, a model file and an index.
+
+    Args:
+        args (argparse.Namespace): The parsed `merge` command-line arguments.
+    """
+    os.makedirs(args.output_dir, exist_ok=True)
+    analyzer = CodeAnalyzer(".", args.output_dir)
+    model_writer = ModelWriter(args.model_out) if args.model_out else None
+    symbol_index = SymbolIndex(args.db) if args.db else None
+    try:
+        analyzer.render_project(
+            ModelReader.merge(args.models), model_writer, symbol_index
+        )
+    finally:
+        if model_writer:
+            model_writer.close()
+        if symbol_index:
+            symbol_index.close()
+
+
+def serve(args: argparse.Namespace):
+    """Serves diagrams for a local codebase over HTTP until interrupted.
+
+    Args:
+        args (argparse.Namespace): The parsed `serve` command-line arguments.
+    """
+    server = DiagramServer(
+        (args.host, args.port),
+        args.path,
+        workers=args.workers,
+        cache_size=args.cache_size * 1024 * 1024,
+        shared_cache=open_model_cache(args),
+    )
+    host, port = server.server_address[:2]
+    print(f"Serving diagrams for {server.local_path} at http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def diff(args: argparse.Namespace):
+    """Renders the structural changes between two directories or Git refs.
+
+    Args:
+        args (argparse.Namespace): The parsed `diff` command-line arguments.
+    """
+    revision_diff = RevisionDiff(
+        frontends=create_frontends(args), model_cache=open_model_cache(args)
+    )
+    if os.path.isdir(args.old) and os.path.isdir(args.new):
+        model_diff = revision_diff.diff_directories(args.old, args.new)
+    else:
+        model_diff = revision_diff.diff_refs(args.repo, args.old, args.new)
+
+    statuses = [change.status for change in model_diff.classes]
+    sections = [
+        f"Changed files: {len(model_diff.paths)}; "
+        f"classes: {statuses.count(ADDED)} added, {statuses.count(REMOVED)} removed, "
+        f"{statuses.count(CHANGED)} changed; "
+        f"call edges: {len(model_diff.added_calls)} added, "
+        f"{len(model_diff.removed_calls)} removed.\n"
+    ]
+    if model_diff.classes:
+        sections.append(
+            FileOperations.wrap_mermaid_code(
+                ModelRenderer.render_class_diff(model_diff)
+            )
+        )
+    if model_diff.added_calls or model_diff.removed_calls:
+        sections.append(
+            FileOperations.wrap_mermaid_code(ModelRenderer.render_call_diff(model_diff))
+        )
+
+    report = "\n".join(sections)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+        print(f"Mermaid diff diagrams saved at {args.output}")
+    else:
+        print(report, end="")
+
+
+def index(args: argparse.Namespace):
+    """Incrementally updates the symbol index for a local codebase.
+
+    Args:
+        args (argparse.Namespace): The parsed `index` command-line arguments.
+    """
+    with SymbolIndex(args.db) as symbol_index:
+        analyzer = CodeAnalyzer(
+            args.path,
+            model_cache=open_model_cache(args),
+            frontends=create_frontends(args),
+            include=args.include,
+            exclude=args.exclude,
+            max_file_size=get_max_file_size(args),
+        )
+        updated, removed = analyzer.update_index(symbol_index)
+    print(f"Index {args.db} updated: {updated} files re-indexed, {removed} removed.")
+
+
+def query(args: argparse.Namespace):
+    """Queries the symbol index and renders the result set as a Mermaid diagram.
+
+    Args:
+        args (argparse.Namespace): The parsed `query` command-line arguments.
+    """
+    with SymbolIndex(args.db) as symbol_index:
+        if args.subclasses_of:
+            classes = symbol_index.find_classes(args.subclasses_of)
+            # A class deriving from an imported class of the same name is both.
+            classes += [
+                class_model
+                for class_model in symbol_index.subclasses(args.subclasses_of)
+                if class_model not in classes
+            ]
+            diagram = ModelRenderer.render_class_diagram(classes)
+        elif args.class_name:
+            diagram = ModelRenderer.render_class_diagram(
+                symbol_index.find_classes(args.class_name)
+            )
+        elif args.callers_of:
+            diagram = ModelRenderer.render_call_graph(
+                symbol_index.callers(args.callers_of)
+            )
+        else:
+            diagram = ModelRenderer.render_call_graph(
+                symbol_index.callees(args.callees_of)
+            )
+
+    wrapped_diagram = FileOperations.wrap_mermaid_code(diagram)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(wrapped_diagram)
+        print(f"Mermaid diagram saved at {args.output}")
+    else:
+        print(wrapped_diagram, end="")
 
 
 def main():
     """Entry point for the Mermaid diagram generation tool.
 
     Parses command-line arguments to determine whether to clone a GitLab repository or analyze a local codebase.
-    Prompts the user to select an output location for the generated diagrams.
+    Prompts the user to select an output location for the generated diagrams, unless one is given
+    or a configuration profile is used (see `ProjectConfig`).
     Creates a CodeAnalyzer object and calls its analyze method to generate the Mermaid diagrams.
     Cleans up the cloned repository (if created) after analysis is complete.
+
+    The `render` subcommand instead renders diagrams from a model file written with `--model-out`.
     """
     parser = argparse.ArgumentParser(
         description="Generate Mermaid class diagrams from a Python code base"
     )
+    parser.add_argument(
+        "--config",
+        help=f"Configuration file to read profiles from (default: the nearest {CONFIG_FILE} "
+        "or pyproject.toml with a [tool.mermaidit] table)",
+        type=str,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Configuration profile to run with (default: the top-level settings)",
+        type=str,
+    )
     parser.add_argument("--url", help="GitLab repository URL", type=str)
     parser.add_argument(
         "--local", help="Local repository path", type=str, nargs="?", const="BROWSE"
     )
+    parser.add_argument(
+        "--output-dir",
+        help="Directory to save the diagrams in (skips the output location prompt)",
+        type=str,
+    )
+    parser.add_argument(
+        "--model-out",
+        help="Also write the extracted model to this file (.jsonl or .jsonl.gz)",
+        type=str,
+    )
+    parser.add_argument(
+        "--shard",
+        help="Only analyze the i-th of N deterministic partitions of the files, e.g. 0/4",
+        type=parse_shard,
+    )
+    parser.add_argument(
+        "--diagrams",
+        help="Comma-separated diagram types to generate (default: class,sequence)",
+        type=parse_diagram_types,
+        default=DIAGRAM_TYPES,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="Number of worker processes extracting models in parallel",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--include",
+        help="Only analyze files matching this glob pattern (repeatable)",
+        action="append",
+    )
+    parser.add_argument(
+        "--exclude",
+        help="Skip files and directories matching this glob pattern (repeatable)",
+        action="append",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        help="Skip source files larger than this size in KB",
+        type=int,
+    )
+    parser.add_argument(
+        "--layout",
+        help="Save the diagrams directly in the output directory (flat) or below "
+        "the source directory structure (mirror)",
+        choices=OUTPUT_LAYOUTS,
+        default="flat",
+    )
+    parser.add_argument(
+        "--lazy",
+        help="Extract classes from module- and class-level declarations only, "
+        "without visiting function bodies unless calls or sequences are needed",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--nested-classes",
+        help="Also extract classes nested in other classes, named by their "
+        "qualified name (implies --lazy)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of a parse cache shared by concurrent runs on this host",
+        type=str,
+    )
+    parser.add_argument(
+        "--cache-limit",
+        help="Size in MB at which the shared parse cache is compacted",
+        type=int,
+        default=DEFAULT_CACHE_LIMIT // (1024 * 1024),
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    render_parser = subparsers.add_parser(
+        "render", help="Render diagrams from a model file written with --model-out"
+    )
+    render_parser.add_argument("model", help="Model file to render", type=str)
+    render_parser.add_argument(
+        "--output-dir",
+        help="Directory to save the diagrams in",
+        type=str,
+        default=DEFAULT_DATA_DIR,
+    )
+    render_parser.add_argument(
+        "--source-root",
+        help="Save the diagrams next to the original source files below this root instead",
+        type=str,
+    )
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="Merge the partial model files of sharded runs"
+    )
+    merge_parser.add_argument("models", help="Partial model files", type=str, nargs="+")
+    merge_parser.add_argument(
+        "--output-dir",
+        help="Directory to save the diagrams in",
+        type=str,
+        default=DEFAULT_DATA_DIR,
+    )
+    merge_parser.add_argument(
+        "--model-out", help="Write the merged model to this file", type=str
+    )
+    merge_parser.add_argument(
+        "--db", help="Upsert the merged model into this index database", type=str
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve class, sequence and import diagrams over HTTP"
+    )
+    serve_parser.add_argument("path", help="Local repository path", type=str)
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument(
+        "--workers",
+        help="Number of worker threads handling requests",
+        type=int,
+        default=DEFAULT_WORKERS,
+    )
+    serve_parser.add_argument(
+        "--cache-size", help="Model cache size in MB", type=int, default=64
+    )
+
+    diff_parser = subparsers.add_parser(
+        "diff", help="Render the structural changes between two directories or Git refs"
+    )
+    diff_parser.add_argument("old", help="Old directory, or Git commit, branch or tag")
+    diff_parser.add_argument("new", help="New directory, or Git commit, branch or tag")
+    diff_parser.add_argument(
+        "--repo", help="Git repository to resolve refs in", type=str, default="."
+    )
+    diff_parser.add_argument(
+        "--output",
+        help="File to save the diagrams in instead of printing them",
+        type=str,
+    )
+
+    index_parser = subparsers.add_parser(
+        "index", help="Incrementally update the SQLite symbol index of a local codebase"
+    )
+    index_parser.add_argument("path", help="Local repository path", type=str)
+    index_parser.add_argument(
+        "--db", help="Index database file", type=str, default=DEFAULT_INDEX_DB
+    )
+
+    query_parser = subparsers.add_parser(
+        "query", help="Render a Mermaid diagram for a symbol index query"
+    )
+    query_parser.add_argument(
+        "--db", help="Index database file", type=str, default=DEFAULT_INDEX_DB
+    )
+    query_group = query_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument(
+        "--subclasses-of", help="All direct and indirect subclasses of a class"
+    )
+    query_group.add_argument("--class", dest="class_name", help="A class by name")
+    query_group.add_argument("--callers-of", help="All functions calling a function")
+    query_group.add_argument("--callees-of", help="All functions called by a function")
+    query_parser.add_argument(
+        "--output", help="File to save the diagram in instead of printing it", type=str
+    )
     args = parser.parse_args()
 
+    # Settings from the configuration profile replace the built-in defaults,
+    # so options given on the command line still take precedence.
+    profile = load_profile(args)
+    if profile:
+        parser.set_defaults(**get_profile_defaults(profile))
+        if profile.output_dir:
+            # Defaults of a subcommand's own options take precedence over the
+            # main parser's, so they are replaced too.
+            for subparser in (render_parser, merge_parser):
+                subparser.set_defaults(output_dir=profile.output_dir)
+        args = parser.parse_args()
+    args.include = get_patterns(args, profile, "include")
+    args.exclude = get_patterns(args, profile, "exclude")
+
+    if args.command == "render":
+        if args.source_root:
+            args.output_dir = None
+        render(args)
+        return
+
+    if args.command == "merge":
+        merge(args)
+        return
+
+    if args.command == "serve":
+        serve(args)
+        return
+
+    if args.command == "diff":
+        diff(args)
+        return
+
+    if args.command == "index":
+        index(args)
+        return
+
+    if args.command == "query":
+        query(args)
+        return
+
     if args.url and args.local:
         raise ValueError(
             "Please provide either a GitLab repository URL (--url) or a local repository path (--local), but not both."
@@ -39,13 +576,31 @@ def main():
         FileOperations.clone_repo(args.url, local_path)
     else:
         if args.local == "BROWSE":
-            local_path = FileOperations.browse_directory()
+            local_path = FileOperations.get_src_directory()
         else:
             local_path = args.local
 
-    output_dir = FileOperations.ask_output_location()
+    # Runs with a configuration never prompt; without an output directory the
+    # diagrams are saved next to the source files.
+    if args.output_dir or profile:
+        output_dir = args.output_dir
+    else:
+        output_dir = FileOperations.ask_output_location()
 
-    analyzer = CodeAnalyzer(local_path, output_dir)
+    analyzer = CodeAnalyzer(
+        local_path,
+        output_dir,
+        model_out=args.model_out,
+        shard=args.shard,
+        diagram_types=args.diagrams,
+        model_cache=open_model_cache(args),
+        frontends=create_frontends(args),
+        jobs=args.jobs,
+        include=args.include,
+        exclude=args.exclude,
+        max_file_size=get_max_file_size(args),
+        layout=args.layout,
+    )
     analyzer.analyze()
 
     if args.url:
@@ -1,5 +1,9 @@
 import ast
 import logging
+from typing import List
+
+from src.model.model import ClassModel, MemberModel
+from src.model.model_renderer import ModelRenderer
 
 
 class MermaidParser:
@@ -8,14 +12,41 @@ class MermaidParser:
     Mermaid diagrams from them.
     """
 
-    def __init__(self):
+    def __init__(self, lazy: bool = False, nested_classes: bool = False):
         """
         Initializes the `MermaidParser` object with an empty class diagram.
+
+        Args:
+            lazy (bool): Whether to only visit module-level and class-level
+                statements. Function and method bodies are not entered, so
+                classes defined in them are left out.
+            nested_classes (bool): Whether to also extract the classes nested
+                in other classes, named by their qualified name. Only used
+                in lazy mode.
         """
-        self.class_diagram = "classDiagram\n"
+        self.lazy = lazy
+        self.nested_classes = nested_classes
+        self.class_diagram_parts = ["classDiagram\n"]
+        self.classes: List[ClassModel] = []
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
 
+    @property
+    def class_diagram(self) -> str:
+        """
+        The class diagram built so far.
+
+        The diagram is collected as a list of lines and only joined when read,
+        so building it stays linear in the number of classes.
+        """
+        if len(self.class_diagram_parts) > 1:
+            self.class_diagram_parts = ["".join(self.class_diagram_parts)]
+        return self.class_diagram_parts[0]
+
+    @class_diagram.setter
+    def class_diagram(self, diagram: str):
+        self.class_diagram_parts = [diagram]
+
     def parse_file(self, file_path: str):
         """
         Parses a Python file for class definitions and updates the class diagram
@@ -37,50 +68,101 @@ class MermaidParser:
         """
         tree = ast.parse(content)
         self.logger.debug(f"Parsed AST tree: {tree}")
+        self.parse_tree(tree)
+
+    def parse_tree(self, tree: ast.AST):
+        """
+        Builds the class diagram from an already parsed AST, so callers that
+        need the tree for other diagrams do not have to parse the source twice.
+
+        In lazy mode only module-level and class-level statements are visited;
+        otherwise every class in the tree is extracted, including the classes
+        defined in function bodies.
+
+        Args:
+            tree (ast.AST): The parsed module.
+        """
+        if self.lazy:
+            self.parse_statements(tree.body)
+            return
 
         for node in ast.walk(tree):
             if isinstance(node, ast.ClassDef):
-                class_name = node.name
-                self.logger.debug(f"Found class: {class_name}")
+                self.parse_class(node, node.name)
+
+    def parse_statements(self, statements: List[ast.stmt], scope: str = ""):
+        """
+        Extracts the classes defined by a list of module-level or class-level
+        statements without entering function bodies.
+
+        Classes defined in compound statements such as `if TYPE_CHECKING:` or
+        `try` blocks are included. Classes nested in a class are only included
+        if `nested_classes` is set.
+
+        Args:
+            statements (List[ast.stmt]): The statements to visit.
+            scope (str): The qualified name prefix of the classes, e.g. "Outer.".
+        """
+        for statement in statements:
+            if isinstance(statement, ast.ClassDef):
+                qualname = scope + statement.name
+                self.parse_class(statement, qualname)
+                if self.nested_classes:
+                    self.parse_statements(statement.body, qualname + ".")
+            elif not isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for field in ("body", "orelse", "finalbody"):
+                    self.parse_statements(getattr(statement, field, []), scope)
+                for handler in getattr(statement, "handlers", []):
+                    self.parse_statements(handler.body, scope)
+
+    def parse_class(self, node: ast.ClassDef, class_name: str):
+        """
+        Extracts a class with its methods and attributes and adds it to the
+        class diagram.
 
-                base_class = self.extract_base_class(node)
+        Args:
+            node (ast.ClassDef): The class definition.
+            class_name (str): The name to extract the class as.
+        """
+        self.logger.debug(f"Found class: {class_name}")
 
-                self.class_diagram += f"class {class_name} {{\n"
+        class_model = ClassModel(name=class_name, bases=self.extract_base_classes(node))
+        diagram_name = ModelRenderer.render_class_name(class_name)
 
-                for child in ast.iter_child_nodes(node):
-                    if isinstance(child, ast.FunctionDef):
-                        self.process_class_methods(child)
-                    elif isinstance(child, ast.Assign) or isinstance(
-                        child, ast.AnnAssign
-                    ):
-                        self.process_class_attributes(child)
+        self.class_diagram_parts.append(f"class {diagram_name} {{\n")
 
-                self.class_diagram += "}\n"
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.FunctionDef):
+                class_model.members.append(self.process_class_methods(child))
+            elif isinstance(child, ast.Assign) or isinstance(child, ast.AnnAssign):
+                class_model.members.extend(self.process_class_attributes(child))
 
-                if base_class:
-                    self.class_diagram += f"{base_class} <|-- {class_name}\n"
+        self.class_diagram_parts.append("}\n")
 
-    def extract_base_class(self, node: ast.ClassDef):
-        """Extracts the base class from an AST ClassDef node.
+        for base_class in class_model.bases:
+            self.class_diagram_parts.append(f"{base_class} <|-- {diagram_name}\n")
+
+        self.classes.append(class_model)
+
+    def extract_base_classes(self, node: ast.ClassDef) -> List[str]:
+        """Extracts the names of all plain-name base classes of a ClassDef node.
 
         Args:
-            node (ast.ClassDef): The ClassDef node to extract the base class from.
+            node (ast.ClassDef): The ClassDef node to extract the base classes from.
 
         Returns:
-            str or None: The base class name or None if no base class is present.
+            List[str]: The base class names, in declaration order.
         """
-        base_class = None
-        if node.bases:
-            base_class = (
-                node.bases[0].id if isinstance(node.bases[0], ast.Name) else None
-            )
-        return base_class
+        return [base.id for base in node.bases if isinstance(base, ast.Name)]
 
-    def process_class_methods(self, child: ast.FunctionDef):
+    def process_class_methods(self, child: ast.FunctionDef) -> MemberModel:
         """Processes class methods and appends them to the class diagram.
 
         Args:
             child (ast.FunctionDef): The FunctionDef node representing a class method.
+
+        Returns:
+            MemberModel: The extracted method.
         """
         method_name = child.name
         self.logger.debug(f"Found method: {method_name}")
@@ -105,28 +187,37 @@ class MermaidParser:
             elif isinstance(child.returns, ast.Attribute):
                 return_type = f"{child.returns.value.id}.{child.returns.attr}"
 
-        params_str = ", ".join(params)
-        if return_type:
-            self.class_diagram += f"    +{method_name}({params_str}) : {return_type}\n"
-        else:
-            self.class_diagram += f"    +{method_name}({params_str})\n"
+        member = MemberModel(
+            name=method_name, kind="method", params=params, return_type=return_type
+        )
+        self.class_diagram_parts.append(ModelRenderer.render_member(member))
+        return member
 
-    def process_class_attributes(self, child: ast.Assign or ast.AnnAssign):
+    def process_class_attributes(
+        self, child: ast.Assign or ast.AnnAssign
+    ) -> List[MemberModel]:
         """Processes class attributes and appends them to the class diagram.
 
         Args:
             child (ast.Assign or ast.AnnAssign): The Assign or AnnAssign node representing a class attribute.
+
+        Returns:
+            List[MemberModel]: The extracted attributes.
         """
         if isinstance(child, ast.Assign):
             targets = child.targets
         else:
             targets = [child.target]
 
+        members = []
         for target in targets:
             if isinstance(target, ast.Name):
                 attribute_name = target.id
                 self.logger.debug(f"Found attribute: {attribute_name}")
-                self.class_diagram += f"    +{attribute_name}\n"
+                member = MemberModel(name=attribute_name)
+                self.class_diagram_parts.append(ModelRenderer.render_member(member))
+                members.append(member)
+        return members
 
     def get_diagram(self):
         """
@@ -135,5 +226,6 @@ class MermaidParser:
         Returns:
             str: The generated class diagram.
         """
-        self.logger.debug(f"Generated class diagram: {self.class_diagram}")
-        return self.class_diagram
+        diagram = self.class_diagram
+        self.logger.debug("Generated class diagram: %s", diagram)
+        return diagram
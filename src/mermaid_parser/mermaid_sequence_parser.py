@@ -1,9 +1,17 @@
 import ast
+import io
 import logging
 from collections import deque
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from src.mermaid_parser.mermaid_parser import MermaidParser
+from src.model.model import BlockModel, BranchModel, CallModel
+from src.model.model_renderer import ModelRenderer
+
+MAX_TEXT_LENGTH = 40
+TRY_STATEMENTS = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+
+SequenceStep = Union[CallModel, BlockModel]
 
 
 class MermaidSequenceParser(MermaidParser):
@@ -11,10 +19,16 @@ class MermaidSequenceParser(MermaidParser):
     sequence_diagram: str
     visited: set
     participants: set
+    sequence: List[SequenceStep]
+    source: str
+    source_lines: Tuple[str, List[str]]
 
     def __init__(self):
         super().__init__()
         self.sequence_diagram = "sequenceDiagram\n"
+        self.sequence = []
+        self.source = None
+        self.source_lines = None
         self.participants = set()
         self.visited = set()
         self.logger = logging.getLogger(__name__)
@@ -32,44 +46,238 @@ class MermaidSequenceParser(MermaidParser):
 
     def process_function_calls(
         self, caller_name: str, caller_node: ast.AST, imports: Dict[str, str]
-    ) -> None:
+    ) -> List[CallModel]:
         """
-        Processes the function calls in the given caller_node and updates the sequence diagram.
+        Extracts the function calls of a single statement or expression in evaluation order.
+
+        Arguments are evaluated before the call they are passed to, so inner calls
+        come first. Nested function, class and lambda definitions are not entered,
+        since their bodies do not run as part of the statement.
 
         Args:
             caller_name (str): The name of the caller.
-            caller_node (ast.AST): The AST node of the caller.
+            caller_node (ast.AST): The statement or expression to extract the calls from.
             imports (Dict[str, str]): The imported modules in the Python file.
+
+        Returns:
+            List[CallModel]: The calls, with identical consecutive calls collapsed.
         """
-        for node in ast.walk(caller_node):
+        calls: List[CallModel] = []
+
+        def visit(node: ast.AST):
+            if isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+            ):
+                return
+            for child in ast.iter_child_nodes(node):
+                visit(child)
             if isinstance(node, ast.Call):
-                callee = self.get_callee(node.func, imports)
-                if callee is not None:
-                    callee_class_name = callee.split(".")[-1]
-                    self.participants.add(caller_name)
-                    self.participants.add(callee)
-                    self.sequence_diagram += f"    {caller_name} ->>+ {callee_class_name}: {callee_class_name}({', '.join([ast.dump(arg) for arg in node.args])})\n"
+                call = CallModel(
+                    caller=caller_name,
+                    callee=self.get_callee(node.func, imports),
+                    args=self.format_arguments(node),
+                )
+                self.extend_steps(calls, [call])
+
+        visit(caller_node)
+        return calls
 
     def process_branches(
-        self, caller_name: str, main_function_node: ast.AST, imports: Dict[str, str]
-    ) -> None:
+        self, caller_name: str, statements: List[ast.stmt], imports: Dict[str, str]
+    ) -> List[SequenceStep]:
         """
-        Processes the branches in the main function node and updates the sequence diagram.
+        Builds the sequence of messages and control-flow blocks for a list of statements.
+
+        `if` statements become `opt` blocks, or `alt` blocks when they have `elif` or
+        `else` branches; `for` and `while` statements become `loop` blocks; `try`
+        statements become `alt` blocks with one branch per handler. Blocks that
+        contain no calls are left out.
 
         Args:
             caller_name (str): The name of the caller.
-            main_function_node (ast.AST): The main function node of the Python file.
+            statements (List[ast.stmt]): The statements to process, e.g. a function body.
             imports (Dict[str, str]): The imported modules in the Python file.
+
+        Returns:
+            List[SequenceStep]: The messages and blocks, in order.
+        """
+        steps: List[SequenceStep] = []
+
+        def calls(node: ast.AST) -> List[CallModel]:
+            return self.process_function_calls(caller_name, node, imports)
+
+        def branches(body: List[ast.stmt]) -> List[SequenceStep]:
+            return self.process_branches(caller_name, body, imports)
+
+        for statement in statements:
+            if isinstance(statement, ast.If):
+                self.extend_steps(steps, calls(statement.test))
+                block = BlockModel(
+                    "opt",
+                    [
+                        BranchModel(
+                            self.format_source(statement.test), branches(statement.body)
+                        )
+                    ],
+                )
+                orelse = statement.orelse
+                while len(orelse) == 1 and isinstance(orelse[0], ast.If):
+                    branch_steps = calls(orelse[0].test)
+                    self.extend_steps(branch_steps, branches(orelse[0].body))
+                    block.branches.append(
+                        BranchModel(self.format_source(orelse[0].test), branch_steps)
+                    )
+                    orelse = orelse[0].orelse
+                if orelse:
+                    block.branches.append(BranchModel("otherwise", branches(orelse)))
+                if len(block.branches) > 1:
+                    block.kind = "alt"
+                self.add_block(steps, block)
+            elif isinstance(statement, (ast.For, ast.AsyncFor, ast.While)):
+                if isinstance(statement, ast.While):
+                    label = f"while {self.format_source(statement.test)}"
+                    body_steps = calls(statement.test)
+                else:
+                    label = (
+                        f"for {self.format_source(statement.target)}"
+                        f" in {self.format_source(statement.iter)}"
+                    )
+                    self.extend_steps(steps, calls(statement.iter))
+                    body_steps = []
+                self.extend_steps(body_steps, branches(statement.body))
+                self.add_block(
+                    steps, BlockModel("loop", [BranchModel(label, body_steps)])
+                )
+                self.add_block(
+                    steps,
+                    BlockModel(
+                        "opt",
+                        [
+                            BranchModel(
+                                "loop completed without break",
+                                branches(statement.orelse),
+                            )
+                        ],
+                    ),
+                )
+            elif isinstance(statement, TRY_STATEMENTS):
+                block = BlockModel(
+                    "alt",
+                    [BranchModel("try", branches(statement.body + statement.orelse))],
+                )
+                for handler in statement.handlers:
+                    label = "except"
+                    if handler.type is not None:
+                        label += f" {self.format_source(handler.type)}"
+                    block.branches.append(BranchModel(label, branches(handler.body)))
+                if any(branch.steps for branch in block.branches[1:]):
+                    self.add_block(steps, block)
+                else:
+                    self.extend_steps(steps, block.branches[0].steps)
+                self.extend_steps(steps, branches(statement.finalbody))
+            elif isinstance(statement, (ast.With, ast.AsyncWith)):
+                for item in statement.items:
+                    self.extend_steps(steps, calls(item.context_expr))
+                self.extend_steps(steps, branches(statement.body))
+            else:
+                self.extend_steps(steps, calls(statement))
+
+        return steps
+
+    def extend_steps(self, steps: List[SequenceStep], new_steps: List[SequenceStep]):
+        """Appends steps, collapsing a call identical to the previous one into a count.
+
+        Args:
+            steps (List[SequenceStep]): The steps to extend.
+            new_steps (List[SequenceStep]): The steps to append.
+        """
+        for step in new_steps:
+            previous = steps[-1] if steps else None
+            if (
+                isinstance(step, CallModel)
+                and isinstance(previous, CallModel)
+                and (previous.caller, previous.callee, previous.args)
+                == (step.caller, step.callee, step.args)
+            ):
+                previous.count += step.count
+            else:
+                steps.append(step)
+
+    def add_block(self, steps: List[SequenceStep], block: BlockModel):
+        """Appends a block unless none of its branches contain any steps.
+
+        Args:
+            steps (List[SequenceStep]): The steps to extend.
+            block (BlockModel): The block to append.
+        """
+        if any(branch.steps for branch in block.branches):
+            steps.append(block)
+
+    def format_arguments(self, node: ast.Call) -> List[str]:
+        """Renders the arguments of a call from their source.
+
+        Args:
+            node (ast.Call): The call node.
+
+        Returns:
+            List[str]: The positional arguments followed by the keyword arguments.
+        """
+        arguments = [self.format_source(arg) for arg in node.args]
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                arguments.append(f"**{self.format_source(keyword.value)}")
+            else:
+                arguments.append(f"{keyword.arg}={self.format_source(keyword.value)}")
+        return arguments
+
+    def format_source(self, node: ast.AST) -> str:
+        """Renders a node as a single line of its source, truncated to `MAX_TEXT_LENGTH`.
+
+        Args:
+            node (ast.AST): The node to render.
+
+        Returns:
+            str: The source text of the node.
         """
-        for node in ast.walk(main_function_node):
-            if isinstance(node, (ast.If, ast.For, ast.While)):
-                self.process_function_calls(caller_name, node, imports)
-                if hasattr(node, "body"):
-                    for body_node in node.body:
-                        self.process_branches(caller_name, body_node, imports)
-                if hasattr(node, "orelse"):
-                    for orelse_node in node.orelse:
-                        self.process_branches(caller_name, orelse_node, imports)
+        text = None
+        if self.source is not None:
+            text = self.get_source_segment(node)
+        if text is None:
+            text = ast.unparse(node)
+        text = " ".join(text.split())
+        if len(text) > MAX_TEXT_LENGTH:
+            text = text[: MAX_TEXT_LENGTH - 3] + "..."
+        return text
+
+    def get_source_segment(self, node: ast.AST) -> Optional[str]:
+        """Returns the source text of a node, like `ast.get_source_segment`.
+
+        `ast.get_source_segment` splits the whole source into lines on every
+        call, which makes rendering all arguments and conditions of a module
+        quadratic in its size. The lines are split once per source instead.
+
+        Args:
+            node (ast.AST): The node to return the source of.
+
+        Returns:
+            Optional[str]: The source text, or None if the node has no location.
+        """
+        end_lineno = getattr(node, "end_lineno", None)
+        end_col_offset = getattr(node, "end_col_offset", None)
+        if end_lineno is None or end_col_offset is None:
+            return None
+        if self.source_lines is None or self.source_lines[0] is not self.source:
+            self.source_lines = (
+                self.source,
+                io.StringIO(self.source, newline="").readlines(),
+            )
+        lines = self.source_lines[1]
+        lineno, end_lineno = node.lineno - 1, end_lineno - 1
+        if lineno == end_lineno:
+            return lines[lineno].encode()[node.col_offset : end_col_offset].decode()
+        first = lines[lineno].encode()[node.col_offset :].decode()
+        last = lines[end_lineno].encode()[:end_col_offset].decode()
+        return "".join([first, *lines[lineno + 1 : end_lineno], last])
 
     def parse_file(
         self, file_path: str, imports=None
@@ -90,6 +298,25 @@ class MermaidSequenceParser(MermaidParser):
             content = f.read()
             tree = ast.parse(content)
 
+        self.source = content
+        return tree, self.collect_imports(tree, imports)
+
+    def collect_imports(
+        self, tree: ast.AST, imports: Dict[str, str] = None
+    ) -> Dict[str, str]:
+        """
+        Collects the imported module names and aliases of a parsed module.
+
+        Args:
+            tree (ast.AST): The parsed module.
+            imports (Dict[str, str], optional): An existing mapping to update.
+
+        Returns:
+            Dict[str, str]: The imported names mapped to their fully qualified names.
+        """
+        if imports is None:
+            imports = {}
+
         for node in ast.walk(tree):
             if isinstance(node, ast.Import):
                 for alias in node.names:
@@ -98,7 +325,54 @@ class MermaidSequenceParser(MermaidParser):
                 for alias in node.names:
                     imports[alias.asname or alias.name] = f"{node.module}.{alias.name}"
 
-        return tree, imports
+        return imports
+
+    def extract_call_edges(
+        self, tree: ast.AST, imports: Dict[str, str]
+    ) -> List[CallModel]:
+        """
+        Extracts the unique caller/callee edges of every module-level function and method.
+
+        Methods are named by their qualified name, e.g. "MyClass.run". Calls made
+        in nested functions are attributed to the enclosing function.
+        Functions are visited in source order, and the calls of a function in
+        the source order of their call expressions, so an outer call such as
+        `load(...)` precedes the `os.path.join(...)` in its arguments.
+
+        Args:
+            tree (ast.AST): The parsed module.
+            imports (Dict[str, str]): The imported modules in the Python file.
+
+        Returns:
+            List[CallModel]: The call edges, in source order of their first call.
+        """
+        functions = []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.append((node.name, node))
+            elif isinstance(node, ast.ClassDef):
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        functions.append((f"{node.name}.{child.name}", child))
+
+        edges = []
+        seen = set()
+        for caller_name, function_node in functions:
+            # ast.walk is breadth-first, so the calls are sorted by position.
+            calls = sorted(
+                (
+                    node
+                    for node in ast.walk(function_node)
+                    if isinstance(node, ast.Call)
+                ),
+                key=lambda node: (node.lineno, node.col_offset),
+            )
+            for node in calls:
+                callee = self.get_callee(node.func, imports)
+                if (caller_name, callee) not in seen:
+                    seen.add((caller_name, callee))
+                    edges.append(CallModel(caller=caller_name, callee=callee))
+        return edges
 
     def get_sequence_diagram(self):
         return self.sequence_diagram
@@ -175,6 +449,21 @@ class MermaidSequenceParser(MermaidParser):
             file_path (str): The path to the Python file to analyze.
         """
         tree, imports = self.parse_file(file_path)
+        self.parse_main_tree(tree, imports)
+
+    def parse_main_tree(
+        self, tree: ast.AST, imports: Dict[str, str], source: str = None
+    ):
+        """Parses the main function of an already parsed module for function calls.
+
+        Args:
+            tree (ast.AST): The parsed module.
+            imports (Dict[str, str]): The imported modules in the Python file.
+            source (str, optional): The source of the module, used to render arguments
+                and conditions. If not given, they are unparsed from the tree.
+        """
+        if source is not None:
+            self.source = source
 
         main_function_node = None
 
@@ -184,11 +473,10 @@ class MermaidSequenceParser(MermaidParser):
                 break
 
         if main_function_node:
-            self.add_participants()
-            self.process_function_calls(
-                main_function_node.name, main_function_node, imports
+            self.sequence = self.process_branches(
+                main_function_node.name, main_function_node.body, imports
             )
-            self.process_branches(main_function_node.name, main_function_node, imports)
+            self.sequence_diagram += ModelRenderer.render_steps(self.sequence)
 
     def get_callee(self, node, imports):
         if isinstance(node, ast.Name):
@@ -0,0 +1,10 @@
+from src.model.model import (
+    BlockModel,
+    BranchModel,
+    CallModel,
+    ClassModel,
+    FileModel,
+    MemberModel,
+)
+from src.model.model_renderer import ModelRenderer
+from src.model.model_store import ModelReader, ModelWriter
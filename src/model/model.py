@@ -0,0 +1,206 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+
+@dataclass
+class MemberModel:
+    """A method or attribute declared in a class body.
+
+    Attributes:
+        name (str): The member name.
+        kind (str): Either "method" or "attribute".
+        params (List[str]): The rendered parameters of a method, e.g. "arg: int".
+        return_type (str, optional): The rendered return annotation of a method.
+    """
+
+    name: str
+    kind: str = "attribute"
+    params: List[str] = field(default_factory=list)
+    return_type: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {"n": self.name, "k": self.kind[0]}
+        if self.params:
+            data["p"] = self.params
+        if self.return_type:
+            data["r"] = self.return_type
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MemberModel":
+        return cls(
+            name=sys.intern(data["n"]),
+            kind="method" if data["k"] == "m" else "attribute",
+            params=[sys.intern(param) for param in data.get("p", [])],
+            return_type=data.get("r"),
+        )
+
+
+@dataclass
+class ClassModel:
+    """A class definition extracted from a source file.
+
+    Attributes:
+        name (str): The class name.
+        bases (List[str]): The names of the base classes.
+        members (List[MemberModel]): The methods and attributes of the class.
+    """
+
+    name: str
+    bases: List[str] = field(default_factory=list)
+    members: List[MemberModel] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        data = {"n": self.name}
+        if self.bases:
+            data["b"] = self.bases
+        if self.members:
+            data["m"] = [member.to_dict() for member in self.members]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClassModel":
+        return cls(
+            name=sys.intern(data["n"]),
+            bases=[sys.intern(base) for base in data.get("b", [])],
+            members=[MemberModel.from_dict(member) for member in data.get("m", [])],
+        )
+
+
+@dataclass
+class CallModel:
+    """A call from one function to another.
+
+    Attributes:
+        caller (str): The name of the calling function.
+        callee (str): The resolved name of the called function, e.g. "os.path.join".
+        args (List[str]): The rendered arguments of the call.
+        count (int): The number of identical consecutive calls this call stands for.
+    """
+
+    caller: str
+    callee: str
+    args: List[str] = field(default_factory=list)
+    count: int = 1
+
+    def to_dict(self) -> dict:
+        data = {"c": self.caller, "t": self.callee}
+        if self.args:
+            data["a"] = self.args
+        if self.count != 1:
+            data["x"] = self.count
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CallModel":
+        return cls(
+            caller=sys.intern(data["c"]),
+            callee=sys.intern(data["t"]),
+            args=data.get("a", []),
+            count=data.get("x", 1),
+        )
+
+
+@dataclass
+class BranchModel:
+    """One branch of a control-flow block in a sequence diagram.
+
+    Attributes:
+        label (str): The branch condition or description, e.g. "args.url".
+        steps (List[Union[CallModel, BlockModel]]): The messages and nested blocks of the branch.
+    """
+
+    label: str
+    steps: List[Union[CallModel, "BlockModel"]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"l": self.label, "s": [step.to_dict() for step in self.steps]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BranchModel":
+        return cls(
+            label=data["l"],
+            steps=[BlockModel.step_from_dict(step) for step in data["s"]],
+        )
+
+
+@dataclass
+class BlockModel:
+    """A control-flow block in a sequence diagram.
+
+    Attributes:
+        kind (str): The Mermaid block type: "alt", "opt" or "loop".
+        branches (List[BranchModel]): The branches of the block. Only "alt" blocks
+            have more than one branch.
+    """
+
+    kind: str
+    branches: List[BranchModel] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"k": self.kind, "br": [branch.to_dict() for branch in self.branches]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BlockModel":
+        return cls(
+            kind=data["k"],
+            branches=[BranchModel.from_dict(branch) for branch in data["br"]],
+        )
+
+    @staticmethod
+    def step_from_dict(data: dict) -> Union[CallModel, "BlockModel"]:
+        """Decodes a sequence step, which is either a call or a block."""
+        if "br" in data:
+            return BlockModel.from_dict(data)
+        return CallModel.from_dict(data)
+
+
+@dataclass
+class FileModel:
+    """Everything extracted from a single source file.
+
+    Attributes:
+        path (str): The path of the file relative to the analyzed root.
+        content_hash (str): The SHA-1 hex digest of the file content.
+        classes (List[ClassModel]): The classes defined in the file.
+        imports (Dict[str, str]): Imported names mapped to their fully qualified names.
+        calls (List[CallModel]): The call edges of every function in the file.
+        sequence (List[Union[CallModel, BlockModel]]): The ordered messages and control-flow
+            blocks of the `main` entry point, if any.
+    """
+
+    path: str
+    content_hash: str = ""
+    classes: List[ClassModel] = field(default_factory=list)
+    imports: Dict[str, str] = field(default_factory=dict)
+    calls: List[CallModel] = field(default_factory=list)
+    sequence: List[Union[CallModel, BlockModel]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        data = {"path": self.path, "hash": self.content_hash}
+        if self.classes:
+            data["classes"] = [class_model.to_dict() for class_model in self.classes]
+        if self.imports:
+            data["imports"] = self.imports
+        if self.calls:
+            data["calls"] = [call.to_dict() for call in self.calls]
+        if self.sequence:
+            data["sequence"] = [step.to_dict() for step in self.sequence]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FileModel":
+        return cls(
+            path=data["path"],
+            content_hash=data.get("hash", ""),
+            classes=[ClassModel.from_dict(item) for item in data.get("classes", [])],
+            imports={
+                sys.intern(alias): sys.intern(target)
+                for alias, target in data.get("imports", {}).items()
+            },
+            calls=[CallModel.from_dict(item) for item in data.get("calls", [])],
+            sequence=[
+                BlockModel.step_from_dict(item) for item in data.get("sequence", [])
+            ],
+        )
@@ -0,0 +1,177 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from src.model.model import CallModel, ClassModel, FileModel, MemberModel
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+@dataclass
+class ClassChange:
+    """A class that was added, removed or changed between two revisions.
+
+    Attributes:
+        status (str): One of "added", "removed" or "changed".
+        class_model (ClassModel): The new class, or the old one if it was removed.
+        added_members (List[MemberModel]): The members only in the new class.
+        removed_members (List[MemberModel]): The members only in the old class.
+        changed_members (List[MemberModel]): The new version of members whose signature changed.
+        added_bases (List[str]): The base classes only in the new class.
+        removed_bases (List[str]): The base classes only in the old class.
+        path (str): The path of the file defining the class in the new revision,
+            or in the old one if it was removed.
+    """
+
+    status: str
+    class_model: ClassModel
+    added_members: List[MemberModel] = field(default_factory=list)
+    removed_members: List[MemberModel] = field(default_factory=list)
+    changed_members: List[MemberModel] = field(default_factory=list)
+    added_bases: List[str] = field(default_factory=list)
+    removed_bases: List[str] = field(default_factory=list)
+    path: str = None
+
+    @property
+    def name(self) -> str:
+        return self.class_model.name
+
+
+@dataclass
+class ModelDiff:
+    """The structural difference between the models of two revisions.
+
+    Attributes:
+        paths (List[str]): The paths of the changed files that were compared.
+        classes (List[ClassChange]): The added, removed and changed classes.
+        added_calls (List[CallModel]): The call edges only in the new revision.
+        removed_calls (List[CallModel]): The call edges only in the old revision.
+    """
+
+    paths: List[str] = field(default_factory=list)
+    classes: List[ClassChange] = field(default_factory=list)
+    added_calls: List[CallModel] = field(default_factory=list)
+    removed_calls: List[CallModel] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.classes or self.added_calls or self.removed_calls)
+
+    @classmethod
+    def compare(
+        cls,
+        file_pairs: Iterable[Tuple[str, FileModel, FileModel]],
+    ) -> "ModelDiff":
+        """Compares the old and new models of the changed files.
+
+        Classes are matched by file and name, and call edges by file, caller
+        and callee, so same-named classes or callers in different files do not
+        hide each other's changes. A class removed from one changed file and
+        added to another with the same name counts as moved, and is only
+        reported if it also changed.
+
+        Args:
+            file_pairs (Iterable[Tuple[str, FileModel, FileModel]]): The path and the
+                old and new model of each changed file. A model is None if the
+                file does not exist in that revision.
+
+        Returns:
+            ModelDiff: The differences.
+        """
+        diff = cls()
+        old_classes: Dict[Tuple[str, str], ClassModel] = {}
+        new_classes: Dict[Tuple[str, str], ClassModel] = {}
+        old_calls: Dict[Tuple[str, str, str], CallModel] = {}
+        new_calls: Dict[Tuple[str, str, str], CallModel] = {}
+
+        for path, old_model, new_model in file_pairs:
+            diff.paths.append(path)
+            for model, classes, calls in (
+                (old_model, old_classes, old_calls),
+                (new_model, new_classes, new_calls),
+            ):
+                if model is None:
+                    continue
+                for class_model in model.classes:
+                    classes.setdefault((path, class_model.name), class_model)
+                for call in model.calls:
+                    calls.setdefault((path, call.caller, call.callee), call)
+
+        # Classes only in the old revision, by name, to pair them with added
+        # classes of the same name in other files.
+        removed_classes: Dict[str, List[Tuple[str, ClassModel]]] = {}
+        for (path, name), class_model in old_classes.items():
+            if (path, name) not in new_classes:
+                removed_classes.setdefault(name, []).append((path, class_model))
+
+        for (path, name), class_model in new_classes.items():
+            if (path, name) in old_classes:
+                old_class = old_classes[path, name]
+            elif removed_classes.get(name):
+                _, old_class = removed_classes[name].pop(0)
+            else:
+                diff.classes.append(ClassChange(ADDED, class_model, path=path))
+                continue
+            change = cls.compare_class(old_class, class_model, path)
+            if change:
+                diff.classes.append(change)
+        for classes in removed_classes.values():
+            diff.classes.extend(
+                ClassChange(REMOVED, class_model, path=path)
+                for path, class_model in classes
+            )
+
+        diff.added_calls = [
+            call for key, call in new_calls.items() if key not in old_calls
+        ]
+        diff.removed_calls = [
+            call for key, call in old_calls.items() if key not in new_calls
+        ]
+        return diff
+
+    @staticmethod
+    def compare_class(
+        old: ClassModel, new: ClassModel, path: str = None
+    ) -> ClassChange:
+        """Compares two versions of a class.
+
+        Members are matched by name and kind; a member whose parameters or
+        return type differ counts as changed.
+
+        Args:
+            old (ClassModel): The old version.
+            new (ClassModel): The new version.
+            path (str, optional): The path of the file defining the new version.
+
+        Returns:
+            ClassChange: The change, or None if the class is unchanged.
+        """
+        old_members = {(member.name, member.kind): member for member in old.members}
+        new_members = {(member.name, member.kind): member for member in new.members}
+        change = ClassChange(
+            CHANGED,
+            new,
+            added_members=[
+                member for key, member in new_members.items() if key not in old_members
+            ],
+            removed_members=[
+                member for key, member in old_members.items() if key not in new_members
+            ],
+            changed_members=[
+                member
+                for key, member in new_members.items()
+                if key in old_members and old_members[key] != member
+            ],
+            added_bases=[base for base in new.bases if base not in old.bases],
+            removed_bases=[base for base in old.bases if base not in new.bases],
+            path=path,
+        )
+        if (
+            change.added_members
+            or change.removed_members
+            or change.changed_members
+            or change.added_bases
+            or change.removed_bases
+        ):
+            return change
+        return None
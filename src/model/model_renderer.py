@@ -0,0 +1,335 @@
+import os
+import re
+from collections import Counter
+from typing import Iterable, List, Tuple, Union
+
+from src.model.model import BlockModel, CallModel, ClassModel, FileModel, MemberModel
+from src.model.model_diff import ADDED, CHANGED, REMOVED, ModelDiff
+
+DIFF_STYLES = {
+    ADDED: "fill:#dafbe1,stroke:#1a7f37",
+    REMOVED: "fill:#ffebe9,stroke:#cf222e,stroke-dasharray:5 5",
+    CHANGED: "fill:#fff8c5,stroke:#9a6700",
+}
+
+
+class ModelRenderer:
+    """
+    Renders extracted models as Mermaid diagram source.
+    """
+
+    @staticmethod
+    def render_member(member: MemberModel) -> str:
+        """Renders a single class member line.
+
+        Args:
+            member (MemberModel): The member to render.
+
+        Returns:
+            str: The member line, including indentation and trailing newline.
+        """
+        if member.kind != "method":
+            return f"    +{member.name}\n"
+
+        params_str = ", ".join(member.params)
+        if member.return_type:
+            return f"    +{member.name}({params_str}) : {member.return_type}\n"
+        return f"    +{member.name}({params_str})\n"
+
+    @staticmethod
+    def render_class_name(name: str) -> str:
+        """Renders a class name, quoting qualified names of nested classes.
+
+        Args:
+            name (str): The class name, e.g. "Outer.Inner".
+
+        Returns:
+            str: The name as Mermaid accepts it, e.g. "`Outer.Inner`".
+        """
+        if "." in name:
+            return f"`{name}`"
+        return name
+
+    @staticmethod
+    def render_class(class_model: ClassModel) -> str:
+        """Renders a class block followed by its inheritance relations.
+
+        Args:
+            class_model (ClassModel): The class to render.
+
+        Returns:
+            str: The Mermaid source for the class.
+        """
+        name = ModelRenderer.render_class_name(class_model.name)
+        lines = [f"class {name} {{\n"]
+        lines.extend(
+            ModelRenderer.render_member(member) for member in class_model.members
+        )
+        lines.append("}\n")
+        lines.extend(f"{base} <|-- {name}\n" for base in class_model.bases)
+        return "".join(lines)
+
+    @staticmethod
+    def render_class_diagram(classes: Iterable[ClassModel]) -> str:
+        """Renders a complete class diagram.
+
+        Args:
+            classes (Iterable[ClassModel]): The classes to include.
+
+        Returns:
+            str: The Mermaid class diagram.
+        """
+        return "classDiagram\n" + "".join(
+            ModelRenderer.render_class(class_model) for class_model in classes
+        )
+
+    @staticmethod
+    def escape_text(text: str) -> str:
+        """Escapes the characters that end or alter a Mermaid sequence diagram text.
+
+        Args:
+            text (str): The message or block label.
+
+        Returns:
+            str: The escaped text.
+        """
+        return text.translate({ord("#"): "#35;", ord(";"): "#59;"})
+
+    @staticmethod
+    def render_participant(name: str) -> str:
+        """Renders a sequence diagram participant name.
+
+        Characters Mermaid does not accept in participant names, such as the
+        angle brackets of "<unknown>" callees (e.g. `handlers[key](x)`), are
+        replaced with underscores.
+
+        Args:
+            name (str): The caller or callee name.
+
+        Returns:
+            str: The participant name, e.g. "unknown" for "<unknown>".
+        """
+        if name.isidentifier():
+            return name
+        return re.sub(r"\W+", "_", name).strip("_") or "unknown"
+
+    @staticmethod
+    def render_call(call: CallModel, indent: str = "    ") -> str:
+        """Renders a single sequence diagram message and closes its activation.
+
+        Args:
+            call (CallModel): The call to render.
+            indent (str): The indentation of the lines.
+
+        Returns:
+            str: The message and deactivation lines, including trailing newlines.
+        """
+        callee_name = ModelRenderer.render_participant(call.callee.split(".")[-1])
+        caller_name = ModelRenderer.render_participant(call.caller)
+        label = f"{callee_name}({', '.join(call.args)})"
+        if call.count > 1:
+            label += f" x{call.count}"
+        return (
+            f"{indent}{caller_name} ->>+ {callee_name}: {ModelRenderer.escape_text(label)}\n"
+            f"{indent}deactivate {callee_name}\n"
+        )
+
+    @staticmethod
+    def render_block(block: BlockModel, indent: str = "    ") -> str:
+        """Renders an alt, opt or loop block with its nested steps.
+
+        Args:
+            block (BlockModel): The block to render.
+            indent (str): The indentation of the block lines.
+
+        Returns:
+            str: The Mermaid source for the block.
+        """
+        lines = []
+        for position, branch in enumerate(block.branches):
+            keyword = block.kind if position == 0 else "else"
+            lines.append(
+                f"{indent}{keyword} {ModelRenderer.escape_text(branch.label)}\n"
+            )
+            lines.append(ModelRenderer.render_steps(branch.steps, indent + "    "))
+        lines.append(f"{indent}end\n")
+        return "".join(lines)
+
+    @staticmethod
+    def render_steps(
+        steps: List[Union[CallModel, BlockModel]], indent: str = "    "
+    ) -> str:
+        """Renders a list of messages and blocks.
+
+        Args:
+            steps (List[Union[CallModel, BlockModel]]): The steps to render.
+            indent (str): The indentation of the lines.
+
+        Returns:
+            str: The Mermaid source for the steps.
+        """
+        return "".join(
+            (
+                ModelRenderer.render_block(step, indent)
+                if isinstance(step, BlockModel)
+                else ModelRenderer.render_call(step, indent)
+            )
+            for step in steps
+        )
+
+    @staticmethod
+    def render_sequence_diagram(steps: List[Union[CallModel, BlockModel]]) -> str:
+        """Renders a complete sequence diagram.
+
+        Args:
+            steps (List[Union[CallModel, BlockModel]]): The ordered messages and blocks to include.
+
+        Returns:
+            str: The Mermaid sequence diagram.
+        """
+        return "sequenceDiagram\n" + ModelRenderer.render_steps(steps)
+
+    @staticmethod
+    def render_flowchart(edges: Iterable[Tuple[str, ...]]) -> str:
+        """Renders directed edges between named nodes as a flowchart.
+
+        Args:
+            edges (Iterable[Tuple[str, ...]]): The source and target name of each edge,
+                optionally followed by the link to draw instead of "-->".
+
+        Returns:
+            str: The Mermaid flowchart.
+        """
+        node_ids = {}
+        lines = ["flowchart LR\n"]
+
+        def node(name: str) -> str:
+            if name not in node_ids:
+                node_ids[name] = f"n{len(node_ids)}"
+                label = name.replace('"', "#quot;")
+                lines.append(f'    {node_ids[name]}["{label}"]\n')
+            return node_ids[name]
+
+        edge_lines = [
+            f"    {node(source)} {link[0] if link else '-->'} {node(target)}\n"
+            for source, target, *link in edges
+        ]
+        return "".join(lines + edge_lines)
+
+    @staticmethod
+    def render_call_graph(calls: Iterable[CallModel]) -> str:
+        """Renders call edges as a flowchart, with one node per distinct function.
+
+        Args:
+            calls (Iterable[CallModel]): The call edges to include.
+
+        Returns:
+            str: The Mermaid flowchart.
+        """
+        return ModelRenderer.render_flowchart(
+            (call.caller, call.callee) for call in calls
+        )
+
+    @staticmethod
+    def render_import_graph(model: FileModel) -> str:
+        """Renders the imports of a file as a flowchart from its module to each imported name.
+
+        Args:
+            model (FileModel): The model of the file.
+
+        Returns:
+            str: The Mermaid flowchart.
+        """
+        module = os.path.splitext(model.path)[0].replace(os.sep, ".").replace("/", ".")
+        targets = dict.fromkeys(model.imports.values())
+        return ModelRenderer.render_flowchart((module, target) for target in targets)
+
+    @staticmethod
+    def render_class_diff(diff: ModelDiff) -> str:
+        """Renders the changed classes as a class diagram that highlights the changes.
+
+        Classes are styled by their status. Member changes are listed in a
+        note next to the class, and added or removed inheritance relations are
+        labelled. Classes whose name occurs in several changed files are
+        qualified with their module, e.g. "pkg.config.Config".
+
+        Args:
+            diff (ModelDiff): The differences to render.
+
+        Returns:
+            str: The Mermaid class diagram.
+        """
+        lines = ["classDiagram\n"]
+        lines.extend(
+            f"classDef {status} {style}\n" for status, style in DIFF_STYLES.items()
+        )
+
+        name_counts = Counter(change.name for change in diff.classes)
+        statuses = {status: [] for status in DIFF_STYLES}
+        for change in diff.classes:
+            class_name = change.name
+            if name_counts[class_name] > 1 and change.path:
+                module = os.path.splitext(change.path)[0]
+                module = module.replace(os.sep, ".").replace("/", ".")
+                class_name = f"{module}.{class_name}"
+            statuses[change.status].append(class_name)
+            class_model = change.class_model
+            name = ModelRenderer.render_class_name(class_name)
+            lines.append(f"class {name} {{\n")
+            lines.extend(
+                ModelRenderer.render_member(member) for member in class_model.members
+            )
+            lines.append("}\n")
+
+            notes = [
+                f"{label}: {ModelRenderer.render_member(member).strip()}"
+                for label, members in (
+                    (ADDED, change.added_members),
+                    (REMOVED, change.removed_members),
+                    (CHANGED, change.changed_members),
+                )
+                for member in members
+            ]
+            if notes:
+                text = "\\n".join(notes).replace('"', "#quot;")
+                lines.append(f'note for {name} "{text}"\n')
+
+            for base in class_model.bases:
+                label = " : added" if base in change.added_bases else ""
+                lines.append(f"{base} <|-- {name}{label}\n")
+            lines.extend(
+                f"{base} <|.. {name} : removed\n" for base in change.removed_bases
+            )
+
+        lines.extend(
+            f'cssClass "{",".join(names)}" {status}\n'
+            for status, names in statuses.items()
+            if names
+        )
+        return "".join(lines)
+
+    @staticmethod
+    def render_call_diff(diff: ModelDiff) -> str:
+        """Renders the added and removed call edges as a flowchart.
+
+        Added edges are drawn as solid green links, removed edges as dashed red links.
+
+        Args:
+            diff (ModelDiff): The differences to render.
+
+        Returns:
+            str: The Mermaid flowchart.
+        """
+        edges = [
+            (call.caller, call.callee, "-->|added|") for call in diff.added_calls
+        ] + [(call.caller, call.callee, "-.->|removed|") for call in diff.removed_calls]
+        flowchart = ModelRenderer.render_flowchart(edges)
+
+        added = range(len(diff.added_calls))
+        removed = range(len(added), len(edges))
+        for indexes, color in ((added, "#1a7f37"), (removed, "#cf222e")):
+            if indexes:
+                flowchart += (
+                    f"    linkStyle {','.join(map(str, indexes))} stroke:{color}\n"
+                )
+        return flowchart
@@ -0,0 +1,119 @@
+import gzip
+import json
+import logging
+from typing import IO, Iterable, Iterator, List
+
+from src.model.model import FileModel
+
+MODEL_FORMAT = "mermaidit-model"
+MODEL_VERSION = 2
+SUPPORTED_MODEL_VERSIONS = (1, 2)
+
+
+def _open_model_file(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ModelWriter:
+    """
+    Streams `FileModel` records to a JSON-lines model file.
+
+    The first line is a header identifying the format; every following line is
+    one compact JSON object per source file. Paths ending in ".gz" are
+    gzip-compressed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens the model file for writing and writes the header.
+
+        Args:
+            path (str): The path of the model file to create.
+        """
+        self.path = path
+        self.file = _open_model_file(path, "w")
+        self.file.write(
+            json.dumps({"format": MODEL_FORMAT, "version": MODEL_VERSION}) + "\n"
+        )
+
+    def write(self, model: FileModel):
+        """Appends a single file model.
+
+        Args:
+            model (FileModel): The model to write.
+        """
+        self.file.write(
+            json.dumps(model.to_dict(), separators=(",", ":"), ensure_ascii=False)
+            + "\n"
+        )
+
+    def write_all(self, models: Iterable[FileModel]):
+        """Appends every model from an iterable.
+
+        Args:
+            models (Iterable[FileModel]): The models to write.
+        """
+        for model in models:
+            self.write(model)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "ModelWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ModelReader:
+    """
+    Streams `FileModel` records back from a model file written by `ModelWriter`.
+
+    Only one record is decoded at a time, and names are interned so that
+    repeated identifiers share storage.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[FileModel]:
+        with _open_model_file(self.path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != MODEL_FORMAT:
+                raise ValueError(f"{self.path} is not a mermaidit model file.")
+            if header.get("version") not in SUPPORTED_MODEL_VERSIONS:
+                raise ValueError(
+                    f"Unsupported model version {header.get('version')} in {self.path}."
+                )
+            for line in f:
+                if line.strip():
+                    yield FileModel.from_dict(json.loads(line))
+
+    @staticmethod
+    def merge(paths: List[str]) -> Iterator[FileModel]:
+        """Streams the models of several model files, such as the partial models
+        written by sharded runs, as one project-wide model.
+
+        Files are read in the given order. If a source path occurs in more than
+        one file, only its first model is kept.
+
+        Args:
+            paths (List[str]): The model files to merge.
+
+        Yields:
+            FileModel: The merged models.
+        """
+        logger = logging.getLogger(__name__)
+        seen = set()
+        for path in paths:
+            for model in ModelReader(path):
+                if model.path in seen:
+                    logger.warning(
+                        f"Skipping duplicate model for {model.path} in {path}"
+                    )
+                    continue
+                seen.add(model.path)
+                yield model
@@ -0,0 +1,281 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from src.model.model import FileModel
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process.
+    fcntl = None
+
+DEFAULT_CACHE_LIMIT = 256 * 1024 * 1024
+CACHE_FILE_NAME = "models.bin"
+LOCK_FILE_NAME = "models.lock"
+
+FILE_MAGIC = b"mermaidit-cache1"
+# Record layout: magic, key length, payload length, CRC-32 of key and payload.
+RECORD_HEADER = struct.Struct("<2sHII")
+RECORD_MAGIC = b"MR"
+
+
+class SharedModelCache:
+    """
+    An on-disk cache of extracted file models that several processes on one
+    host can share.
+
+    Models are stored as zlib-compressed records in a single append-only file,
+    keyed by a hash of the file content and the extraction options. Readers
+    memory-map the file and never take a lock; they only trust records whose
+    CRC matches, so a record that is still being written is simply not seen
+    yet. Writers serialize their appends with an advisory lock on a separate
+    lock file.
+
+    When the file grows past `max_bytes`, the most recently written records are
+    copied to a new file that atomically replaces the old one. Hits on records
+    written more than `max_bytes / 4` before the end of the file re-append them,
+    so entries that are still in use survive compaction. Readers notice the replacement by its inode and
+    map the new file, while existing mappings of the old file stay valid.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_LIMIT):
+        """
+        Opens the cache in `cache_dir`, creating the directory if necessary.
+
+        Args:
+            cache_dir (str): The directory holding the cache and lock files.
+            max_bytes (int): The size of the cache file that triggers compaction.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.lock_path = os.path.join(cache_dir, LOCK_FILE_NAME)
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        # Serializes the threads of this process; other processes never wait on it.
+        self.lock = threading.Lock()
+        self.mmap: Optional[mmap.mmap] = None
+        self.identity: Optional[Tuple[int, int]] = None
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self.scanned = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[FileModel]:
+        """Looks up a model without blocking on other processes.
+
+        Args:
+            key (str): The cache key of the model.
+
+        Returns:
+            FileModel: The cached model, or None if the key is not cached.
+        """
+        with self.lock:
+            self.refresh()
+            location = self.offsets.get(key)
+            if location is None:
+                self.misses += 1
+                return None
+            offset, end = location
+            payload = self.mmap[offset:end]
+            self.hits += 1
+            promote = offset < len(self.mmap) - self.max_bytes // 4
+
+        if promote:
+            self.append(key, payload)
+        return FileModel.from_dict(json.loads(zlib.decompress(payload)))
+
+    def put(self, key: str, model: FileModel):
+        """Stores a model, compacting the cache file if it grew past its limit.
+
+        Args:
+            key (str): The cache key of the model.
+            model (FileModel): The model to store.
+        """
+        payload = zlib.compress(
+            json.dumps(
+                model.to_dict(), separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+        )
+        self.append(key, payload)
+
+    def append(self, key: str, payload: bytes):
+        """Appends a record under the writer lock.
+
+        Args:
+            key (str): The cache key of the record.
+            payload (bytes): The compressed model.
+        """
+        key_bytes = key.encode("utf-8")
+        record = (
+            RECORD_HEADER.pack(
+                RECORD_MAGIC,
+                len(key_bytes),
+                len(payload),
+                zlib.crc32(key_bytes + payload),
+            )
+            + key_bytes
+            + payload
+        )
+
+        with self.lock, self.write_lock():
+            self.refresh()
+            if self.mmap is not None and self.scanned < len(self.mmap):
+                # No other writer is active, so the unreadable tail was left
+                # by one that crashed. Appending after it would hide the record.
+                self.compact()
+
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size == 0:
+                    record = FILE_MAGIC + record
+                os.write(fd, record)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+            if size > self.max_bytes:
+                self.refresh()
+                self.compact()
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """Holds the exclusive lock shared by all writers on this host."""
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Maps the current cache file and indexes the records appended since the last call."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+
+        # The open file is checked rather than the path, which a compaction
+        # may replace at any moment.
+        with f:
+            stat = os.fstat(f.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self.identity:
+                self.unmap()
+                self.identity = identity
+            elif self.mmap is not None and stat.st_size <= len(self.mmap):
+                return
+            if stat.st_size < len(FILE_MAGIC):
+                return
+            new_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.mmap is not None:
+            self.mmap.close()
+        self.mmap = new_map
+
+        if self.scanned == 0:
+            if self.mmap[: len(FILE_MAGIC)] != FILE_MAGIC:
+                self.logger.warning(f"Ignoring unknown cache file {self.path}")
+                return
+            self.scanned = len(FILE_MAGIC)
+        self.scan()
+
+    def scan(self):
+        """Indexes the complete records after the last scanned one."""
+        position = self.scanned
+        for key, _, offset, end in self.iter_records(self.mmap, position):
+            self.offsets[key] = (offset, end)
+            position = end
+        self.scanned = position
+
+    @staticmethod
+    def iter_records(data, position: int) -> Iterator[Tuple[str, int, int, int]]:
+        """Yields the valid records of a cache file, stopping at the first torn one.
+
+        Args:
+            data (mmap.mmap): The cache file content.
+            position (int): The offset of the first record.
+
+        Yields:
+            tuple: The key, start offset, payload offset and end offset of a record.
+        """
+        while position + RECORD_HEADER.size <= len(data):
+            magic, key_length, length, crc = RECORD_HEADER.unpack_from(data, position)
+            start = position + RECORD_HEADER.size
+            end = start + key_length + length
+            if magic != RECORD_MAGIC or end > len(data):
+                return
+            if zlib.crc32(data[start:end]) != crc:
+                return
+            key = data[start : start + key_length].decode("utf-8")
+            yield key, position, start + key_length, end
+            position = end
+
+    def compact(self):
+        """Replaces the cache file with its most recently written records.
+
+        Must be called with the writer lock held, after `refresh`. Records are
+        kept newest first until half of `max_bytes` is used.
+        """
+        records = {}
+        if self.mmap is not None and self.scanned:
+            for key, start, _, end in self.iter_records(self.mmap, len(FILE_MAGIC)):
+                records.pop(key, None)
+                records[key] = self.mmap[start:end]
+
+        kept = []
+        size = len(FILE_MAGIC)
+        for record in reversed(list(records.values())):
+            if size + len(record) > self.max_bytes // 2:
+                break
+            kept.append(record)
+            size += len(record)
+
+        fd, temp_path = tempfile.mkstemp(
+            prefix="models-", suffix=".tmp", dir=os.path.dirname(self.path)
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(FILE_MAGIC)
+                for record in reversed(kept):
+                    f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        self.logger.debug(
+            f"Compacted {self.path}: kept {len(kept)} of {len(records)} models"
+        )
+        self.refresh()
+
+    def unmap(self):
+        """Releases the current mapping and forgets its records."""
+        if self.mmap is not None:
+            self.mmap.close()
+        self.mmap = None
+        self.identity = None
+        self.offsets = {}
+        self.scanned = 0
+
+    def close(self):
+        with self.lock:
+            self.unmap()
+
+    def __enter__(self) -> "SharedModelCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,2 @@
+from src.server.diagram_server import DiagramServer
+from src.server.model_cache import ModelCache
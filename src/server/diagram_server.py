@@ -0,0 +1,223 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.file_operations.file_operations import FileOperations
+from src.model.model_renderer import ModelRenderer
+from src.model.shared_model_cache import SharedModelCache
+from src.server.model_cache import DEFAULT_CACHE_SIZE, ModelCache
+
+DEFAULT_WORKERS = 8
+
+
+class DiagramRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves Mermaid diagrams for the files below the server's source root.
+
+    Endpoints:
+        GET /class?path=<file> or /class?qualname=<module.Class>: A class diagram.
+        GET /sequence?path=<file>: The sequence diagram of a `main.py` file.
+        GET /imports?path=<file>: The imports of a file as a flowchart.
+
+    Diagrams are returned as Mermaid source, or wrapped in a Markdown code
+    block with `format=markdown`.
+    """
+
+    server: "DiagramServer"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.rstrip("/")
+
+        try:
+            if endpoint == "/class" and "qualname" in params:
+                diagram = self.render_qualname(params["qualname"])
+            elif endpoint in ("/class", "/sequence", "/imports"):
+                if "path" not in params:
+                    raise DiagramError(
+                        HTTPStatus.BAD_REQUEST, "Missing 'path' parameter."
+                    )
+                diagram = self.render_file(endpoint, params["path"])
+            else:
+                raise DiagramError(
+                    HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}."
+                )
+        except DiagramError as error:
+            self.send_text(error.status, error.message + "\n")
+            return
+        except SyntaxError as error:
+            self.send_text(
+                HTTPStatus.UNPROCESSABLE_ENTITY, f"Cannot parse source: {error}\n"
+            )
+            return
+        except UnicodeDecodeError as error:
+            self.send_text(
+                HTTPStatus.UNPROCESSABLE_ENTITY, f"Cannot decode source: {error}\n"
+            )
+            return
+        except Exception as error:
+            # Answers instead of dropping the connection without a response.
+            self.server.logger.exception(f"Failed to serve {self.path}")
+            self.send_text(
+                HTTPStatus.INTERNAL_SERVER_ERROR, f"Internal error: {error}\n"
+            )
+            return
+
+        if params.get("format") == "markdown":
+            diagram = FileOperations.wrap_mermaid_code(diagram)
+        self.send_text(HTTPStatus.OK, diagram)
+
+    def render_file(self, endpoint: str, path: str) -> str:
+        """Renders a diagram for a single source file.
+
+        Args:
+            endpoint (str): The requested endpoint.
+            path (str): The path of the file relative to the source root.
+
+        Raises:
+            DiagramError: If the file does not exist or has nothing to render.
+
+        Returns:
+            str: The Mermaid diagram.
+        """
+        model = self.server.get_model(path)
+
+        if endpoint == "/class":
+            if not model.classes:
+                raise DiagramError(HTTPStatus.NOT_FOUND, f"No classes found in {path}.")
+            return ModelRenderer.render_class_diagram(model.classes)
+        if endpoint == "/sequence":
+            if not model.sequence:
+                raise DiagramError(
+                    HTTPStatus.NOT_FOUND, f"No sequence diagram for {path}."
+                )
+            return ModelRenderer.render_sequence_diagram(model.sequence)
+        return ModelRenderer.render_import_graph(model)
+
+    def render_qualname(self, qualname: str) -> str:
+        """Renders the class diagram of a single class given by its qualified name.
+
+        Args:
+            qualname (str): The qualified name, e.g. "pkg.module.ClassName".
+
+        Raises:
+            DiagramError: If the module or class does not exist.
+
+        Returns:
+            str: The Mermaid diagram.
+        """
+        module, _, class_name = qualname.rpartition(".")
+        module_path = module.replace(".", "/")
+        for path in (f"{module_path}.py", f"{module_path}/__init__.py"):
+            try:
+                model = self.server.get_model(path)
+            except DiagramError:
+                continue
+            classes = [c for c in model.classes if c.name == class_name]
+            if classes:
+                return ModelRenderer.render_class_diagram(classes)
+        raise DiagramError(HTTPStatus.NOT_FOUND, f"Class {qualname} not found.")
+
+    def send_text(self, status: HTTPStatus, text: str):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        self.server.logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class DiagramError(Exception):
+    """An error with the HTTP status to answer the request with."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class DiagramServer(HTTPServer):
+    """
+    An HTTP server that renders diagrams from cached models and handles
+    requests on a fixed-size pool of worker threads.
+    """
+
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        server_address: tuple,
+        local_path: str,
+        workers: int = DEFAULT_WORKERS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        shared_cache: SharedModelCache = None,
+    ):
+        """
+        Binds the server and prepares the model cache.
+
+        Args:
+            server_address (tuple): The host and port to listen on.
+            local_path (str): The source root to serve diagrams for.
+            workers (int): The number of worker threads handling requests.
+            cache_size (int): The approximate maximum size of the cached models in bytes.
+            shared_cache (SharedModelCache, optional): An on-disk cache shared with other
+                processes, consulted before a file is parsed.
+        """
+        super().__init__(server_address, DiagramRequestHandler)
+        self.local_path = os.path.realpath(local_path)
+        self.model_cache = ModelCache(
+            CodeAnalyzer(self.local_path, model_cache=shared_cache), cache_size
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="mermaidit-worker"
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def get_model(self, path: str):
+        """Returns the cached model of a file below the source root.
+
+        Args:
+            path (str): The path of the file relative to the source root.
+
+        Raises:
+            DiagramError: If the path leaves the source root or is not a supported source file.
+
+        Returns:
+            FileModel: The model of the file.
+        """
+        file_path = os.path.realpath(os.path.join(self.local_path, path))
+        if os.path.commonpath([self.local_path, file_path]) != self.local_path:
+            raise DiagramError(
+                HTTPStatus.FORBIDDEN, f"{path} is outside the source root."
+            )
+        if not os.path.isfile(file_path):
+            raise DiagramError(HTTPStatus.NOT_FOUND, f"{path} not found.")
+        if not self.model_cache.analyzer.frontends.supports(file_path):
+            raise DiagramError(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                f"{path} is not a supported source file.",
+            )
+        return self.model_cache.get(file_path)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
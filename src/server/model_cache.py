@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict
+
+from src.model.model import FileModel
+
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """A cached model together with the file state it was extracted from."""
+
+    mtime_ns: int
+    size: int
+    content_hash: str
+    model: FileModel
+    nbytes: int
+
+
+class ModelCache:
+    """
+    A thread-safe in-memory LRU cache of extracted file models.
+
+    Entries are validated against the file's modification time and size on
+    every lookup. If those changed, the content hash decides whether the file
+    really has to be parsed again. Concurrent misses on the same file are
+    extracted once: the first request loads the model while the others wait
+    for it. Least recently used entries are evicted once the estimated size
+    of the cached models exceeds `max_bytes`.
+    """
+
+    def __init__(self, analyzer, max_bytes: int = DEFAULT_CACHE_SIZE):
+        """
+        Initializes an empty cache.
+
+        Args:
+            analyzer (CodeAnalyzer): The analyzer used to extract models on a cache miss.
+            max_bytes (int): The approximate maximum size of the cached models.
+        """
+        self.analyzer = analyzer
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # Models being loaded, by path, for requests waiting on the same file.
+        self.loading: Dict[str, Future] = {}
+
+    def get(self, file_path: str) -> FileModel:
+        """Returns the model of a file, extracting it if the cached one is missing or stale.
+
+        Args:
+            file_path (str): The path to the source file.
+
+        Raises:
+            OSError: If the file cannot be read.
+            SyntaxError: If the file cannot be parsed.
+
+        Returns:
+            FileModel: The model of the file.
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(key)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and (entry.mtime_ns, entry.size) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry.model
+
+            # Requests waiting for another request's extraction count as hits.
+            future = self.loading.get(key)
+            loader = future is None
+            if loader:
+                future = self.loading[key] = Future()
+            else:
+                self.hits += 1
+        if not loader:
+            return future.result()
+
+        try:
+            model = self.load(key, stat, entry)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(model)
+            return model
+        finally:
+            with self.lock:
+                del self.loading[key]
+
+    def load(self, key: str, stat: os.stat_result, entry: CacheEntry) -> FileModel:
+        """Reads a file and stores its model, extracting it if its content changed.
+
+        Args:
+            key (str): The absolute path to the source file.
+            stat (os.stat_result): The state of the file.
+            entry (CacheEntry): The stale entry of the file, or None.
+
+        Returns:
+            FileModel: The model of the file.
+        """
+        with open(key, "rb") as f:
+            data = f.read()
+        content_hash = hashlib.sha1(data).hexdigest()
+
+        if entry and entry.content_hash == content_hash:
+            model = entry.model
+            with self.lock:
+                self.hits += 1
+        else:
+            model = self.analyzer.extract_model(key, data)
+            with self.lock:
+                self.misses += 1
+
+        nbytes = len(json.dumps(model.to_dict(), separators=(",", ":")))
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous.nbytes
+            self.entries[key] = CacheEntry(
+                stat.st_mtime_ns, stat.st_size, content_hash, model, nbytes
+            )
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+        return model
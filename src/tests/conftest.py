@@ -0,0 +1,70 @@
+import json
+import os
+import platform
+
+import pytest
+
+
+class PerfBaseline:
+    """
+    Timings of the perf tests on this machine, stored in a JSON file.
+
+    Timings are keyed by a fingerprint of the machine and interpreter, so a
+    baseline file shared between machines only compares like with like.
+    """
+
+    def __init__(self, path: str, threshold: float, update: bool):
+        self.path = path
+        self.threshold = threshold
+        self.update = update
+        self.machine = " ".join(
+            (platform.node(), platform.machine(), platform.python_version())
+        )
+        self.data = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+        self.changed = False
+
+    def check(self, name: str, seconds: float):
+        """Records a timing and fails if it regressed beyond the threshold.
+
+        A timing is only recorded if there is none for this machine yet, or if
+        the baseline is being updated. Faster runs do not replace it, so the
+        baseline does not drift down to the fastest outlier.
+
+        Args:
+            name (str): The name of the timing.
+            seconds (float): The measured time.
+        """
+        timings = self.data.setdefault(self.machine, {})
+        baseline = timings.get(name)
+        if baseline is None or self.update:
+            timings[name] = seconds
+            self.changed = True
+        if baseline is not None and not self.update:
+            if seconds > baseline * self.threshold:
+                pytest.fail(
+                    f"{name} took {seconds:.4f}s, {seconds / baseline:.2f}x the "
+                    f"baseline of {baseline:.4f}s (threshold {self.threshold}x). "
+                    f"Run with --perf-update-baseline if the slowdown is expected."
+                )
+
+    def save(self):
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+@pytest.fixture(scope="session")
+def perf_baseline(request):
+    baseline = PerfBaseline(
+        request.config.getoption("--perf-baseline"),
+        request.config.getoption("--perf-threshold"),
+        request.config.getoption("--perf-update-baseline"),
+    )
+    yield baseline
+    baseline.save()
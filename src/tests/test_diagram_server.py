@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.server.diagram_server import DiagramServer
+from src.server.model_cache import ModelCache
+
+
+@pytest.fixture
+def source_dir(tmpdir):
+    package = tmpdir.mkdir("source").mkdir("pkg")
+    package.join("shapes.py").write(
+        "import math\n\nclass Shape:\n    pass\n\nclass Square(Shape):\n    side = 1\n"
+    )
+    package.join("main.py").write("def main():\n    if ready():\n        run()\n")
+    package.join("latin1.py").write_binary(b"name = '\xe9t\xe9'\nclass A:\n    pass\n")
+    return tmpdir.join("source")
+
+
+@pytest.fixture
+def server_url(source_dir):
+    server = DiagramServer(("127.0.0.1", 0), str(source_dir), workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    try:
+        with urlopen(url) as response:
+            return response.status, response.read().decode("utf-8")
+    except HTTPError as error:
+        return error.code, error.read().decode("utf-8")
+
+
+def test_class_diagram_by_path_and_qualname(server_url):
+    status, body = get(f"{server_url}/class?path=pkg/shapes.py")
+    assert status == 200
+    assert body.startswith("classDiagram\n")
+    assert "Shape <|-- Square" in body
+
+    status, body = get(f"{server_url}/class?qualname=pkg.shapes.Square&format=markdown")
+    assert status == 200
+    assert body.startswith("```mermaid\nclassDiagram\n")
+    assert "class Square" in body
+    assert "class Shape {" not in body
+
+
+def test_sequence_and_import_diagrams(server_url):
+    status, body = get(f"{server_url}/sequence?path=pkg/main.py")
+    assert status == 200
+    assert "opt ready()" in body
+
+    status, body = get(f"{server_url}/imports?path=pkg/shapes.py")
+    assert status == 200
+    assert '["pkg.shapes"]' in body and '["math"]' in body
+
+
+@pytest.mark.parametrize(
+    "path, expected_status",
+    [
+        ("/class", 400),
+        ("/class?path=missing.py", 404),
+        ("/class?path=../../etc/passwd", 403),
+        ("/class?qualname=pkg.shapes.Circle", 404),
+        ("/sequence?path=pkg/shapes.py", 404),
+        ("/unknown", 404),
+        ("/class?path=pkg/latin1.py", 422),
+    ],
+)
+def test_errors(server_url, path, expected_status):
+    assert get(server_url + path)[0] == expected_status
+
+
+def test_concurrent_requests(server_url):
+    results = []
+
+    def worker():
+        for _ in range(10):
+            results.append(get(f"{server_url}/class?path=pkg/shapes.py")[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [200] * 80
+
+
+def test_cache_is_invalidated_by_mtime_and_hash(source_dir):
+    cache = ModelCache(CodeAnalyzer(str(source_dir)))
+    path = str(source_dir.join("pkg", "shapes.py"))
+
+    assert [c.name for c in cache.get(path).classes] == ["Shape", "Square"]
+    cache.get(path)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.get(path)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    source_dir.join("pkg", "shapes.py").write("class Circle:\n    pass\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert [c.name for c in cache.get(path).classes] == ["Circle"]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_cache_evicts_least_recently_used(source_dir):
+    cache = ModelCache(CodeAnalyzer(str(source_dir)), max_bytes=1)
+    shapes = str(source_dir.join("pkg", "shapes.py"))
+    main = str(source_dir.join("pkg", "main.py"))
+
+    cache.get(shapes)
+    cache.get(main)
+
+    assert list(cache.entries) == [main]
+    assert cache.total_bytes == cache.entries[main].nbytes
+
+
+def test_concurrent_misses_extract_once(source_dir, monkeypatch):
+    analyzer = CodeAnalyzer(str(source_dir))
+    cache = ModelCache(analyzer)
+    path = str(source_dir.join("pkg", "shapes.py"))
+    extract_model = analyzer.extract_model
+    extracting = threading.Event()
+    release = threading.Event()
+    extractions = []
+
+    def slow_extract_model(file_path, data=None, complete=True):
+        extractions.append(file_path)
+        extracting.set()
+        release.wait(5)
+        return extract_model(file_path, data, complete)
+
+    monkeypatch.setattr(analyzer, "extract_model", slow_extract_model)
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(cache.get(path)))
+        for _ in range(8)
+    ]
+    threads[0].start()
+    extracting.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Waiting requests count as hits before they block on the loading request.
+    deadline = time.monotonic() + 5
+    while cache.hits < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(extractions) == 1
+    assert len(models) == 8 and all(model is models[0] for model in models)
+    assert (cache.hits, cache.misses) == (7, 1)
+    assert not cache.loading
+
+
+def test_unexpected_errors_are_answered(server_url, monkeypatch):
+    def fail(path):
+        raise ValueError("broken model")
+
+    monkeypatch.setattr(DiagramServer, "get_model", lambda self, path: fail(path))
+
+    assert get(f"{server_url}/class?path=pkg/shapes.py") == (
+        500,
+        "Internal error: broken model\n",
+    )
@@ -43,7 +43,9 @@ def test_load_settings_file_not_exist(tmpdir, monkeypatch):
 
 def test_ask_use_previous_src_dir_yes(monkeypatch):
     monkeypatch.setattr(
-        FileOperations, "load_settings", lambda: {"output_dir": "/dummy/path"}
+        FileOperations,
+        "load_settings",
+        lambda: {"output_dir": "/output", "src_dir": "/dummy/path"},
     )
     monkeypatch.setattr(UI, "ask_yes_no", lambda title, message: True)
 
@@ -54,7 +56,9 @@ def test_ask_use_previous_src_dir_yes(monkeypatch):
 
 def test_ask_use_previous_src_dir_no(monkeypatch):
     monkeypatch.setattr(
-        FileOperations, "load_settings", lambda: {"output_dir": "/dummy/path"}
+        FileOperations,
+        "load_settings",
+        lambda: {"output_dir": "/output", "src_dir": "/dummy/path"},
     )
     monkeypatch.setattr(UI, "ask_yes_no", lambda title, message: False)
 
@@ -69,3 +73,27 @@ def test_ask_use_previous_src_dir_no_settings(monkeypatch):
     use_prev, src_dir = FileOperations.ask_use_previous_src_dir()
     assert use_prev is False
     assert src_dir is None
+
+
+def test_ask_use_previous_src_dir_without_src_dir(monkeypatch):
+    monkeypatch.setattr(FileOperations, "load_settings", lambda: {"output_dir": "/out"})
+
+    use_prev, src_dir = FileOperations.ask_use_previous_src_dir()
+    assert use_prev is False
+    assert src_dir is None
+
+
+def test_save_settings_keeps_other_settings(tmpdir, monkeypatch):
+    monkeypatch.setattr(
+        "src.file_operations.file_operations.SETTINGS_FILE",
+        str(tmpdir.join("settings.txt")),
+    )
+
+    FileOperations.save_settings(src_dir="/source")
+    FileOperations.save_settings(1, "/output")
+
+    assert FileOperations.load_settings() == {
+        "selected_option": 1,
+        "output_dir": "/output",
+        "src_dir": "/source",
+    }
@@ -0,0 +1,237 @@
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.frontends import registry as registry_module
+from src.frontends.frontend import Frontend
+from src.frontends.go_frontend import GoFrontend
+from src.frontends.python_frontend import PythonFrontend
+from src.frontends.registry import FrontendRegistry
+from src.model.model import CallModel, ClassModel, FileModel, MemberModel
+
+GO_SOURCE = """package server
+
+import (
+	"fmt"
+	nethttp "net/http"
+	"github.com/pkg/errors"
+)
+
+// Handler serves { requests.
+type Handler interface {
+	ServeHTTP(w nethttp.ResponseWriter, r *nethttp.Request)
+	Name() string
+}
+
+type (
+	Base struct {
+		id int
+	}
+	Options struct {
+		Addr, Host string `json:"addr"`
+	}
+)
+
+type Server struct {
+	Base
+	sync.Mutex
+	handler Handler
+	opts    Options "tag {"
+}
+
+func (s *Server) Start(addr string, port int) error {
+	if s.handler == nil {
+		return errors.New("no handler {")
+	}
+	fmt.Println(len(addr))
+	return nil
+}
+
+func (s Server) Stats() (n int, err error) {
+	return 0, nil
+}
+
+func New(a, b int) *Server {
+	s := &Server{}
+	s.Start("x", a)
+	return s
+}
+"""
+
+
+class TextFrontend(Frontend):
+    name = "text"
+
+    def extract_model(self, data, relative_path, complete, with_sequence):
+        return FileModel(path=relative_path, classes=[ClassModel(data.decode())])
+
+
+def test_go_frontend_extracts_classes_imports_and_calls():
+    model = GoFrontend().extract_model(GO_SOURCE.encode(), "server.go", True, False)
+
+    assert model.classes == [
+        ClassModel(
+            "Handler",
+            members=[
+                MemberModel(
+                    "ServeHTTP",
+                    kind="method",
+                    params=["w: nethttp.ResponseWriter", "r: *nethttp.Request"],
+                ),
+                MemberModel("Name", kind="method", return_type="string"),
+            ],
+        ),
+        ClassModel("Base", members=[MemberModel("id")]),
+        ClassModel("Options", members=[MemberModel("Addr"), MemberModel("Host")]),
+        ClassModel(
+            "Server",
+            bases=["Base"],
+            members=[
+                MemberModel("handler"),
+                MemberModel("opts"),
+                MemberModel(
+                    "Start",
+                    kind="method",
+                    params=["addr: string", "port: int"],
+                    return_type="error",
+                ),
+                MemberModel("Stats", kind="method", return_type="int, error"),
+            ],
+        ),
+    ]
+    assert model.imports == {
+        "fmt": "fmt",
+        "nethttp": "net/http",
+        "errors": "github.com/pkg/errors",
+    }
+    assert model.calls == [
+        CallModel("Server.Start", "github.com/pkg/errors.New"),
+        CallModel("Server.Start", "fmt.Println"),
+        CallModel("New", "s.Start"),
+    ]
+
+
+def test_go_frontend_prefilter(tmpdir):
+    types_file = tmpdir.join("types.go")
+    types_file.write("package a\n\ntype A struct{}\n")
+    methods_file = tmpdir.join("methods.go")
+    methods_file.write("package a\n\nfunc (a *A) Run() {}\n")
+    functions_file = tmpdir.join("functions.go")
+    functions_file.write("package a\n\nfunc run() {}\n")
+
+    frontend = GoFrontend()
+    assert frontend.has_class_definition(str(types_file))
+    assert frontend.has_class_definition(str(methods_file))
+    assert not frontend.has_class_definition(str(functions_file))
+
+
+def test_registry_imports_frontends_lazily(tmpdir, monkeypatch):
+    tmpdir.join("lazy_frontend.py").write(
+        "from src.tests.test_frontends import TextFrontend as LazyFrontend\n"
+    )
+    monkeypatch.syspath_prepend(str(tmpdir))
+    registry = FrontendRegistry({".txt": "lazy_frontend:LazyFrontend"})
+
+    assert registry.supports("notes.txt")
+    assert "lazy_frontend" not in sys.modules
+
+    assert isinstance(registry.get("notes.TXT"), TextFrontend)
+    assert "lazy_frontend" in sys.modules
+    assert registry.get("notes.txt") is registry.get("other.txt")
+    monkeypatch.delitem(sys.modules, "lazy_frontend")
+
+
+def test_registry_loads_entry_points_for_unknown_extensions(monkeypatch):
+    calls = []
+
+    def fake_entry_points(group):
+        calls.append(group)
+        return [
+            EntryPoint("txt", "src.tests.test_frontends:TextFrontend", group),
+            EntryPoint("py", "src.tests.test_frontends:TextFrontend", group),
+        ]
+
+    monkeypatch.setattr(registry_module, "entry_points", fake_entry_points)
+    registry = FrontendRegistry()
+
+    assert isinstance(registry.get("main.py"), PythonFrontend)
+    assert calls == []
+
+    assert isinstance(registry.get("notes.txt"), TextFrontend)
+    assert registry.get("README") is None
+    assert registry.get("image.png") is None
+    assert calls == ["mermaidit.frontends"]
+    assert isinstance(registry.get("main.py"), PythonFrontend)
+
+
+def test_registry_rejects_non_frontends():
+    registry = FrontendRegistry({".txt": "src.model.model:FileModel"})
+
+    with pytest.raises(TypeError):
+        registry.get("notes.txt")
+
+
+@pytest.fixture
+def mixed_source(tmpdir):
+    source = tmpdir.mkdir("source")
+    source.join("shapes.py").write("class Shape:\n    pass\n")
+    source.join("server.go").write(GO_SOURCE)
+    source.join("README.md").write("# Shapes\n")
+    for index in range(12):
+        source.join(f"module_{index}.py").write(f"class Widget{index}:\n    x = 1\n")
+    return source
+
+
+def test_analyzer_dispatches_files_to_frontends(mixed_source, tmpdir):
+    output_dir = tmpdir.mkdir("output")
+    CodeAnalyzer(str(mixed_source), str(output_dir)).analyze()
+
+    assert output_dir.join("shapes_class.md").check()
+    assert "Base <|-- Server" in output_dir.join("server_class.md").read()
+    assert not output_dir.join("README_class.md").check()
+
+
+def test_parallel_extraction_matches_sequential(mixed_source):
+    sequential = list(CodeAnalyzer(str(mixed_source)).iter_models())
+    parallel = list(CodeAnalyzer(str(mixed_source), jobs=3).iter_models())
+
+    assert [model.path for model in parallel] == [model.path for model in sequential]
+    assert parallel == sequential
+
+
+def test_lazy_registry_configures_frontends(tmpdir):
+    source = tmpdir.mkdir("source")
+    source.join("shapes.py").write(
+        "class Shape:\n"
+        "    class Meta:\n"
+        "        pass\n\n"
+        "    def area(self):\n"
+        "        class Cached:\n"
+        "            pass\n"
+    )
+
+    def class_names(frontends):
+        (model,) = CodeAnalyzer(str(source), frontends=frontends).iter_models()
+        return [class_model.name for class_model in model.classes]
+
+    assert sorted(class_names(FrontendRegistry())) == ["Cached", "Meta", "Shape"]
+    assert class_names(FrontendRegistry(lazy=True)) == ["Shape"]
+    assert class_names(FrontendRegistry(lazy=True, nested_classes=True)) == [
+        "Shape",
+        "Shape.Meta",
+    ]
+    assert FrontendRegistry(lazy=True).get("server.go").lazy
+
+
+def test_lazy_models_are_cached_separately():
+    keys = {
+        CodeAnalyzer.get_cache_key("python", "abc", True, False),
+        CodeAnalyzer.get_cache_key("python", "abc", True, False, lazy=True),
+        CodeAnalyzer.get_cache_key(
+            "python", "abc", True, False, lazy=True, nested_classes=True
+        ),
+    }
+
+    assert len(keys) == 3
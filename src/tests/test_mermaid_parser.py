@@ -66,24 +66,33 @@ def test_class_with_properties():
     assert "+prop2" in diagram
 
 
-def test_extract_base_class():
+def test_extract_base_classes():
     parser = MermaidParser()
     code = """
-class Derived(Base):
+class Derived(abc.ABC, Base, Mixin):
     pass
 """
     node = ast.parse(code).body[0]
-    assert parser.extract_base_class(node) == "Base"
+    assert parser.extract_base_classes(node) == ["Base", "Mixin"]
 
 
-def test_extract_base_class_no_base():
+def test_extract_base_classes_no_base():
     parser = MermaidParser()
     code = """
 class Simple:
     pass
 """
     node = ast.parse(code).body[0]
-    assert parser.extract_base_class(node) is None
+    assert parser.extract_base_classes(node) == []
+
+
+def test_class_with_several_bases():
+    content = "class Derived(Base, Mixin):\n    pass\n"
+    parser = MermaidParser()
+    parser.parse_classes(content)
+    diagram = parser.get_diagram()
+    assert "Base <|-- Derived" in diagram
+    assert "Mixin <|-- Derived" in diagram
 
 
 def test_process_class_methods():
@@ -129,3 +138,78 @@ class MyClass:
     parser.process_class_methods(node)
     expected = "    +my_method(arg1: int, arg2: ast.FunctionDef) : str\n"
     assert expected in parser.class_diagram
+
+
+NESTED_SOURCE = """
+import typing
+
+if typing.TYPE_CHECKING:
+    class Protocol:
+        pass
+
+try:
+    class Fast:
+        pass
+except ImportError:
+    class Slow:
+        pass
+
+
+class Outer(Base):
+    class Inner:
+        value = 1
+
+        class Deepest:
+            pass
+
+    def build(self):
+        class Local:
+            pass
+        return Local()
+
+
+def factory():
+    class Made:
+        pass
+"""
+
+
+def test_eager_mode_extracts_every_class():
+    parser = MermaidParser()
+    parser.parse_classes(NESTED_SOURCE)
+
+    assert sorted(class_model.name for class_model in parser.classes) == [
+        "Deepest",
+        "Fast",
+        "Inner",
+        "Local",
+        "Made",
+        "Outer",
+        "Protocol",
+        "Slow",
+    ]
+
+
+def test_lazy_mode_skips_function_bodies_and_nested_classes():
+    parser = MermaidParser(lazy=True)
+    parser.parse_classes(NESTED_SOURCE)
+
+    assert [class_model.name for class_model in parser.classes] == [
+        "Protocol",
+        "Fast",
+        "Slow",
+        "Outer",
+    ]
+    assert [member.name for member in parser.classes[3].members] == ["build"]
+
+
+def test_lazy_mode_names_nested_classes_by_qualname():
+    parser = MermaidParser(lazy=True, nested_classes=True)
+    parser.parse_classes(NESTED_SOURCE)
+
+    assert [class_model.name for class_model in parser.classes][3:] == [
+        "Outer",
+        "Outer.Inner",
+        "Outer.Inner.Deepest",
+    ]
+    assert "class `Outer.Inner` {\n    +value\n}\n" in parser.get_diagram()
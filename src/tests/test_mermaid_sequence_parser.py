@@ -0,0 +1,186 @@
+import ast
+
+from src.mermaid_parser.mermaid_sequence_parser import MermaidSequenceParser
+from src.model.model import BlockModel, BranchModel, CallModel
+from src.model.model_renderer import ModelRenderer
+
+
+def parse_main(content):
+    parser = MermaidSequenceParser()
+    tree = ast.parse(content)
+    parser.parse_main_tree(tree, parser.collect_imports(tree), content)
+    return parser
+
+
+def test_calls_are_in_evaluation_order_with_source_arguments():
+    parser = parse_main(
+        "import os\n\n"
+        "def main():\n"
+        "    path = os.path.join(os.getcwd(), 'data', exist_ok=True)\n"
+    )
+
+    assert parser.sequence == [
+        CallModel(caller="main", callee="os.getcwd"),
+        CallModel(
+            caller="main",
+            callee="os.path.join",
+            args=["os.getcwd()", "'data'", "exist_ok=True"],
+        ),
+    ]
+
+
+def test_long_arguments_are_truncated():
+    parser = parse_main("def main():\n    log('" + "x" * 100 + "')\n")
+
+    (call,) = parser.sequence
+    assert len(call.args[0]) == 40
+    assert call.args[0].endswith("...")
+
+
+def test_if_elif_else_becomes_alt_block():
+    parser = parse_main(
+        "def main():\n"
+        "    if check():\n"
+        "        first()\n"
+        "    elif other:\n"
+        "        second()\n"
+        "    else:\n"
+        "        third()\n"
+    )
+
+    assert parser.sequence == [
+        CallModel(caller="main", callee="check"),
+        BlockModel(
+            "alt",
+            [
+                BranchModel("check()", [CallModel(caller="main", callee="first")]),
+                BranchModel("other", [CallModel(caller="main", callee="second")]),
+                BranchModel("otherwise", [CallModel(caller="main", callee="third")]),
+            ],
+        ),
+    ]
+
+
+def test_nested_calls_are_emitted_once():
+    parser = parse_main(
+        "def main():\n"
+        "    for item in items:\n"
+        "        if item:\n"
+        "            while pending():\n"
+        "                handle(item)\n"
+    )
+
+    diagram = parser.get_sequence_diagram()
+    assert diagram.count("->>+ handle:") == 1
+    assert diagram.count("->>+ pending:") == 1
+    assert "loop for item in items" in diagram
+    assert "opt item" in diagram
+    assert "loop while pending()" in diagram
+    assert diagram.count("end\n") == 3
+
+
+def test_repeated_calls_are_collapsed():
+    parser = parse_main(
+        "def main():\n" "    tick()\n" "    tick()\n" "    tick()\n" "    tock()\n"
+    )
+
+    assert parser.sequence == [
+        CallModel(caller="main", callee="tick", count=3),
+        CallModel(caller="main", callee="tock"),
+    ]
+    assert "main ->>+ tick: tick() x3\n" in parser.get_sequence_diagram()
+
+
+def test_activations_are_closed():
+    diagram = parse_main(
+        "def main():\n    if a:\n        first()\n    second()\n"
+    ).get_sequence_diagram()
+
+    assert diagram.count("->>+") == diagram.count("deactivate") == 2
+
+
+def test_blocks_without_calls_and_nested_definitions_are_skipped():
+    parser = parse_main(
+        "def main():\n"
+        "    if debug:\n"
+        "        verbose = True\n"
+        "    def helper():\n"
+        "        hidden()\n"
+        "    callback = lambda: hidden()\n"
+        "    run(callback)\n"
+    )
+
+    assert parser.sequence == [
+        CallModel(caller="main", callee="run", args=["callback"])
+    ]
+
+
+def test_try_becomes_alt_only_when_handlers_make_calls():
+    parser = parse_main(
+        "def main():\n"
+        "    try:\n"
+        "        load()\n"
+        "    except ValueError:\n"
+        "        pass\n"
+        "    try:\n"
+        "        save()\n"
+        "    except OSError as error:\n"
+        "        report(error)\n"
+        "    finally:\n"
+        "        close()\n"
+    )
+
+    assert parser.sequence == [
+        CallModel(caller="main", callee="load"),
+        BlockModel(
+            "alt",
+            [
+                BranchModel("try", [CallModel(caller="main", callee="save")]),
+                BranchModel(
+                    "except OSError",
+                    [CallModel(caller="main", callee="report", args=["error"])],
+                ),
+            ],
+        ),
+        CallModel(caller="main", callee="close"),
+    ]
+
+
+def test_labels_are_escaped():
+    call = CallModel(caller="main", callee="run", args=["'a; b'", "'#1'"])
+
+    assert ModelRenderer.render_call(call) == (
+        "    main ->>+ run: run('a#59; b', '#35;1')\n    deactivate run\n"
+    )
+
+
+def test_unknown_callees_are_valid_participants():
+    parser = parse_main("def main():\n    handlers[key](x)\n")
+
+    assert parser.sequence == [CallModel(caller="main", callee="<unknown>", args=["x"])]
+    assert parser.get_sequence_diagram().endswith(
+        "    main ->>+ unknown: unknown(x)\n    deactivate unknown\n"
+    )
+
+
+def test_call_edges_are_in_source_order():
+    content = (
+        "import os\n\n"
+        "def main():\n"
+        "    config = load(os.path.join(root(), 'config'))\n"
+        "    if config:\n"
+        "        for item in config:\n"
+        "            process(item)\n"
+        "    finish()\n"
+    )
+    parser = MermaidSequenceParser()
+    tree = ast.parse(content)
+
+    edges = parser.extract_call_edges(tree, parser.collect_imports(tree))
+    assert [edge.callee for edge in edges] == [
+        "load",
+        "os.path.join",
+        "root",
+        "process",
+        "finish",
+    ]
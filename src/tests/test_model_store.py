@@ -0,0 +1,102 @@
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.mermaid_parser.mermaid_parser import MermaidParser
+from src.model.model import (
+    BlockModel,
+    BranchModel,
+    CallModel,
+    ClassModel,
+    FileModel,
+    MemberModel,
+)
+from src.model.model_renderer import ModelRenderer
+from src.model.model_store import ModelReader, ModelWriter
+
+
+def make_model():
+    return FileModel(
+        path="pkg/shapes.py",
+        content_hash="abc",
+        classes=[
+            ClassModel(
+                name="Square",
+                bases=["Shape"],
+                members=[
+                    MemberModel(name="side"),
+                    MemberModel(
+                        name="area", kind="method", params=[], return_type="float"
+                    ),
+                ],
+            )
+        ],
+        imports={"math": "math"},
+        calls=[CallModel(caller="Square.area", callee="math.pow")],
+        sequence=[
+            CallModel(caller="main", callee="setup", count=2),
+            BlockModel(
+                "alt",
+                [
+                    BranchModel("ready", [CallModel(caller="main", callee="run")]),
+                    BranchModel("otherwise", []),
+                ],
+            ),
+        ],
+    )
+
+
+@pytest.mark.parametrize("file_name", ["model.jsonl", "model.jsonl.gz"])
+def test_write_and_read_models(tmpdir, file_name):
+    path = str(tmpdir.join(file_name))
+    with ModelWriter(path) as writer:
+        writer.write_all([make_model(), FileModel(path="empty.py")])
+
+    models = list(ModelReader(path))
+    assert models == [make_model(), FileModel(path="empty.py")]
+
+
+def test_read_rejects_other_files(tmpdir):
+    path = tmpdir.join("other.jsonl")
+    path.write('{"something": "else"}\n')
+
+    with pytest.raises(ValueError):
+        list(ModelReader(str(path)))
+
+
+def test_rendered_model_matches_parser_output():
+    content = (
+        "class DerivedClass(BaseClass):\n"
+        "    prop1 = 1\n\n"
+        "    def method1(arg1, arg2):\n"
+        "        pass\n\n"
+        "    def method2() -> str:\n"
+        "        pass\n"
+    )
+    parser = MermaidParser()
+    parser.parse_classes(content)
+
+    assert ModelRenderer.render_class_diagram(parser.classes) == parser.get_diagram()
+
+
+def test_render_from_stored_model(tmpdir):
+    source_dir = tmpdir.mkdir("source")
+    source_dir.join("shapes.py").write(
+        "import math\n\n"
+        "class Square(Shape):\n"
+        "    def area(self) -> float:\n"
+        "        return math.pow(self.side, 2)\n"
+    )
+    model_path = str(tmpdir.join("model.jsonl"))
+    analyzed_dir = tmpdir.mkdir("analyzed")
+    CodeAnalyzer(str(source_dir), str(analyzed_dir), model_out=model_path).analyze()
+
+    source_dir.remove()
+    rendered_dir = tmpdir.mkdir("rendered")
+    CodeAnalyzer(".", str(rendered_dir)).render_models(ModelReader(model_path))
+
+    expected = analyzed_dir.join("shapes_class.md").read()
+    assert rendered_dir.join("shapes_class.md").read() == expected
+    assert "Shape <|-- Square" in expected
+
+    (model,) = ModelReader(model_path)
+    assert CallModel(caller="Square.area", callee="math.pow") in model.calls
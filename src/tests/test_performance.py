@@ -0,0 +1,216 @@
+import ast
+import cProfile
+import logging
+import pstats
+import random
+import time
+
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.mermaid_parser.mermaid_parser import MermaidParser
+from src.mermaid_parser.mermaid_sequence_parser import MermaidSequenceParser
+
+pytestmark = pytest.mark.perf
+
+SEED = 20240601
+TYPES = ["int", "str", "float", "bool", "bytes"]
+
+
+def make_classes(rng, count):
+    lines = []
+    for index in range(count):
+        base = f"(Base{rng.randrange(5)})" if rng.random() < 0.5 else ""
+        lines.append(f"class Generated{index}{base}:\n")
+        for n in range(rng.randint(1, 4)):
+            lines.append(f"    field_{n}: {rng.choice(TYPES)} = {n}\n")
+        for n in range(rng.randint(1, 4)):
+            params = ", ".join(
+                f"arg_{p}: {rng.choice(TYPES)}" for p in range(rng.randint(0, 3))
+            )
+            lines.append(
+                f"    def method_{n}(self, {params}) -> {rng.choice(TYPES)}:\n"
+                f"        return self.helper_{n}({n})\n"
+            )
+        lines.append("\n")
+    return "".join(lines)
+
+
+def make_statements(rng, depth, indent="    "):
+    call = f"{indent}step_{rng.randrange(50)}(value, {rng.randrange(10)})\n"
+    if depth == 0:
+        return call
+    kind = rng.choice(["if", "for", "while"])
+    if kind == "if":
+        return (
+            call
+            + f"{indent}if value > {depth}:\n"
+            + make_statements(rng, depth - 1, indent + "    ")
+            + f"{indent}else:\n"
+            + f"{indent}    fallback_{depth}()\n"
+        )
+    if kind == "for":
+        header = f"{indent}for item_{depth} in items:\n"
+    else:
+        header = f"{indent}while ready_{depth}():\n"
+    return call + header + make_statements(rng, depth - 1, indent + "    ")
+
+
+def make_main(rng, blocks, depth):
+    return "import os\n\n\ndef main():\n" + "".join(
+        make_statements(rng, depth) for _ in range(blocks)
+    )
+
+
+def count_calls(function):
+    """Returns the number of Python function calls made by `function`.
+
+    Unlike timings, call counts are deterministic, so they can be compared
+    exactly between input sizes.
+    """
+    profile = cProfile.Profile()
+    profile.runcall(function)
+    return pstats.Stats(profile).total_calls
+
+
+def best_time(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def assert_linear(small, large, factor, tolerance=0.25):
+    ratio = large / small
+    assert (
+        factor * (1 - tolerance) <= ratio <= factor * (1 + tolerance)
+    ), f"growing the input {factor}x grew the cost {ratio:.2f}x"
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def parse_classes(source):
+    parser = MermaidParser()
+    parser.parse_classes(source)
+    return parser.get_diagram()
+
+
+def parse_main(source):
+    parser = MermaidSequenceParser()
+    tree = ast.parse(source)
+    parser.parse_main_tree(tree, parser.collect_imports(tree), source)
+    return parser.get_sequence_diagram()
+
+
+def test_class_parser_visits_nodes_linearly(perf_baseline):
+    small = make_classes(random.Random(SEED), 250)
+    large = make_classes(random.Random(SEED), 250) * 4
+
+    assert_linear(
+        count_calls(lambda: parse_classes(small)),
+        count_calls(lambda: parse_classes(large)),
+        4,
+    )
+    assert_linear(len(parse_classes(small)), len(parse_classes(large)), 4)
+    perf_baseline.check(
+        "MermaidParser.parse_classes", best_time(lambda: parse_classes(large))
+    )
+
+
+def test_class_diagram_is_built_in_linear_time():
+    tree = ast.parse(make_classes(random.Random(SEED), 1000))
+    large_tree = ast.Module(body=tree.body * 8, type_ignores=[])
+
+    def build(module):
+        MermaidParser().parse_tree(module)
+
+    # A diagram built by repeated string concatenation grows ~64x here.
+    assert best_time(lambda: build(large_tree)) < 20 * best_time(lambda: build(tree))
+
+
+def test_sequence_parser_scales_with_statements(perf_baseline):
+    small = make_main(random.Random(SEED), 50, 3)
+    large = make_main(random.Random(SEED), 200, 3)
+
+    assert_linear(
+        count_calls(lambda: parse_main(small)),
+        count_calls(lambda: parse_main(large)),
+        4,
+    )
+    assert_linear(len(parse_main(small)), len(parse_main(large)), 4)
+    perf_baseline.check(
+        "MermaidSequenceParser.parse_main_tree", best_time(lambda: parse_main(large))
+    )
+
+
+def test_sequence_parser_scales_with_nesting_depth():
+    shallow = make_main(random.Random(SEED), 1, 10)
+    deep = make_main(random.Random(SEED), 1, 40)
+
+    # Each level adds a constant number of nodes; revisiting the nested
+    # blocks once per enclosing level would grow the work quadratically.
+    assert_linear(
+        count_calls(lambda: parse_main(shallow)),
+        count_calls(lambda: parse_main(deep)),
+        4,
+        tolerance=0.35,
+    )
+
+
+def write_tree(directory, file_count):
+    rng = random.Random(SEED)
+    for index in range(file_count):
+        directory.join(f"module_{index}.py").write(make_classes(rng, 10))
+    directory.join("main.py").write(make_main(random.Random(SEED), 5, 3))
+
+
+def output_size(directory):
+    return sum(path.size() for path in directory.visit("*.md"))
+
+
+def test_analyzer_scales_with_files(tmpdir, perf_baseline, capsys):
+    small_dir, large_dir = tmpdir.mkdir("small"), tmpdir.mkdir("large")
+    write_tree(small_dir, 10)
+    write_tree(large_dir, 40)
+
+    def analyze(directory):
+        CodeAnalyzer(str(directory), str(directory)).analyze()
+
+    assert_linear(
+        count_calls(lambda: analyze(small_dir)),
+        count_calls(lambda: analyze(large_dir)),
+        4,
+        tolerance=0.35,
+    )
+    assert_linear(output_size(small_dir), output_size(large_dir), 4, tolerance=0.35)
+    perf_baseline.check("CodeAnalyzer.analyze", best_time(lambda: analyze(large_dir)))
+    capsys.readouterr()
+
+
+def make_bodies(rng, count, statements):
+    return "".join(
+        f"class Service{index}:\n"
+        f"    def run(self, value):\n"
+        + make_statements(rng, statements, "        ")
+        + "\n"
+        for index in range(count)
+    )
+
+
+def test_lazy_class_parser_does_not_visit_method_bodies():
+    small = ast.parse(make_bodies(random.Random(SEED), 100, 2))
+    large = ast.parse(make_bodies(random.Random(SEED), 100, 32))
+
+    def parse_tree(tree):
+        MermaidParser(lazy=True).parse_tree(tree)
+
+    assert count_calls(lambda: parse_tree(large)) == count_calls(
+        lambda: parse_tree(small)
+    )
@@ -0,0 +1,210 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.config import project_config
+from src.config.project_config import Profile, ProjectConfig
+from src.model.model import ClassModel, FileModel
+from src.model.model_store import ModelWriter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PYPROJECT = """
+[project]
+name = "shapes"
+
+[tool.mermaidit]
+exclude = ["build", "*_pb2.py"]
+output-dir = "diagrams"
+layout = "mirror"
+
+[tool.mermaidit.profiles.ci]
+diagrams = ["class"]
+jobs = 4
+cache-dir = ".cache/mermaidit"
+lazy = true
+"""
+
+
+def write_source(root):
+    root.ensure("shapes", "circle.py").write("class Circle:\n    pass\n")
+    root.ensure("shapes", "circle_pb2.py").write("class CircleMessage:\n    pass\n")
+    root.ensure("build", "lib", "shapes", "circle.py").write("class Copy:\n    pass\n")
+    root.ensure("tools", "square.py").write("class Square:\n    pass\n")
+
+
+def test_profiles_override_top_level_settings(tmpdir):
+    tmpdir.join("pyproject.toml").write(PYPROJECT)
+    config = ProjectConfig.load(str(tmpdir.join("pyproject.toml")))
+
+    assert config.profile_names == ("ci", "default")
+    assert config.get_profile() == Profile(
+        exclude=("build", "*_pb2.py"),
+        output_dir=str(tmpdir.join("diagrams")),
+        layout="mirror",
+    )
+    ci = config.get_profile("ci")
+    assert (ci.name, ci.diagrams, ci.jobs, ci.lazy) == ("ci", ("class",), 4, True)
+    assert ci.cache_dir == str(tmpdir.join(".cache", "mermaidit"))
+    assert ci.exclude == ("build", "*_pb2.py")
+
+    with pytest.raises(ValueError, match="Unknown profile 'nightly'"):
+        config.get_profile("nightly")
+
+
+@pytest.mark.parametrize(
+    "settings, message",
+    [
+        ("colour = 'red'", "Unknown setting 'colour'"),
+        ("jobs = 'many'", "'jobs' in profile 'default' must be an integer"),
+        ("exclude = 'build'", "must be a list of strings"),
+        ("diagrams = ['class', 'state']", "Invalid diagrams"),
+        ("layout = 'nested'", "Invalid layout"),
+    ],
+)
+def test_invalid_settings_are_rejected(tmpdir, settings, message):
+    tmpdir.join("mermaidit.toml").write(settings)
+
+    with pytest.raises(ValueError, match=message):
+        ProjectConfig.load(str(tmpdir.join("mermaidit.toml"))).get_profile()
+
+
+def test_config_is_parsed_once(tmpdir, monkeypatch):
+    config_file = tmpdir.join("mermaidit.toml")
+    config_file.write("jobs = 2\n")
+    loads = []
+    load = project_config.tomllib.load
+    monkeypatch.setattr(
+        project_config.tomllib, "load", lambda f: loads.append(f) or load(f)
+    )
+
+    first = ProjectConfig.load(str(config_file))
+    assert ProjectConfig.discover(str(tmpdir.mkdir("sub"))) is first
+    assert len(loads) == 1
+
+    config_file.write("jobs = 3\n")
+    os.utime(str(config_file), ns=(0, 0))
+    assert ProjectConfig.load(str(config_file)).get_profile().jobs == 3
+    assert len(loads) == 2
+
+
+def test_discover_stops_at_repository_root(tmpdir):
+    tmpdir.join("mermaidit.toml").write("jobs = 2\n")
+    repo = tmpdir.mkdir("repo")
+    repo.mkdir(".git")
+    repo.join("pyproject.toml").write("[project]\nname = 'unrelated'\n")
+
+    assert ProjectConfig.discover(str(repo.mkdir("src"))) is None
+    assert ProjectConfig.discover(str(tmpdir.mkdir("other"))).get_profile().jobs == 2
+
+
+def test_analyzer_applies_include_exclude_and_size_limits(tmpdir):
+    write_source(tmpdir)
+    tmpdir.join("tools", "huge.py").write("x = 1\n" * 1000)
+
+    def relative_paths(**options):
+        analyzer = CodeAnalyzer(str(tmpdir), **options)
+        return [
+            os.path.relpath(path, str(tmpdir)).replace(os.sep, "/")
+            for path in analyzer.iter_source_files()
+        ]
+
+    assert relative_paths(exclude=["build", "*_pb2.py"], max_file_size=1024) == [
+        "shapes/circle.py",
+        "tools/square.py",
+    ]
+    assert relative_paths(include=["shapes/*"], exclude=["*_pb2.py"]) == [
+        "shapes/circle.py"
+    ]
+
+
+def test_mirror_layout_keeps_directories(tmpdir):
+    analyzer = CodeAnalyzer(str(tmpdir), str(tmpdir.join("out")), layout="mirror")
+    path = analyzer.get_output_path(FileModel("shapes/circle.py"), "_class.md")
+
+    assert path == str(tmpdir.join("out", "shapes", "circle_class.md"))
+    assert tmpdir.join("out", "shapes").check(dir=True)
+
+
+def test_flat_layout_creates_missing_output_directory(tmpdir, capsys):
+    source = tmpdir.mkdir("source")
+    write_source(source)
+    output_dir = tmpdir.join("docs", "diagrams")
+
+    CodeAnalyzer(
+        str(source), str(output_dir), diagram_types=("class",), exclude=["build"]
+    ).analyze()
+
+    assert output_dir.join("circle_class.md").check()
+    assert output_dir.join("square_class.md").check()
+    capsys.readouterr()
+
+
+def test_runs_with_a_profile_do_not_prompt(tmpdir):
+    source = tmpdir.mkdir("source")
+    write_source(source)
+    source.join("pyproject.toml").write(PYPROJECT)
+
+    subprocess.run(
+        [sys.executable, "run.py", "--profile", "ci", "--local", str(source)],
+        cwd=REPO_ROOT,
+        check=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=60,
+        env={**os.environ, "DISPLAY": ""},
+    )
+
+    diagrams = source.join("diagrams")
+    assert diagrams.join("shapes", "circle_class.md").check()
+    assert diagrams.join("tools", "square_class.md").check()
+    assert not diagrams.join("shapes", "circle_pb2_class.md").check()
+    assert not diagrams.join("build").check()
+
+
+def test_command_line_patterns_replace_profile_patterns(tmpdir):
+    source = tmpdir.mkdir("source")
+    write_source(source)
+    source.join("mermaidit.toml").write(
+        'include = ["shapes/*"]\noutput-dir = "diagrams"\ndiagrams = ["class"]\n'
+    )
+
+    subprocess.run(
+        [sys.executable, "run.py", "--include", "tools/*", "--local", str(source)],
+        cwd=REPO_ROOT,
+        check=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=60,
+        env={**os.environ, "DISPLAY": ""},
+    )
+
+    diagrams = source.join("diagrams")
+    assert diagrams.join("square_class.md").check()
+    assert not diagrams.join("circle_class.md").check()
+
+
+def test_profile_output_dir_applies_to_merge(tmpdir):
+    tmpdir.join("mermaidit.toml").write('output-dir = "docs"\n')
+    writer = ModelWriter(str(tmpdir.join("part-0.jsonl")))
+    writer.write(FileModel("shapes/circle.py", classes=[ClassModel("Circle")]))
+    writer.close()
+
+    subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, "run.py"), "merge", "part-0.jsonl"],
+        cwd=str(tmpdir),
+        check=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=60,
+        env={**os.environ, "DISPLAY": ""},
+    )
+
+    assert tmpdir.join("docs", "project_class.md").check()
+    assert tmpdir.join("docs", "circle_class.md").check()
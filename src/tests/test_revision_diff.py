@@ -0,0 +1,205 @@
+import pytest
+from git import Repo
+
+from src.code_analyzer.revision_diff import RevisionDiff
+from src.model.model import CallModel, ClassModel, FileModel, MemberModel
+from src.model.model_diff import ModelDiff
+from src.model.model_renderer import ModelRenderer
+from src.model.shared_model_cache import SharedModelCache
+
+OLD_SHAPES = """class Shape:
+    def area(self) -> float:
+        return 0
+
+    def perimeter(self):
+        return 0
+
+
+class Square(Shape):
+    def area(self) -> float:
+        return helper()
+
+
+class Legacy:
+    pass
+"""
+
+NEW_SHAPES = """class Shape:
+    def area(self, unit: str) -> float:
+        return 0
+
+    def name(self):
+        return "shape"
+
+
+class Square(Shape, Named):
+    def area(self) -> float:
+        return compute()
+
+
+class Circle(Shape):
+    radius = 1
+"""
+
+
+def write_tree(root, shapes_source, unchanged_files=20):
+    root.join("shapes.py").write(shapes_source)
+    for index in range(unchanged_files):
+        root.join(f"module_{index}.py").write(f"class Widget{index}:\n    pass\n")
+
+
+def count_extractions(revision_diff, monkeypatch):
+    paths = []
+    extract_model = revision_diff.analyzer.extract_model
+
+    def counting_extract_model(file_path, data=None, complete=True):
+        paths.append(file_path)
+        return extract_model(file_path, data, complete)
+
+    monkeypatch.setattr(revision_diff.analyzer, "extract_model", counting_extract_model)
+    return paths
+
+
+def assert_shapes_diff(model_diff):
+    changes = {change.name: change for change in model_diff.classes}
+    assert {name: change.status for name, change in changes.items()} == {
+        "Shape": "changed",
+        "Square": "changed",
+        "Circle": "added",
+        "Legacy": "removed",
+    }
+    assert [member.name for member in changes["Shape"].added_members] == ["name"]
+    assert [member.name for member in changes["Shape"].removed_members] == ["perimeter"]
+    assert changes["Shape"].changed_members == [
+        MemberModel("area", kind="method", params=["unit: str"], return_type="float")
+    ]
+    assert changes["Square"].added_bases == ["Named"]
+    assert model_diff.added_calls == [CallModel("Square.area", "compute")]
+    assert model_diff.removed_calls == [CallModel("Square.area", "helper")]
+
+
+def test_compare_ignores_classes_moved_between_changed_files():
+    moved = ClassModel("Moved", members=[MemberModel("run", kind="method")])
+    model_diff = ModelDiff.compare(
+        [
+            ("a.py", FileModel("a.py", classes=[moved]), FileModel("a.py")),
+            ("b.py", None, FileModel("b.py", classes=[moved])),
+        ]
+    )
+
+    assert model_diff.paths == ["a.py", "b.py"]
+    assert not model_diff
+
+
+def test_same_names_in_different_files_do_not_hide_changes(tmpdir):
+    old_dir, new_dir = tmpdir.mkdir("old"), tmpdir.mkdir("new")
+    old_dir.join("a.py").write("class Config:\n    a = 1\n\n\ndef main():\n    bar()\n")
+    old_dir.join("b.py").write("class Config:\n    b = 1\n\n\ndef main():\n    bar()\n")
+    new_dir.join("a.py").write(
+        "class Config:\n    a = 1\n    x = 1\n\n\ndef main():\n    bar()\n"
+    )
+    new_dir.join("b.py").write("class Config:\n    c = 1\n\n\ndef main():\n    foo()\n")
+
+    model_diff = RevisionDiff().diff_directories(str(old_dir), str(new_dir))
+
+    changes = {change.path: change for change in model_diff.classes}
+    assert sorted(changes) == ["a.py", "b.py"]
+    assert [member.name for member in changes["a.py"].added_members] == ["x"]
+    assert [member.name for member in changes["b.py"].added_members] == ["c"]
+    assert [member.name for member in changes["b.py"].removed_members] == ["b"]
+    assert model_diff.added_calls == [CallModel("main", "foo")]
+    assert model_diff.removed_calls == [CallModel("main", "bar")]
+
+    class_diagram = ModelRenderer.render_class_diff(model_diff)
+    assert "class `a.Config` {" in class_diagram
+    assert "class `b.Config` {" in class_diagram
+
+
+def test_compare_reports_changes_of_moved_classes():
+    old = ClassModel("Moved", members=[MemberModel("run", kind="method")])
+    new = ClassModel("Moved", members=[MemberModel("stop", kind="method")])
+    model_diff = ModelDiff.compare(
+        [
+            ("a.py", FileModel("a.py", classes=[old]), FileModel("a.py")),
+            ("b.py", None, FileModel("b.py", classes=[new])),
+        ]
+    )
+
+    [change] = model_diff.classes
+    assert (change.status, change.path) == ("changed", "b.py")
+    assert [member.name for member in change.added_members] == ["stop"]
+
+
+def test_diff_directories_only_parses_changed_files(tmpdir, monkeypatch):
+    old_dir, new_dir = tmpdir.mkdir("old"), tmpdir.mkdir("new")
+    write_tree(old_dir, OLD_SHAPES)
+    write_tree(new_dir, NEW_SHAPES)
+    new_dir.join("notes.txt").write("not source")
+
+    revision_diff = RevisionDiff()
+    extracted = count_extractions(revision_diff, monkeypatch)
+    model_diff = revision_diff.diff_directories(str(old_dir), str(new_dir))
+
+    assert model_diff.paths == ["shapes.py"]
+    assert extracted == ["shapes.py", "shapes.py"]
+    assert_shapes_diff(model_diff)
+
+
+@pytest.fixture
+def repo(tmpdir):
+    repo = Repo.init(str(tmpdir.join("repo")))
+    root = tmpdir.join("repo")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+
+    write_tree(root, OLD_SHAPES)
+    root.join("legacy.py").write("class Old:\n    pass\n")
+    repo.index.add(["shapes.py", "legacy.py"] + [f"module_{i}.py" for i in range(20)])
+    repo.index.commit("old")
+
+    root.join("shapes.py").write(NEW_SHAPES)
+    repo.index.add(["shapes.py"])
+    repo.index.move(["legacy.py", "renamed.py"])
+    repo.index.commit("new")
+    return repo
+
+
+def test_diff_refs_only_parses_changed_files(repo, monkeypatch):
+    revision_diff = RevisionDiff()
+    extracted = count_extractions(revision_diff, monkeypatch)
+    model_diff = revision_diff.diff_refs(repo.working_dir, "HEAD~1", "HEAD")
+
+    assert sorted(model_diff.paths) == ["shapes.py"]
+    assert extracted == ["shapes.py", "shapes.py"]
+    assert_shapes_diff(model_diff)
+
+
+def test_diff_refs_reuses_cached_models(repo, tmpdir):
+    model_cache = SharedModelCache(str(tmpdir.join("cache")))
+    RevisionDiff(model_cache=model_cache).diff_refs(repo.working_dir, "HEAD~1", "HEAD")
+    assert (model_cache.hits, model_cache.misses) == (0, 2)
+
+    RevisionDiff(model_cache=model_cache).diff_refs(repo.working_dir, "HEAD~1", "HEAD")
+    assert (model_cache.hits, model_cache.misses) == (2, 2)
+
+
+def test_render_diff(tmpdir):
+    old_dir, new_dir = tmpdir.mkdir("old"), tmpdir.mkdir("new")
+    write_tree(old_dir, OLD_SHAPES, unchanged_files=0)
+    write_tree(new_dir, NEW_SHAPES, unchanged_files=0)
+    model_diff = RevisionDiff().diff_directories(str(old_dir), str(new_dir))
+
+    class_diagram = ModelRenderer.render_class_diff(model_diff)
+    assert "classDef added " in class_diagram
+    assert 'cssClass "Shape,Square" changed\n' in class_diagram
+    assert 'cssClass "Legacy" removed\n' in class_diagram
+    assert "Named <|-- Square : added\n" in class_diagram
+    assert (
+        'note for Shape "added: +name()\\nremoved: +perimeter()'
+        '\\nchanged: +area(unit: str) : float"\n'
+    ) in class_diagram
+
+    call_diagram = ModelRenderer.render_call_diff(model_diff)
+    assert "-->|added|" in call_diagram and "-.->|removed|" in call_diagram
+    assert "linkStyle 1 stroke:#cf222e\n" in call_diagram
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.model.model_store import ModelReader
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_tree(directory, file_count):
+    for index in range(file_count):
+        package = directory.join(f"pkg_{index % 3}")
+        package.ensure(dir=True)
+        package.join(f"module_{index}.py").write(
+            f"class Widget{index}(Base):\n    def run(self):\n        return {index}\n"
+        )
+
+
+def run_tool(*args):
+    subprocess.run(
+        [sys.executable, "run.py", *args],
+        cwd=REPO_ROOT,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def test_shards_partition_the_files(tmpdir):
+    write_tree(tmpdir, 30)
+    all_files = list(CodeAnalyzer(str(tmpdir)).iter_source_files())
+
+    shards = [
+        list(CodeAnalyzer(str(tmpdir), shard=(index, 4)).iter_source_files())
+        for index in range(4)
+    ]
+
+    assert sorted(sum(shards, [])) == sorted(all_files)
+    assert all(shards)
+
+
+def test_sharded_processes_merge_into_project_model(tmpdir):
+    source_dir = tmpdir.mkdir("source")
+    write_tree(source_dir, 12)
+    shard_count = 3
+
+    for index in range(shard_count):
+        run_tool(
+            "--local",
+            str(source_dir),
+            "--output-dir",
+            str(tmpdir.mkdir(f"out_{index}")),
+            "--model-out",
+            str(tmpdir.join(f"part_{index}.jsonl")),
+            "--shard",
+            f"{index}/{shard_count}",
+        )
+
+    merged_dir = tmpdir.join("merged")
+    run_tool(
+        "merge",
+        *[str(tmpdir.join(f"part_{index}.jsonl")) for index in range(shard_count)],
+        "--output-dir",
+        str(merged_dir),
+        "--model-out",
+        str(tmpdir.join("merged.jsonl")),
+        "--db",
+        str(tmpdir.join("index.sqlite")),
+    )
+
+    merged_paths = [
+        model.path for model in ModelReader(str(tmpdir.join("merged.jsonl")))
+    ]
+    assert sorted(merged_paths) == sorted(
+        os.path.join(f"pkg_{index % 3}", f"module_{index}.py") for index in range(12)
+    )
+
+    project_diagram = merged_dir.join("project_class.md").read()
+    for index in range(12):
+        assert f"class Widget{index} {{" in project_diagram
+        assert merged_dir.join(f"module_{index}_class.md").check()
+
+
+def test_merge_skips_duplicate_paths(tmpdir):
+    source_dir = tmpdir.mkdir("source")
+    write_tree(source_dir, 3)
+    for name in ("a.jsonl", "b.jsonl"):
+        CodeAnalyzer(
+            str(source_dir), str(tmpdir), model_out=str(tmpdir.join(name))
+        ).analyze()
+
+    merged = list(
+        ModelReader.merge([str(tmpdir.join("a.jsonl")), str(tmpdir.join("b.jsonl"))])
+    )
+
+    assert len(merged) == 3
@@ -0,0 +1,141 @@
+import multiprocessing
+import os
+
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.frontends import python_frontend
+from src.model.model import ClassModel, FileModel, MemberModel
+from src.model.shared_model_cache import CACHE_FILE_NAME, SharedModelCache
+
+
+def make_model(index):
+    return FileModel(
+        path=f"module_{index}.py",
+        content_hash=f"{index:040x}",
+        classes=[
+            ClassModel(
+                f"Widget{index}",
+                ["Base"],
+                [MemberModel("run", kind="method", return_type="int")],
+            )
+        ],
+    )
+
+
+def write_models(cache_dir, start, count):
+    cache = SharedModelCache(cache_dir)
+    for index in range(start, start + count):
+        cache.put(f"key-{index}", make_model(index))
+    cache.close()
+
+
+def test_put_and_get(tmpdir):
+    with SharedModelCache(str(tmpdir)) as cache:
+        assert cache.get("key-1") is None
+        cache.put("key-1", make_model(1))
+
+        assert cache.get("key-1") == make_model(1)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_records_appended_by_another_process_are_seen(tmpdir):
+    reader = SharedModelCache(str(tmpdir))
+    writer = SharedModelCache(str(tmpdir))
+    writer.put("key-1", make_model(1))
+    assert reader.get("key-1") == make_model(1)
+
+    writer.put("key-2", make_model(2))
+    assert reader.get("key-2") == make_model(2)
+
+
+def test_concurrent_writers(tmpdir):
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=write_models, args=(str(tmpdir), start * 25, 25))
+        for start in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    with SharedModelCache(str(tmpdir)) as cache:
+        for index in range(100):
+            assert cache.get(f"key-{index}") == make_model(index)
+
+
+def test_torn_tail_is_ignored_and_dropped_by_next_writer(tmpdir):
+    with SharedModelCache(str(tmpdir)) as cache:
+        cache.put("key-1", make_model(1))
+    cache_path = tmpdir.join(CACHE_FILE_NAME)
+    with open(str(cache_path), "ab") as f:
+        f.write(b"MR\x05\x00\xff\x00\x00\x00")
+
+    with SharedModelCache(str(tmpdir)) as cache:
+        assert cache.get("key-1") == make_model(1)
+        cache.put("key-2", make_model(2))
+
+    with SharedModelCache(str(tmpdir)) as cache:
+        assert cache.get("key-1") == make_model(1)
+        assert cache.get("key-2") == make_model(2)
+
+
+def test_compaction_keeps_recent_and_recently_used_models(tmpdir):
+    limit = 4096
+    reader = SharedModelCache(str(tmpdir), max_bytes=limit)
+    with SharedModelCache(str(tmpdir), max_bytes=limit) as cache:
+        for index in range(100):
+            cache.put(f"key-{index}", make_model(index))
+            # Keep using the first model while the others come and go.
+            assert cache.get("key-0") == make_model(0)
+
+    assert os.path.getsize(str(tmpdir.join(CACHE_FILE_NAME))) <= limit
+    assert reader.get("key-0") == make_model(0)
+    assert reader.get("key-99") == make_model(99)
+    assert reader.get("key-1") is None
+    reader.close()
+
+
+@pytest.fixture
+def source_dir(tmpdir):
+    source = tmpdir.mkdir("source")
+    source.join("shapes.py").write(
+        "class Shape:\n    def area(self) -> float:\n        return 0\n"
+    )
+    source.join("main.py").write("def main():\n    run()\n")
+    return source
+
+
+def test_analyzer_skips_parsing_cached_files(tmpdir, source_dir, monkeypatch):
+    cache_dir = str(tmpdir.join("cache"))
+    first = CodeAnalyzer(str(source_dir), model_cache=SharedModelCache(cache_dir))
+    expected = [first.extract_model(path) for path in first.iter_source_files()]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed a cached file")
+
+    monkeypatch.setattr(python_frontend.ast, "parse", fail)
+    second = CodeAnalyzer(str(source_dir), model_cache=SharedModelCache(cache_dir))
+    assert [
+        second.extract_model(path) for path in second.iter_source_files()
+    ] == expected
+
+    with pytest.raises(AssertionError):
+        # Models extracted with other options are cached under another key.
+        second.extract_model(str(source_dir.join("main.py")), complete=False)
+
+
+def test_cached_model_takes_the_requested_path(tmpdir, source_dir):
+    source_dir.join("copy.py").write(source_dir.join("shapes.py").read())
+    analyzer = CodeAnalyzer(
+        str(source_dir), model_cache=SharedModelCache(str(tmpdir.join("cache")))
+    )
+
+    original = analyzer.extract_model(str(source_dir.join("shapes.py")))
+    copy = analyzer.extract_model(str(source_dir.join("copy.py")))
+
+    assert analyzer.model_cache.hits == 1
+    assert copy.path == "copy.py"
+    assert copy.classes == original.classes
@@ -0,0 +1,66 @@
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.code_analyzer.source_prefilter import SourcePrefilter
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("class A:\n    pass\n", True),
+        ("import os\n\n@decorator\nclass A(Base):\n    pass\n", True),
+        ("def f():\n    class Local:\n        pass\n", True),
+        ("class\\\n  A:\n    pass\n", True),
+        ("def classify():\n    return 'class'\n", False),
+        ("x = 1  # no class here\nsubclass = 2\n", False),
+        ("", False),
+    ],
+)
+def test_has_class_definition(tmpdir, content, expected):
+    path = tmpdir.join("module.py")
+    path.write(content)
+
+    assert SourcePrefilter.has_class_definition(str(path)) is expected
+
+
+def test_has_class_definition_memory_maps_large_files(tmpdir):
+    path = tmpdir.join("module.py")
+    path.write("x = 1\n" * 1000 + "class A:\n    pass\n")
+
+    assert SourcePrefilter.has_class_definition(str(path), mmap_threshold=1)
+
+
+def test_class_only_run_skips_parsing_files_without_classes(tmpdir, monkeypatch):
+    tmpdir.join("shapes.py").write("class Shape:\n    pass\n")
+    tmpdir.join("helpers.py").write("def helper():\n    return 1\n")
+    tmpdir.join("main.py").write("def main():\n    helper()\n")
+    analyzer = CodeAnalyzer(str(tmpdir), str(tmpdir), diagram_types=("class",))
+
+    parsed = []
+    extract_model = analyzer.extract_model
+    monkeypatch.setattr(
+        analyzer,
+        "extract_model",
+        lambda file_path, data=None, complete=True: parsed.append(file_path)
+        or extract_model(file_path, data, complete),
+    )
+    analyzer.analyze()
+
+    assert parsed == [str(tmpdir.join("shapes.py"))]
+    assert tmpdir.join("shapes_class.md").check()
+    assert not tmpdir.join("main_sequence.md").check()
+
+
+def test_fast_path_extracts_only_requested_parts(tmpdir):
+    tmpdir.join("main.py").write(
+        "import os\n\nclass App:\n    pass\n\ndef main():\n    os.getcwd()\n"
+    )
+    analyzer = CodeAnalyzer(str(tmpdir), diagram_types=("class",))
+
+    model = analyzer.extract_model(str(tmpdir.join("main.py")), complete=False)
+    assert [class_model.name for class_model in model.classes] == ["App"]
+    assert model.calls == [] and model.sequence == [] and model.imports == {}
+
+    model = analyzer.extract_model(str(tmpdir.join("main.py")))
+    assert model.imports == {"os": "os"}
+    assert model.sequence
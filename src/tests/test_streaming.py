@@ -0,0 +1,46 @@
+import logging
+import tracemalloc
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+
+
+def make_source(index):
+    return "".join(
+        f"class Widget{index}_{n}(Base):\n"
+        f"    size: int = {n}\n\n"
+        f"    def resize(self, width: int, height: int) -> Widget{index}_{n}:\n"
+        f"        return self.scale(width * height)\n\n"
+        for n in range(20)
+    )
+
+
+def write_tree(directory, file_count):
+    for index in range(file_count):
+        directory.join(f"module_{index}.py").write(make_source(index))
+
+
+def peak_memory(source_dir):
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in CodeAnalyzer(source_dir).iter_models())
+        return count, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_iter_models_peak_memory_is_flat(tmpdir, capsys):
+    small_dir = tmpdir.mkdir("small")
+    large_dir = tmpdir.mkdir("large")
+    write_tree(small_dir, 25)
+    write_tree(large_dir, 200)
+
+    # pytest keeps every captured log record, which would grow with the file count.
+    logging.disable(logging.CRITICAL)
+    try:
+        small_count, small_peak = peak_memory(str(small_dir))
+        large_count, large_peak = peak_memory(str(large_dir))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert (small_count, large_count) == (25, 200)
+    assert large_peak < small_peak * 1.5
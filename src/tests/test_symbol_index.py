@@ -0,0 +1,147 @@
+import pytest
+
+from src.code_analyzer.code_analysis import CodeAnalyzer
+from src.index.symbol_index import SymbolIndex
+from src.model.model import CallModel, ClassModel, FileModel, MemberModel
+
+
+@pytest.fixture
+def symbol_index(tmpdir):
+    with SymbolIndex(str(tmpdir.join("index.sqlite"))) as index:
+        yield index
+
+
+def test_upsert_is_keyed_by_content_hash(symbol_index):
+    model = FileModel(path="a.py", content_hash="1", classes=[ClassModel(name="A")])
+    assert symbol_index.upsert(model) is True
+    assert symbol_index.upsert(model) is False
+
+    model = FileModel(path="a.py", content_hash="2", classes=[ClassModel(name="B")])
+    assert symbol_index.upsert(model) is True
+    assert symbol_index.find_classes("A") == []
+    assert symbol_index.find_classes("B") == [ClassModel(name="B")]
+
+
+def test_find_classes_round_trips_members(symbol_index):
+    class_model = ClassModel(
+        name="Square",
+        bases=["Shape"],
+        members=[
+            MemberModel(name="side"),
+            MemberModel(name="scale", kind="method", params=["factor: int"]),
+        ],
+    )
+    symbol_index.upsert(FileModel(path="a.py", content_hash="1", classes=[class_model]))
+
+    assert symbol_index.find_classes("Square") == [class_model]
+
+
+def test_subclasses(symbol_index):
+    symbol_index.upsert(
+        FileModel(
+            path="shapes.py",
+            content_hash="1",
+            classes=[
+                ClassModel(name="Shape"),
+                ClassModel(name="Rectangle", bases=["Shape"]),
+                ClassModel(name="Square", bases=["Rectangle"]),
+                ClassModel(name="Circle", bases=["Shape"]),
+            ],
+        )
+    )
+
+    names = [class_model.name for class_model in symbol_index.subclasses("Shape")]
+    assert names == ["Rectangle", "Circle", "Square"]
+
+    direct = symbol_index.subclasses("Shape", recursive=False)
+    assert [class_model.name for class_model in direct] == ["Rectangle", "Circle"]
+
+
+def test_subclasses_of_a_class_deriving_from_its_own_name(symbol_index):
+    symbol_index.upsert(
+        FileModel(
+            path="foo.py",
+            content_hash="1",
+            imports={"Foo": "x.Foo"},
+            classes=[ClassModel(name="Foo", bases=["Foo"])],
+        )
+    )
+    symbol_index.upsert(
+        FileModel(
+            path="bar.py",
+            content_hash="1",
+            classes=[ClassModel(name="Bar", bases=["Foo"])],
+        )
+    )
+
+    names = [class_model.name for class_model in symbol_index.subclasses("Foo")]
+    assert names == ["Foo", "Bar"]
+
+
+def test_subclasses_stop_at_inheritance_cycles(symbol_index):
+    symbol_index.upsert(
+        FileModel(path="a.py", content_hash="1", classes=[ClassModel("A", ["B"])])
+    )
+    symbol_index.upsert(
+        FileModel(
+            path="b.py",
+            content_hash="1",
+            classes=[ClassModel("B", ["A"]), ClassModel("C", ["B"])],
+        )
+    )
+
+    names = [class_model.name for class_model in symbol_index.subclasses("A")]
+    assert names == ["B", "A", "C"]
+
+
+def test_callers_and_callees(symbol_index):
+    symbol_index.upsert(
+        FileModel(
+            path="main.py",
+            content_hash="1",
+            imports={"path": "os.path"},
+            calls=[
+                CallModel(caller="main", callee="os.path.join"),
+                CallModel(caller="Builder.run", callee="os.path.join"),
+                CallModel(caller="main", callee="print"),
+            ],
+        )
+    )
+
+    assert [call.caller for call in symbol_index.callers("join")] == [
+        "main",
+        "Builder.run",
+    ]
+    assert [call.caller for call in symbol_index.callers("os.path.join")] == [
+        "main",
+        "Builder.run",
+    ]
+    assert [call.callee for call in symbol_index.callees("main")] == [
+        "os.path.join",
+        "print",
+    ]
+    assert symbol_index.importers("os.path") == ["main.py"]
+
+
+def test_update_index_only_reparses_changed_files(tmpdir, symbol_index, monkeypatch):
+    source_dir = tmpdir.mkdir("source")
+    source_dir.join("a.py").write("class A:\n    pass\n")
+    source_dir.join("b.py").write("class B(A):\n    pass\n")
+    analyzer = CodeAnalyzer(str(source_dir))
+
+    assert analyzer.update_index(symbol_index) == (2, 0)
+
+    source_dir.join("b.py").write("class C(A):\n    pass\n")
+    source_dir.join("a.py").remove()
+    parsed = []
+    extract_model = analyzer.extract_model
+    monkeypatch.setattr(
+        analyzer,
+        "extract_model",
+        lambda file_path, data=None: parsed.append(file_path)
+        or extract_model(file_path, data),
+    )
+
+    assert analyzer.update_index(symbol_index) == (1, 1)
+    assert parsed == [str(source_dir.join("b.py"))]
+    assert [c.name for c in symbol_index.subclasses("A")] == ["C"]